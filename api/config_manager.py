@@ -6,10 +6,10 @@ Handles loading config from .env and applying per-request overrides.
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Annotated, Any, Dict, Optional
 
-from dotenv import load_dotenv, set_key
-from pydantic import ValidationError
+from dotenv import load_dotenv
+from pydantic import TypeAdapter, ValidationError
 
 from rag_app.config import Settings
 
@@ -17,6 +17,81 @@ from rag_app.config import Settings
 project_root = Path(__file__).parent.parent
 load_dotenv(project_root / ".env", override=True)
 
+# Per-field validators so overrides can be checked without revalidating every field
+_FIELD_ADAPTERS: Dict[str, TypeAdapter] = {
+    name: TypeAdapter(
+        Annotated[(field.annotation, *field.metadata)] if field.metadata else field.annotation
+    )
+    for name, field in Settings.model_fields.items()
+}
+
+
+def _write_env_updates(env_path: Path, updates: Dict[str, str]) -> None:
+    """Apply KEY=value updates to a .env file with a single atomic write.
+    
+    Existing assignments are replaced in place so comments and ordering are
+    preserved; keys not already present are appended.
+    
+    Args:
+        env_path: Path to the .env file (created if missing)
+        updates: Mapping of env keys to unquoted values
+    """
+    lines = env_path.read_text(encoding="utf-8").splitlines() if env_path.exists() else []
+    pending = dict(updates)
+    
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#") or "=" not in stripped:
+            continue
+        key = stripped.split("=", 1)[0].strip()
+        if key.startswith("export "):
+            key = key[len("export "):].strip()
+        if key in pending:
+            lines[i] = f"{key}={pending.pop(key)}"
+    
+    lines.extend(f"{key}={value}" for key, value in pending.items())
+    
+    tmp_path = env_path.with_name(env_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, env_path)
+
+
+def _validate_override_fields(overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate override values against their Settings field types.
+    
+    Keys that are not declared Settings fields pass through unchanged,
+    matching Settings' extra="allow" behavior.
+    
+    Raises:
+        ValidationError: If any override has an invalid value
+    """
+    validated = {}
+    line_errors = []
+    for key, value in overrides.items():
+        adapter = _FIELD_ADAPTERS.get(key)
+        if adapter is None:
+            validated[key] = value
+            continue
+        try:
+            validated[key] = adapter.validate_python(value)
+        except ValidationError as e:
+            for error in e.errors():
+                line_error = {
+                    "type": error["type"],
+                    "loc": (key, *error["loc"]),
+                    "input": error["input"],
+                }
+                if "ctx" in error:
+                    line_error["ctx"] = error["ctx"]
+                line_errors.append(line_error)
+    
+    if line_errors:
+        raise ValidationError.from_exception_data(Settings.__name__, line_errors)
+    return validated
+
 
 class ConfigManager:
     """Manages configuration with runtime overrides.
@@ -27,6 +102,7 @@ class ConfigManager:
     
     def __init__(self):
         self._default_config: Optional[Settings] = None
+        self._default_dump: Optional[Dict[str, Any]] = None
     
     def load_default_config(self) -> Settings:
         """Load configuration from .env file and Settings defaults.
@@ -34,8 +110,10 @@ class ConfigManager:
         Returns:
             Settings object with .env overrides applied to defaults
         """
-        # Create Settings - pydantic-settings will load from .env automatically
-        self._default_config = Settings()
+        self._default_dump = None
+        # .env is already loaded into os.environ at import, so skip
+        # pydantic-settings' own re-read and parse of the file
+        self._default_config = Settings(_env_file=None)
         return self._default_config
     
     def get_default_config(self) -> Settings:
@@ -52,6 +130,10 @@ class ConfigManager:
         """Create a Settings object with runtime overrides applied.
         
         This allows per-request config customization without modifying .env.
+        Only the override values are validated; the base config is already
+        validated, so the result is a shallow copy of it with the overrides
+        patched in. Overrides of dict-valued fields go through a fresh dump
+        so no nested values are shared with the default config.
         
         Args:
             overrides: Dictionary of config keys to override
@@ -62,25 +144,30 @@ class ConfigManager:
         Raises:
             ValidationError: If overrides contain invalid values
         """
-        # Get base config as dict
-        base_config = self.get_default_config().model_dump()
+        validated = _validate_override_fields(overrides)
+        default_config = self.get_default_config()
         
-        # Apply overrides
-        base_config.update(overrides)
+        if not any(isinstance(getattr(default_config, key, None), dict) for key in validated):
+            return default_config.model_copy(update=validated)
         
-        # Create new Settings instance with merged values
-        return Settings(**base_config)
+        # Nested dict override: rebuild from a dump; base values are trusted
+        base_config = self.get_config_dict()
+        base_config.update(validated)
+        return Settings.model_construct(**base_config)
     
     def get_config_dict(self) -> Dict[str, Any]:
         """Get the configuration as a dictionary.
         
+        The dump is cached until the default config is reloaded; callers get
+        a shallow copy so they can safely add or replace keys.
+        
         Returns:
             Dictionary of current config values
         """
-        if self._default_config is None:
-            self.load_default_config()
+        if self._default_dump is None:
+            self._default_dump = self.get_default_config().model_dump()
         
-        return self._default_config.model_dump()
+        return dict(self._default_dump)
     
     def validate_overrides(self, overrides: Dict[str, Any]) -> Dict[str, str]:
         """Validate config overrides without applying them.
@@ -92,7 +179,9 @@ class ConfigManager:
             Dictionary of validation errors (empty if valid)
         """
         try:
-            self.get_config_with_overrides(overrides)
+            base_config = self.get_config_dict()
+            base_config.update(overrides)
+            Settings(**base_config)
             return {}
         except ValidationError as e:
             errors = {}
@@ -118,18 +207,17 @@ class ConfigManager:
             'prompt_version',   # Runtime version info
         }
         
+        persisted = {k: v for k, v in overrides.items() if k not in EXCLUDED_FIELDS}
+        
         # Validate first
-        validated_settings = self.get_config_with_overrides(overrides)
+        validated_settings = self.get_config_with_overrides(persisted)
         
         # Get path to .env file
         env_path = project_root / ".env"
         
-        # Update .env file
-        for key, value in overrides.items():
-            # Skip excluded fields
-            if key in EXCLUDED_FIELDS:
-                continue
-            
+        # Collect all updates, then rewrite .env once
+        env_updates = {}
+        for key, value in persisted.items():
             # Convert to uppercase for .env format
             env_key = key.upper()
             
@@ -141,18 +229,15 @@ class ConfigManager:
             else:
                 env_value = str(value)
             
-            # Write to .env file with error checking
-            success, _, _ = set_key(
-                str(env_path), 
-                env_key, 
-                env_value,
-                quote_mode='never',  # Don't auto-quote - we control the format
-                encoding='utf-8'
-            )
-            
-            if not success:
-                raise IOError(f"Failed to write {env_key}={env_value} to .env file at {env_path}")
+            env_updates[env_key] = env_value
+        
+        try:
+            _write_env_updates(env_path, env_updates)
+        except OSError as e:
+            raise IOError(f"Failed to write config to .env file at {env_path}: {e}") from e
         
-        # Reload config to pick up changes
-        load_dotenv(env_path, override=True)
-        self._default_config = Settings()
+        # Mirror the new values into the environment (as load_dotenv would) and
+        # adopt the already-validated config instead of re-reading .env
+        os.environ.update(env_updates)
+        self._default_config = validated_settings
+        self._default_dump = None
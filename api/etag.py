@@ -0,0 +1,50 @@
+"""ETag helpers for polled JSON endpoints."""
+
+import gzip
+import hashlib
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+# Bodies smaller than this are sent uncompressed; gzip barely helps them
+GZIP_MINIMUM_SIZE = 1024
+GZIP_COMPRESSLEVEL = 5
+
+
+def compute_etag(body: bytes) -> str:
+    """Compute a strong ETag for a response body."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return an empty 304 response if the client's If-None-Match lists etag, else None."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept-Encoding"})
+    return None
+
+
+def etag_response(request: Request, body: bytes, etag: str = None) -> Response:
+    """Build a JSON response, or 304 Not Modified if the client's copy is current.
+    
+    Args:
+        request: Incoming request (checked for If-None-Match)
+        body: Serialized JSON body
+        etag: Precomputed ETag for body (computed if omitted)
+        
+    Returns:
+        200 response with body and ETag header (gzipped when the client
+        accepts it and the body is large), or empty 304 response
+    """
+    etag = etag or compute_etag(body)
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+    
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if len(body) >= GZIP_MINIMUM_SIZE and "gzip" in request.headers.get("accept-encoding", ""):
+        body = gzip.compress(body, compresslevel=GZIP_COMPRESSLEVEL)
+        headers["Content-Encoding"] = "gzip"
+    
+    return Response(content=body, media_type="application/json", headers=headers)
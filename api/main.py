@@ -10,10 +10,13 @@ Architecture:
 import os
 from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any
 
+import orjson
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from api.config_manager import ConfigManager
@@ -26,10 +29,25 @@ load_dotenv(project_root / ".env", override=True)
 config_manager = ConfigManager()
 
 
+class ORJSONResponse(JSONResponse):
+    """JSON response serialized with orjson.
+    
+    Defined locally because fastapi.responses.ORJSONResponse is deprecated
+    in newer FastAPI releases.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events."""
-    config_manager.load_default_config()
+    settings = config_manager.load_default_config()
+    
+    # Build the LlamaIndex clients up front so the first query does not pay for it
+    from rag_app.utils import configure_llama_index
+    configure_llama_index(settings)
     
     # Initialize prompt manager (creates default prompts if needed)
     from rag_app.prompt_manager import get_prompt_manager
@@ -42,6 +60,7 @@ app = FastAPI(
     description="Web API for interactive RAG testing and evaluation",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -1,18 +1,52 @@
 """Configuration management endpoints."""
 
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, Literal, Optional, Tuple, get_args, get_origin
 
+import orjson
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, ValidationError
+from pydantic_core import PydanticUndefined
+
+from api.etag import compute_etag, etag_response
+from rag_app.config import Settings
 
 router = APIRouter()
 
+# Python types mapped to the JSON schema type names the UI expects
+_JSON_TYPE_NAMES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    dict: "object",
+    list: "array",
+}
+
+
+# (default Settings object, etag, body) for the last served GET /config
+_config_body_cache: Optional[Tuple[Settings, str, bytes]] = None
+
+
+def _json_type_name(annotation: Any) -> Optional[str]:
+    """Map a field annotation to its JSON schema type name."""
+    if get_origin(annotation) is Literal:
+        return _JSON_TYPE_NAMES.get(type(get_args(annotation)[0]))
+    return _JSON_TYPE_NAMES.get(get_origin(annotation) or annotation)
+
 
 class ConfigUpdateRequest(BaseModel):
     """Request model for config updates."""
     overrides: Dict[str, Any]
 
 
+class ActivePromptRequest(BaseModel):
+    """Request model for selecting the prompt a RAG or eval step uses."""
+    category: Literal["rag", "eval"]
+    title: str
+    metric: Optional[str] = None  # Required for eval prompts
+
+
 class ConfigResponse(BaseModel):
     """Response model for config data."""
     config: Dict[str, Any]
@@ -24,15 +58,24 @@ async def get_config(request: Request):
     """Get current default configuration.
     
     Returns the configuration loaded from .env file
-    with Field defaults for any values not specified.
+    with Field defaults for any values not specified. Supports
+    If-None-Match; the body is only re-serialized when the default
+    config object changes.
     """
+    global _config_body_cache
     config_manager = request.app.state.config_manager
-    config_dict = config_manager.get_config_dict()
+    default_config = config_manager.get_default_config()
     
-    return ConfigResponse(
-        config=config_dict,
-        source=".env + defaults"
-    )
+    if _config_body_cache is None or _config_body_cache[0] is not default_config:
+        response = ConfigResponse(
+            config=config_manager.get_config_dict(),
+            source=".env + defaults"
+        )
+        body = orjson.dumps(response.model_dump(mode="json"))
+        _config_body_cache = (default_config, compute_etag(body), body)
+    
+    _, etag, body = _config_body_cache
+    return etag_response(request, body, etag)
 
 
 @router.post("/validate")
@@ -92,31 +135,67 @@ async def save_config(
         )
 
 
-@router.get("/schema")
-async def get_config_schema():
-    """Get the configuration schema for UI form generation.
+@router.post("/active-prompt")
+async def set_active_prompt(
+    request: Request,
+    active_prompt: ActivePromptRequest
+):
+    """Make a saved prompt the active RAG system prompt or eval metric prompt.
     
-    Returns field names, types, defaults, and descriptions.
+    Updates the one config field in .env server-side, so clients do not
+    have to load and re-save the whole configuration.
     """
-    from rag_app.config import Settings
+    from rag_app.prompt_manager import get_prompt_manager
     
-    schema = Settings.model_json_schema()
+    if active_prompt.category == "eval" and not active_prompt.metric:
+        raise HTTPException(status_code=400, detail="metric is required for eval prompts")
     
-    # Extract useful info for UI
+    metric = active_prompt.metric if active_prompt.category == "eval" else None
+    if get_prompt_manager().get_prompt_data(active_prompt.category, active_prompt.title, metric) is None:
+        raise HTTPException(status_code=404, detail="Prompt not found")
+    
+    field = f"eval_prompt_{metric}" if metric else "rag_system_prompt_title"
+    await save_config(request, ConfigUpdateRequest(overrides={field: active_prompt.title}))
+    return {
+        "success": True,
+        "message": f"{field} set to '{active_prompt.title}'"
+    }
+
+
+@lru_cache(maxsize=1)
+def _build_schema_response() -> Dict[str, Any]:
+    """Build the UI schema response once from Settings.model_fields.
+    
+    Reads field metadata directly instead of generating a full JSON schema.
+    """
     fields = {}
-    for field_name, field_info in schema.get("properties", {}).items():
+    required = []
+    for field_name, field_info in Settings.model_fields.items():
+        default = field_info.default
         fields[field_name] = {
-            "type": field_info.get("type"),
-            "default": field_info.get("default"),
-            "description": field_info.get("description", ""),
-            "title": field_info.get("title", field_name),
+            "type": _json_type_name(field_info.annotation),
+            "default": None if default is PydanticUndefined else default,
+            "description": field_info.description or "",
+            "title": field_info.title or field_name.replace("_", " ").title(),
         }
         
-        # Add enum options if present
-        if "enum" in field_info:
-            fields[field_name]["options"] = field_info["enum"]
+        # Add enum options for Literal fields
+        if get_origin(field_info.annotation) is Literal:
+            fields[field_name]["options"] = list(get_args(field_info.annotation))
+        
+        if field_info.is_required():
+            required.append(field_name)
     
     return {
         "fields": fields,
-        "required": schema.get("required", [])
+        "required": required
     }
+
+
+@router.get("/schema")
+async def get_config_schema():
+    """Get the configuration schema for UI form generation.
+    
+    Returns field names, types, defaults, and descriptions.
+    """
+    return _build_schema_response()
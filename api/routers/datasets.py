@@ -1,10 +1,15 @@
 """Dataset management endpoints."""
 
-import json
+import asyncio
+import os
+import shutil
+import tempfile
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
+import orjson
 from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi.responses import Response
 from pydantic import BaseModel, ValidationError
 
 from eval.dataset_schema import EvaluationDataset
@@ -13,6 +18,9 @@ router = APIRouter()
 
 DATASETS_DIR = Path("QA_testing_sets")
 
+MAX_DATASET_BYTES = 50 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 class DatasetInfo(BaseModel):
     """Information about a dataset file."""
@@ -22,6 +30,67 @@ class DatasetInfo(BaseModel):
     description: str = ""
 
 
+# path -> (mtime_ns, info); info is None for files that failed validation
+_dataset_info_cache: Dict[str, Tuple[int, Optional[DatasetInfo]]] = {}
+
+
+def _load_dataset_info(json_file: Path) -> Optional[DatasetInfo]:
+    """Parse and validate a dataset file, reusing the cached result while its mtime is unchanged.
+    
+    Returns:
+        DatasetInfo for a valid dataset, or None if the file is invalid
+    """
+    key = str(json_file)
+    mtime_ns = json_file.stat().st_mtime_ns
+    
+    cached = _dataset_info_cache.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    
+    try:
+        # Parse and validate in one pass
+        dataset = EvaluationDataset.model_validate_json(json_file.read_bytes())
+        
+        info = DatasetInfo(
+            name=json_file.stem,
+            path=str(json_file.relative_to(DATASETS_DIR)),
+            num_questions=len(dataset.records),
+            description=dataset.description or ""
+        )
+    except Exception:
+        info = None
+    
+    _dataset_info_cache[key] = (mtime_ns, info)
+    return info
+
+
+async def _read_upload_capped(file: UploadFile) -> bytes:
+    """Read an upload in chunks, rejecting it as soon as it exceeds MAX_DATASET_BYTES.
+    
+    Raises:
+        HTTPException: 413 if the upload is larger than the limit
+    """
+    buffer = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        buffer.extend(chunk)
+        if len(buffer) > MAX_DATASET_BYTES:
+            raise HTTPException(status_code=413, detail="Dataset file too large")
+    return bytes(buffer)
+
+
+def _spool_upload_to_disk(file: UploadFile, directory: Path) -> Path:
+    """Copy an upload's underlying spooled file into a temp file in directory.
+    
+    Returns:
+        Path to the temp file; caller is responsible for moving or removing it
+    """
+    fd, tmp_name = tempfile.mkstemp(suffix=".tmp", dir=directory)
+    with os.fdopen(fd, "wb") as out_f:
+        file.file.seek(0)
+        shutil.copyfileobj(file.file, out_f, UPLOAD_CHUNK_SIZE)
+    return Path(tmp_name)
+
+
 @router.get("", response_model=List[DatasetInfo])
 async def list_datasets():
     """List all available datasets."""
@@ -31,41 +100,38 @@ async def list_datasets():
     datasets = []
     for json_file in DATASETS_DIR.glob("*.json"):
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Validate schema
-            dataset = EvaluationDataset(**data)
-            
-            datasets.append(DatasetInfo(
-                name=json_file.stem,
-                path=str(json_file.relative_to(DATASETS_DIR)),
-                num_questions=len(dataset.records),
-                description=dataset.description or ""
-            ))
-        except Exception:
-            # Skip invalid datasets
+            info = _load_dataset_info(json_file)
+        except OSError:
+            # File removed between glob and stat
             continue
+        
+        # Skip invalid datasets
+        if info is not None:
+            datasets.append(info)
     
     return datasets
 
 
 @router.get("/{dataset_name}")
-async def get_dataset(dataset_name: str):
-    """Get a specific dataset by name."""
+async def get_dataset(dataset_name: str, validate: bool = False):
+    """Get a specific dataset by name.
+    
+    The file is returned as stored. Pass validate=true to check it against
+    the dataset schema and return the normalized model instead.
+    """
     dataset_path = DATASETS_DIR / f"{dataset_name}.json"
     
     if not dataset_path.exists():
         raise HTTPException(status_code=404, detail="Dataset not found")
     
     try:
-        with open(dataset_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        content = dataset_path.read_bytes()
+        if not validate:
+            return Response(content=content, media_type="application/json")
         
-        # Validate schema
-        dataset = EvaluationDataset(**data)
+        dataset = EvaluationDataset(**orjson.loads(content))
         
-        return dataset.model_dump()
+        return dataset
     except ValidationError as e:
         raise HTTPException(status_code=400, detail=f"Invalid dataset schema: {str(e)}")
     except Exception as e:
@@ -79,25 +145,31 @@ async def upload_dataset(file: UploadFile = File(...)):
     if not file.filename.endswith(".json"):
         raise HTTPException(status_code=400, detail="Only .json files allowed")
     
-    # Read and parse JSON
-    try:
-        content = await file.read()
-        data = json.loads(content.decode('utf-8'))
-    except json.JSONDecodeError as e:
-        raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
-    
-    # Validate schema
-    try:
-        dataset = EvaluationDataset(**data)
-    except ValidationError as e:
-        raise HTTPException(status_code=400, detail=f"Invalid dataset schema: {str(e)}")
-    
-    # Save file
+    # Stream upload to a temp file next to the destination
     DATASETS_DIR.mkdir(parents=True, exist_ok=True)
     dataset_path = DATASETS_DIR / file.filename
+    tmp_path = await asyncio.to_thread(_spool_upload_to_disk, file, DATASETS_DIR)
     
-    with open(dataset_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    try:
+        if tmp_path.stat().st_size > MAX_DATASET_BYTES:
+            raise HTTPException(status_code=413, detail="Dataset file too large")
+        
+        # Parse JSON
+        try:
+            data = orjson.loads(tmp_path.read_bytes())
+        except orjson.JSONDecodeError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
+        
+        # Validate schema
+        try:
+            dataset = EvaluationDataset(**data)
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid dataset schema: {str(e)}")
+        
+        # Save file
+        os.replace(tmp_path, dataset_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
     
     return {
         "message": "Dataset uploaded successfully",
@@ -119,6 +191,7 @@ async def delete_dataset(dataset_name: str):
     
     try:
         dataset_path.unlink()
+        _dataset_info_cache.pop(str(dataset_path), None)
         return {"message": f"Deleted dataset: {dataset_name}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -128,8 +201,8 @@ async def delete_dataset(dataset_name: str):
 async def validate_dataset(file: UploadFile = File(...)):
     """Validate a dataset without saving."""
     try:
-        content = await file.read()
-        data = json.loads(content.decode('utf-8'))
+        content = await _read_upload_capped(file)
+        data = orjson.loads(content)
         dataset = EvaluationDataset(**data)
         
         return {
@@ -137,7 +210,7 @@ async def validate_dataset(file: UploadFile = File(...)):
             "num_questions": len(dataset.records),
             "errors": []
         }
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         return {
             "valid": False,
             "errors": [f"Invalid JSON: {str(e)}"]
@@ -1,31 +1,181 @@
 """Evaluation endpoints for running and viewing results."""
 
 import asyncio
-import json
 import logging
+import shutil
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+import orjson
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     HTTPException,
     Request,
     WebSocket,
     WebSocketDisconnect,
 )
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 
+from api.etag import compute_etag, etag_response, not_modified
+from eval.metrics import DEFAULT_METRICS, METRIC_REGISTRY
 from eval.runner import run_eval
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 RUNS_DIR = Path("storage/runs")
+RUN_LOAD_CONCURRENCY = 16
+# Files whose contents make up a run's details (see get_run_details)
+RUN_DETAIL_FILES = ("metadata.json", "config_snapshot.json", "summary.json", "summary.md", "report.jsonl")
 
-_eval_tasks: Dict[str, Dict[str, Any]] = {}
+MAX_TRACKED_TASKS = 1024
+
+# Task statuses after which a run's progress no longer changes
+FINISHED_STATUSES = ("completed", "error", "cancelled")
+
+
+@dataclass(slots=True)
+class EvalTaskState:
+    """In-memory progress for an evaluation started through the API."""
+    status: str
+    progress: int = 0
+    message: str = ""
+    dataset: str = ""
+    run_name: str = ""
+    timestamp: str = ""
+    current_question: int = 0
+    total_questions: int = 0
+    current_question_text: str = ""
+    run_dir: Optional[str] = None
+
+
+# Insertion-ordered so the oldest finished runs are evicted first
+_eval_tasks: "OrderedDict[str, EvalTaskState]" = OrderedDict()
+# Futures of runs submitted to the eval pool, kept until they finish so
+# runs still waiting for a worker can be cancelled
+_eval_futures: Dict[str, Future] = {}
+
+# Dedicated pool so long-running evals don't starve Starlette's request threadpool
+_eval_executor: Optional[ThreadPoolExecutor] = None
+
+# One event per connected WebSocket, set whenever the run's task info changes
+_eval_listeners: Dict[str, Set[asyncio.Event]] = {}
+
+
+def _get_eval_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Get the evaluation thread pool, creating it on first use."""
+    global _eval_executor
+    if _eval_executor is None:
+        _eval_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="eval")
+    return _eval_executor
+
+
+def _trim_tasks() -> None:
+    """Evict the oldest finished tasks once more than MAX_TRACKED_TASKS are tracked.
+    
+    Running tasks are never evicted; finished runs remain readable from disk.
+    Called on the event loop thread, where all inserts and deletes happen.
+    """
+    excess = len(_eval_tasks) - MAX_TRACKED_TASKS
+    if excess <= 0:
+        return
+    
+    finished = [
+        run_id for run_id, task in _eval_tasks.items()
+        if task.status in FINISHED_STATUSES
+    ]
+    for run_id in finished[:excess]:
+        del _eval_tasks[run_id]
+
+
+def _notify_listeners(run_id: str) -> None:
+    """Wake every WebSocket watching run_id. Must run on the event loop thread."""
+    for event in _eval_listeners.get(run_id, ()):
+        event.set()
+
+
+def _jsonl_lines(path: Path) -> List[bytes]:
+    """Record lines of a JSONL file; blank lines (e.g. a trailing one) are not records."""
+    return [line for line in path.read_bytes().splitlines() if line.strip()]
+
+
+def _load_jsonl(path: Path, offset: int = 0, limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+    """Parse records [offset, offset + limit) of a JSONL file and count them all.
+    
+    The selected lines are parsed in a single orjson call by wrapping them in
+    an array; the others are never parsed.
+    
+    Returns:
+        (records, total number of records in the file)
+    """
+    lines = _jsonl_lines(path)
+    end = None if limit is None else offset + limit
+    return orjson.loads(b"[" + b",".join(lines[offset:end]) + b"]"), len(lines)
+
+
+def _truncate_contexts(results: List[Dict[str, Any]], max_chars: int) -> None:
+    """Cut each result's contexts to max_chars in place, flagging results that lost text."""
+    for record in results:
+        contexts = record.get("contexts")
+        if contexts and any(len(ctx) > max_chars for ctx in contexts):
+            record["contexts"] = [ctx[:max_chars] for ctx in contexts]
+            record["contexts_truncated"] = True
+
+
+def _count_jsonl_records(path: Path) -> int:
+    """Count records in a JSONL file, as _load_jsonl does, without parsing."""
+    return len(_jsonl_lines(path))
+
+
+def _summarize_legacy_report(
+    report_path: Path,
+    summary_path: Path,
+    expected_questions: Optional[int] = None
+) -> Tuple[int, Optional[float]]:
+    """Compute question count and average score from a run without summary.json.
+    
+    A minimal summary.json is written, so subsequent listings skip the
+    report scan, only for runs that have clearly finished: legacy runs
+    without metadata.json (expected_questions is None) and runs whose
+    report holds every expected question. Runs still in progress, or
+    that crashed, are summarized in memory only.
+    
+    Args:
+        report_path: Path to the run's report.jsonl
+        summary_path: Path where summary.json should be written
+        expected_questions: num_questions from the run's metadata.json, if any
+        
+    Returns:
+        Tuple of (num_questions, avg_score); avg_score is None for empty reports
+    """
+    records, _ = _load_jsonl(report_path)
+    if not records:
+        return 0, None
+    
+    num_questions = len(records)
+    avg_score = sum(r.get("overall_score", 0) for r in records) / num_questions
+    
+    if expected_questions is not None and num_questions < expected_questions:
+        return num_questions, avg_score
+    
+    try:
+        # Exclusive create: never replace a summary the runner wrote meanwhile
+        with open(summary_path, "xb") as f:
+            f.write(orjson.dumps(
+                {"total_questions": num_questions, "average_overall_score": avg_score},
+                option=orjson.OPT_INDENT_2,
+            ))
+    except FileExistsError:
+        pass
+    except OSError as e:
+        logger.warning(f"Failed to write summary for {report_path.parent.name}: {e}")
+    
+    return num_questions, avg_score
 
 
 class EvalRunRequest(BaseModel):
@@ -43,7 +193,7 @@ class EvalRunInfo(BaseModel):
     run_name: str
     timestamp: str
     dataset: str
-    status: str  # "running", "completed", "error"
+    status: str  # "running", "completed", "error", "cancelled"
     progress: int = 0  # 0-100
     num_questions: int = 0
     avg_score: Optional[float] = None
@@ -59,15 +209,79 @@ class RunSummary(BaseModel):
     metrics: Dict[str, Any]
 
 
+def _load_run_info(run_dir: Path) -> Optional[EvalRunInfo]:
+    """Load listing info for a completed run from its files on disk.
+    
+    Args:
+        run_dir: Run directory under RUNS_DIR
+        
+    Returns:
+        EvalRunInfo, or None if the run's files could not be read
+    """
+    run_id = run_dir.name
+    
+    try:
+        metadata_file = run_dir / "metadata.json"
+        report_jsonl = run_dir / "report.jsonl"
+        summary_file = run_dir / "summary.json"
+        
+        # Try to load metadata first (new format)
+        dataset_name = ""
+        expected_questions = None
+        if metadata_file.exists():
+            metadata = orjson.loads(metadata_file.read_bytes())
+            expected_questions = metadata.get("num_questions", 0)
+            dataset_name = metadata.get("dataset_name", "")
+            timestamp_str = metadata.get("timestamp_utc", "")
+            run_name = metadata.get("run_name", run_id)
+        else:
+            # Fall back to parsing run_id
+            parts = run_id.split("_", 2)
+            if len(parts) >= 3:
+                timestamp_str = f"{parts[0]}_{parts[1]}"
+                run_name = parts[2]
+            else:
+                timestamp_str = ""
+                run_name = run_id
+        
+        # Prefer precomputed summary; scan the report only for legacy runs
+        avg_score = None
+        num_questions = 0
+        
+        if summary_file.exists():
+            summary = orjson.loads(summary_file.read_bytes())
+            num_questions = summary.get("total_questions", 0)
+            avg_score = summary.get("average_overall_score")
+        elif report_jsonl.exists():
+            num_questions, avg_score = _summarize_legacy_report(report_jsonl, summary_file, expected_questions)
+        
+        return EvalRunInfo(
+            run_id=run_id,
+            run_name=run_name,
+            timestamp=timestamp_str,
+            dataset=dataset_name,
+            status="completed",
+            progress=100,
+            num_questions=num_questions,
+            avg_score=avg_score
+        )
+    except Exception as e:
+        logger.warning(f"Failed to load run {run_id}: {e}")
+        return None
+
+
 @router.post("/run")
 async def start_evaluation(
     request: Request,
-    background_tasks: BackgroundTasks,
     eval_request: EvalRunRequest
 ):
     """Start an evaluation run in the background.
     
-    Returns immediately with run_id. Use WebSocket or /runs/{run_id}
+    Runs execute on a dedicated thread pool sized by max_concurrent_evals;
+    additional runs queue until a worker is free. Returns immediately with
+    run_id and the run's initial progress (same shape as
+    /runs/{run_id}/progress), so clients can render it without polling
+    first. Use WebSocket, /runs/{run_id}/events or /runs/{run_id}/progress
     to monitor progress.
     """
     config_manager = request.app.state.config_manager
@@ -86,27 +300,40 @@ async def start_evaluation(
     run_name = eval_request.run_name or "eval"
     run_id = f"{timestamp}_{run_name}"
     
+    loop = asyncio.get_running_loop()
+    
+    def notify():
+        """Signal progress listeners from the worker thread."""
+        try:
+            loop.call_soon_threadsafe(_notify_listeners, run_id)
+        except RuntimeError:
+            # Event loop already closed (server shutting down)
+            pass
+    
     # Initialize task tracking
-    _eval_tasks[run_id] = {
-        "status": "running",
-        "progress": 0,
-        "message": "Starting evaluation...",
-        "dataset": eval_request.dataset,
-        "run_name": run_name,
-        "timestamp": timestamp,
-    }
+    task = EvalTaskState(
+        status="running",
+        message="Starting evaluation...",
+        dataset=eval_request.dataset,
+        run_name=run_name,
+        timestamp=timestamp,
+    )
+    _eval_tasks[run_id] = task
+    _trim_tasks()
     
     def run_evaluation_task():
         """Background task to run evaluation."""
         try:
-            _eval_tasks[run_id]["message"] = "Running evaluation..."
-            _eval_tasks[run_id]["progress"] = 10
+            task.message = "Running evaluation..."
+            task.progress = 10
+            notify()
             
             # Progress callback to update in-memory task info
             def update_progress(current, total, question):
-                _eval_tasks[run_id]["current_question"] = current
-                _eval_tasks[run_id]["total_questions"] = total
-                _eval_tasks[run_id]["current_question_text"] = question[:100]  # Truncate long questions
+                task.current_question = current
+                task.total_questions = total
+                task.current_question_text = question[:100]  # Truncate long questions
+                notify()
             
             # Run evaluation (this is synchronous)
             run_dir = run_eval(
@@ -116,135 +343,183 @@ async def start_evaluation(
                 num_questions=eval_request.num_questions,
                 selected_metrics=eval_request.selected_metrics,
                 progress_callback=update_progress,
+                run_folder_name=run_id,
             )
             
-            _eval_tasks[run_id]["status"] = "completed"
-            _eval_tasks[run_id]["progress"] = 100
-            _eval_tasks[run_id]["message"] = "Evaluation completed"
-            _eval_tasks[run_id]["run_dir"] = str(run_dir)
+            task.status = "completed"
+            task.progress = 100
+            task.message = "Evaluation completed"
+            task.run_dir = str(run_dir)
             
             logger.info(f"Evaluation {run_id} completed: {run_dir}")
         except Exception as e:
-            _eval_tasks[run_id]["status"] = "error"
-            _eval_tasks[run_id]["message"] = f"Error: {str(e)}"
-            _eval_tasks[run_id]["progress"] = 0
+            task.status = "error"
+            task.message = f"Error: {str(e)}"
+            task.progress = 0
             logger.error(f"Evaluation {run_id} failed: {e}")
+        finally:
+            notify()
     
-    background_tasks.add_task(run_evaluation_task)
+    executor = _get_eval_executor(config_manager.get_default_config().max_concurrent_evals)
+    future = executor.submit(run_evaluation_task)
+    _eval_futures[run_id] = future
+    future.add_done_callback(lambda _: _eval_futures.pop(run_id, None))
     
     return {
         "run_id": run_id,
         "status": "started",
-        "message": "Evaluation started in background"
+        "message": "Evaluation started in background",
+        "progress": _run_progress(run_id, task)
     }
 
 
-@router.get("/runs", response_model=List[EvalRunInfo])
-async def list_runs():
-    """List all evaluation runs.
+async def _list_run_infos() -> List[EvalRunInfo]:
+    """Load metadata for all runs in storage/runs/, newest first.
     
-    Returns metadata for all runs in storage/runs/.
+    Completed runs are loaded concurrently in worker threads.
     """
     if not RUNS_DIR.exists():
         return []
     
-    runs = []
+    run_dirs = [d for d in sorted(RUNS_DIR.iterdir(), reverse=True) if d.is_dir()]
+    semaphore = asyncio.Semaphore(RUN_LOAD_CONCURRENCY)
     
-    for run_dir in sorted(RUNS_DIR.iterdir(), reverse=True):
-        if not run_dir.is_dir():
-            continue
-        
+    async def load(run_dir: Path) -> Optional[EvalRunInfo]:
         run_id = run_dir.name
         
         # Check if this is a running task
         if run_id in _eval_tasks:
-            task_info = _eval_tasks[run_id]
-            runs.append(EvalRunInfo(
+            task = _eval_tasks[run_id]
+            return EvalRunInfo(
                 run_id=run_id,
-                run_name=task_info.get("run_name", ""),
-                timestamp=task_info.get("timestamp", ""),
-                dataset=task_info.get("dataset", ""),
-                status=task_info["status"],
-                progress=task_info.get("progress", 0)
-            ))
-            continue
+                run_name=task.run_name,
+                timestamp=task.timestamp,
+                dataset=task.dataset,
+                status=task.status,
+                progress=task.progress
+            )
         
-        # Load completed run info
-        try:
-            metadata_file = run_dir / "metadata.json"
-            config_snapshot = run_dir / "config_snapshot.json"
-            report_jsonl = run_dir / "report.jsonl"
-            
-            # Try to load metadata first (new format)
-            dataset_name = ""
-            if metadata_file.exists():
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
-                    dataset_name = metadata.get("dataset_name", "")
-                    timestamp_str = metadata.get("timestamp_utc", "")
-                    run_name = metadata.get("run_name", run_id)
-            else:
-                # Fall back to parsing run_id
-                parts = run_id.split("_", 2)
-                if len(parts) >= 3:
-                    timestamp_str = f"{parts[0]}_{parts[1]}"
-                    run_name = parts[2]
-                else:
-                    timestamp_str = ""
-                    run_name = run_id
-            
-            # Calculate summary stats if report exists
-            avg_score = None
-            num_questions = 0
-            
-            if report_jsonl.exists():
-                with open(report_jsonl, 'r') as f:
-                    records = [json.loads(line) for line in f]
-                    num_questions = len(records)
-                    
-                    if records:
-                        scores = [r.get("overall_score", 0) for r in records]
-                        avg_score = sum(scores) / len(scores) if scores else 0
-            
-            runs.append(EvalRunInfo(
-                run_id=run_id,
-                run_name=run_name,
-                timestamp=timestamp_str,
-                dataset=dataset_name,
-                status="completed",
-                progress=100,
-                num_questions=num_questions,
-                avg_score=avg_score
-            ))
-        except Exception as e:
-            logger.warning(f"Failed to load run {run_id}: {e}")
-            continue
+        async with semaphore:
+            return await asyncio.to_thread(_load_run_info, run_dir)
+    
+    results = await asyncio.gather(*(load(d) for d in run_dirs))
+    return [run for run in results if run is not None]
+
+
+@router.get("/runs", response_model=List[EvalRunInfo])
+async def list_runs(request: Request):
+    """List all evaluation runs.
+    
+    Returns metadata for all runs in storage/runs/. Supports If-None-Match
+    so unchanged listings return 304 without a body.
+    """
+    runs = await _list_run_infos()
+    body = orjson.dumps([run.model_dump() for run in runs])
+    return etag_response(request, body)
+
+
+@router.get("/runs/view")
+async def get_run_view(request: Request, run_id: Optional[str] = None):
+    """Everything the reports page shows, in one request.
+    
+    Returns the run list, the details of run_id, or of the newest run when
+    run_id is omitted or unknown, and the token prices used for cost
+    estimates. Per-question results are left out so the page can render
+    before they load; it fetches them a page at a time from /runs/{run_id}.
+    """
+    runs = await _list_run_infos()
+    if run_id not in {run.run_id for run in runs}:
+        run_id = runs[0].run_id if runs else None
+    
+    settings = request.app.state.config_manager.get_default_config()
+    return {
+        "runs": [run.model_dump() for run in runs],
+        "run_id": run_id,
+        "details": await _load_run_details(run_id) if run_id else None,
+        "pricing": {
+            "input_token_price_per_million": settings.input_token_price_per_million,
+            "output_token_price_per_million": settings.output_token_price_per_million,
+        },
+    }
+
+
+def _run_details_etag(run_id: str, query: str) -> Optional[str]:
+    """ETag for a run's details, derived from its files' stats instead of their contents.
+    
+    Returns None for runs that only exist in memory so far.
+    """
+    run_dir = RUNS_DIR / run_id
+    if not run_dir.is_dir():
+        return None
     
-    return runs
+    task = _eval_tasks.get(run_id)
+    parts = [query, task.status if task else "completed"]
+    for name in RUN_DETAIL_FILES:
+        try:
+            stat = (run_dir / name).stat()
+            parts.append(f"{name}:{stat.st_mtime_ns}:{stat.st_size}")
+        except FileNotFoundError:
+            parts.append(f"{name}:-")
+    return compute_etag("|".join(parts).encode("utf-8"))
 
 
 @router.get("/runs/{run_id}")
-async def get_run_details(run_id: str):
+async def get_run_details(
+    request: Request,
+    run_id: str,
+    include_results: bool = False,
+    results_offset: int = 0,
+    results_limit: Optional[int] = None,
+    truncate_contexts: Optional[int] = None
+):
     """Get detailed information about a specific run.
     
-    Returns config, summary, and full results.
+    Returns config and summary. Per-question results are only parsed and
+    returned when include_results=true, optionally just results_limit of
+    them starting at results_offset; otherwise "results" is empty. Either
+    way "num_results" reports how many have been written so far.
+    
+    With truncate_contexts, retrieved contexts are cut to that many
+    characters and results that lost text get "contexts_truncated": true.
+    
+    Supports If-None-Match. The ETag comes from the run's file stats and
+    status, so an unchanged run returns 304 without reading its files.
     """
+    etag = _run_details_etag(run_id, str(request.query_params))
+    if etag is not None:
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+    
+    details = await _load_run_details(run_id, include_results, results_offset, results_limit, truncate_contexts)
+    return etag_response(request, orjson.dumps(details), etag)
+
+
+async def _load_run_details(
+    run_id: str,
+    include_results: bool = False,
+    results_offset: int = 0,
+    results_limit: Optional[int] = None,
+    truncate_contexts: Optional[int] = None
+) -> Dict[str, Any]:
+    """Load a run's details; see get_run_details for the parameters."""
     run_dir = RUNS_DIR / run_id
     
     # Check if run directory exists
     if not run_dir.exists():
         # If not on disk yet, check if it's a newly started run
         if run_id in _eval_tasks:
-            task_info = _eval_tasks[run_id]
+            task = _eval_tasks[run_id]
             return {
                 "run_id": run_id,
-                "status": task_info["status"],
-                "message": task_info.get("message", "Starting evaluation..."),
-                "current_question": task_info.get("current_question", 0),
-                "total_questions": task_info.get("total_questions", 0),
-                "current_question_text": task_info.get("current_question_text", ""),
+                "status": task.status,
+                "message": task.message,
+                "current_question": task.current_question,
+                "total_questions": task.total_questions,
+                "current_question_text": task.current_question_text,
                 "metadata": {},
-                "results": []
+                "results": [],
+                "num_results": 0
             }
         raise HTTPException(status_code=404, detail="Run not found")
     
@@ -254,25 +529,22 @@ async def get_run_details(run_id: str):
         # Load metadata (available immediately when run starts)
         metadata_path = run_dir / "metadata.json"
         if metadata_path.exists():
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-                result["metadata"] = metadata
-                result["run_name"] = metadata.get("run_name", "")
-                result["dataset"] = metadata.get("dataset_path", "")
+            metadata = orjson.loads(metadata_path.read_bytes())
+            result["metadata"] = metadata
+            result["run_name"] = metadata.get("run_name", "")
+            result["dataset"] = metadata.get("dataset_path", "")
         else:
             result["metadata"] = {}
         
         # Load config snapshot
         config_path = run_dir / "config_snapshot.json"
         if config_path.exists():
-            with open(config_path, 'r') as f:
-                result["config"] = json.load(f)
+            result["config"] = orjson.loads(config_path.read_bytes())
         
         # Load summary (only available after completion)
         summary_path = run_dir / "summary.json"
         if summary_path.exists():
-            with open(summary_path, 'r') as f:
-                result["summary"] = json.load(f)
+            result["summary"] = orjson.loads(summary_path.read_bytes())
         
         # Load summary markdown
         summary_md_path = run_dir / "summary.md"
@@ -281,16 +553,22 @@ async def get_run_details(run_id: str):
         
         # Load report JSONL (grows during evaluation)
         report_path = run_dir / "report.jsonl"
-        if report_path.exists():
-            with open(report_path, 'r', encoding='utf-8') as f:
-                result["results"] = [json.loads(line) for line in f if line.strip()]
+        if not report_path.exists():
+            result["results"] = []
+            result["num_results"] = 0
+        elif include_results:
+            result["results"], result["num_results"] = _load_jsonl(
+                report_path, max(results_offset, 0), results_limit
+            )
+            if truncate_contexts is not None:
+                _truncate_contexts(result["results"], max(truncate_contexts, 0))
         else:
             result["results"] = []
+            result["num_results"] = _count_jsonl_records(report_path)
         
         # Check if still running
         if run_id in _eval_tasks:
-            task_info = _eval_tasks[run_id]
-            result["status"] = task_info["status"]
+            result["status"] = _eval_tasks[run_id].status
         else:
             result["status"] = "completed"
         
@@ -300,6 +578,81 @@ async def get_run_details(run_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to load run: {str(e)}")
 
 
+def _run_progress(run_id: str, task: Optional[EvalTaskState]) -> Dict[str, Any]:
+    """Progress counters for a run; task is None for runs no longer tracked in memory."""
+    report_path = RUNS_DIR / run_id / "report.jsonl"
+    results_count = _count_jsonl_records(report_path) if report_path.exists() else 0
+    
+    if task is None:
+        return {
+            "run_id": run_id,
+            "status": "completed",
+            "message": "",
+            "current_question": results_count,
+            "total_questions": results_count,
+            "current_question_text": "",
+            "results_count": results_count
+        }
+    
+    return {
+        "run_id": run_id,
+        "status": task.status,
+        "message": task.message,
+        "current_question": task.current_question,
+        "total_questions": task.total_questions,
+        "current_question_text": task.current_question_text,
+        "results_count": results_count
+    }
+
+
+@router.get("/runs/{run_id}/progress")
+async def get_run_progress(run_id: str):
+    """Get a run's progress counters for polling.
+    
+    Unlike get_run_details, this never reads the run's config, summary or
+    results, so the response stays a few scalars however large the run is.
+    """
+    task = _eval_tasks.get(run_id)
+    if task is None and not (RUNS_DIR / run_id).exists():
+        raise HTTPException(status_code=404, detail="Run not found")
+    return _run_progress(run_id, task)
+
+
+@router.get("/runs/{run_id}/events")
+async def stream_run_progress(run_id: str):
+    """Server-sent events stream of a run's progress.
+    
+    Sends the current progress, then one event per update (each answered
+    question) until the run completes or fails. Plain-HTTP counterpart of
+    /ws/{run_id}, so clients can follow a run without polling /progress.
+    """
+    if run_id not in _eval_tasks and not (RUNS_DIR / run_id).exists():
+        raise HTTPException(status_code=404, detail="Run not found")
+    
+    async def events():
+        event = asyncio.Event()
+        _eval_listeners.setdefault(run_id, set()).add(event)
+        try:
+            while True:
+                task = _eval_tasks.get(run_id)
+                progress = _run_progress(run_id, task)
+                yield b"data: " + orjson.dumps(progress) + b"\n\n"
+                if progress["status"] in FINISHED_STATUSES:
+                    break
+                
+                # Sleep until the evaluation thread reports a change
+                await event.wait()
+                event.clear()
+        finally:
+            listeners = _eval_listeners.get(run_id)
+            if listeners is not None:
+                listeners.discard(event)
+                if not listeners:
+                    del _eval_listeners[run_id]
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
 @router.get("/runs/{run_id}/download")
 async def download_run(run_id: str):
     """Download a run's summary.md file.
@@ -321,18 +674,32 @@ async def download_run(run_id: str):
 
 @router.delete("/runs/{run_id}")
 async def delete_run(run_id: str):
-    """Delete an evaluation run."""
+    """Delete an evaluation run, or cancel it if it is still waiting for a worker."""
+    # cancel() fails once the worker has picked the run up
+    future = _eval_futures.get(run_id)
+    if future is not None and future.cancel():
+        # Kept as a finished task so progress clients see why the run ended
+        task = _eval_tasks[run_id]
+        task.status = "cancelled"
+        task.message = "Evaluation cancelled before it started"
+        _notify_listeners(run_id)
+        return {"message": f"Cancelled queued run: {run_id}"}
+    
     run_dir = RUNS_DIR / run_id
     
     if not run_dir.exists():
+        # A cancelled run never got a folder; deleting it drops the task
+        task = _eval_tasks.get(run_id)
+        if task is not None and task.status == "cancelled":
+            del _eval_tasks[run_id]
+            return {"message": f"Deleted run: {run_id}"}
         raise HTTPException(status_code=404, detail="Run not found")
     
     # Don't allow deleting running evaluations
-    if run_id in _eval_tasks and _eval_tasks[run_id]["status"] == "running":
+    if run_id in _eval_tasks and _eval_tasks[run_id].status == "running":
         raise HTTPException(status_code=409, detail="Cannot delete running evaluation")
     
     try:
-        import shutil
         shutil.rmtree(run_dir)
         
         # Remove from tasks if present
@@ -347,8 +714,6 @@ async def delete_run(run_id: str):
 @router.get("/available-metrics")
 async def get_metrics_list():
     """Get list of all available evaluation metrics from registry."""
-    from eval.metrics import METRIC_REGISTRY, DEFAULT_METRICS
-    
     return {
         "metrics": list(METRIC_REGISTRY.keys()),
         "default": DEFAULT_METRICS
@@ -360,6 +725,9 @@ async def eval_websocket(websocket: WebSocket, run_id: str):
     """WebSocket endpoint for real-time evaluation progress."""
     await websocket.accept()
     
+    event = asyncio.Event()
+    _eval_listeners.setdefault(run_id, set()).add(event)
+    
     try:
         while True:
             if run_id not in _eval_tasks:
@@ -369,14 +737,22 @@ async def eval_websocket(websocket: WebSocket, run_id: str):
                 })
                 break
             
-            task_info = _eval_tasks[run_id]
-            await websocket.send_json(task_info)
+            task = _eval_tasks[run_id]
+            await websocket.send_json(asdict(task))
             
-            if task_info["status"] in ["completed", "error"]:
+            if task.status in FINISHED_STATUSES:
                 break
             
-            await asyncio.sleep(0.5)
+            # Sleep until the evaluation thread reports a change
+            await event.wait()
+            event.clear()
         
         await websocket.close()
     except WebSocketDisconnect:
         logger.info(f"Evaluation WebSocket disconnected for {run_id}")
+    finally:
+        listeners = _eval_listeners.get(run_id)
+        if listeners is not None:
+            listeners.discard(event)
+            if not listeners:
+                del _eval_listeners[run_id]
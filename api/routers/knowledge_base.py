@@ -1,29 +1,38 @@
 """Knowledge base management endpoints."""
 
+import asyncio
+import atexit
 import logging
+import multiprocessing
 import os
+import queue
 import shutil
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     File,
     Form,
     HTTPException,
+    Request,
     UploadFile,
     WebSocket,
     WebSocketDisconnect,
 )
-from pydantic import BaseModel
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
 
+from rag_app.config import Settings
 from rag_app.ingest import ingest_knowledge_base
+from rag_app.utils import scandir_txt_files
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 KNOWLEDGE_BASE_DIR = Path("knowledge_base")
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_CONCURRENCY = 8
 
 
 class FileInfo(BaseModel):
@@ -43,6 +52,12 @@ class FileTreeNode(BaseModel):
     size: int = 0
 
 
+# Resolve the self-reference and build serializers at import, not on first request
+FileTreeNode.model_rebuild()
+_FILE_TREE_ADAPTER = TypeAdapter(FileTreeNode)
+_FILE_LIST_ADAPTER = TypeAdapter(List[FileInfo])
+
+
 class IngestStatus(BaseModel):
     """Status of ingestion operation."""
     status: str  # "idle", "running", "completed", "error"
@@ -53,37 +68,200 @@ class IngestStatus(BaseModel):
 # Global ingestion status (in-memory)
 _ingest_status = IngestStatus(status="idle")
 
+# One event per connected ingestion WebSocket or event stream, set whenever the status changes
+_ingest_listeners: Set[asyncio.Event] = set()
 
-@router.get("/files", response_model=List[FileInfo])
-async def list_files():
-    """List all files in the knowledge base.
+
+# Ingestion runs in its own process so it never competes with request
+# handlers for the GIL; the task relays its status updates back here.
+_ingest_process: Optional[multiprocessing.process.BaseProcess] = None
+_ingest_task: Optional["asyncio.Task[None]"] = None
+
+
+def _notify_ingest_listeners() -> None:
+    """Wake every ingestion WebSocket and event stream. Must run on the event loop thread."""
+    for event in _ingest_listeners:
+        event.set()
+
+
+def _ingest_worker(settings_dict: Dict[str, Any], status_queue: "multiprocessing.Queue") -> None:
+    """Run ingestion in a child process, reporting IngestStatus dicts on status_queue.
     
-    Returns flat list of files with metadata.
+    The last message is always a "completed" or "error" status.
+    
+    Args:
+        settings_dict: Dump of an already-validated Settings object
+        status_queue: Queue read by the API process
+    """
+    try:
+        settings = Settings.model_construct(**settings_dict)
+        
+        status_queue.put({"status": "running", "message": "Loading documents...", "progress": 0})
+        
+        def report_progress(done: int, total: int) -> None:
+            status_queue.put({
+                "status": "running",
+                "message": f"Indexed {done}/{total} documents",
+                "progress": int(done / total * 100),
+            })
+        
+        ingest_knowledge_base(settings, progress_cb=report_progress)
+        
+        status_queue.put({
+            "status": "completed",
+            "message": "Ingestion completed successfully",
+            "progress": 100,
+        })
+    except Exception as e:
+        status_queue.put({
+            "status": "error",
+            "message": f"Ingestion failed: {str(e)}",
+            "progress": 0,
+        })
+
+
+def _terminate_ingest_worker() -> None:
+    """Stop an ingestion process left running at interpreter exit."""
+    if _ingest_process is not None and _ingest_process.is_alive():
+        _ingest_process.terminate()
+        _ingest_process.join(timeout=5)
+
+
+atexit.register(_terminate_ingest_worker)
+
+
+async def _run_ingestion_process(settings_dict: Dict[str, Any]) -> None:
+    """Start the ingestion process and relay its status until it finishes."""
+    global _ingest_status, _ingest_process
+    
+    # spawn avoids forking a process that already runs threads (uvicorn, chroma)
+    ctx = multiprocessing.get_context("spawn")
+    status_queue = ctx.Queue()
+    process = ctx.Process(target=_ingest_worker, args=(settings_dict, status_queue), name="ingest")
+    
+    try:
+        process.start()
+        _ingest_process = process
+        
+        while True:
+            try:
+                update = await asyncio.to_thread(status_queue.get, True, 1.0)
+            except queue.Empty:
+                if process.is_alive():
+                    continue
+                update = {
+                    "status": "error",
+                    "message": f"Ingestion failed: worker exited with code {process.exitcode}",
+                    "progress": 0,
+                }
+            
+            _ingest_status = IngestStatus(**update)
+            _notify_ingest_listeners()
+            if _ingest_status.status in ("completed", "error"):
+                break
+        
+        await asyncio.to_thread(process.join)
+        if _ingest_status.status == "completed":
+            logger.info("Ingestion completed successfully")
+        else:
+            logger.error(_ingest_status.message)
+    except Exception as e:
+        _ingest_status = IngestStatus(status="error", message=f"Ingestion failed: {str(e)}", progress=0)
+        _notify_ingest_listeners()
+        logger.error(f"Ingestion failed: {e}")
+    finally:
+        status_queue.close()
+        _invalidate_kb_cache()
+
+# Cached listings, keyed on (root dir mtime, change version). The version is
+# bumped by every endpoint that modifies the knowledge base, since nested
+# changes do not update the root directory's mtime.
+_kb_version = 0
+_kb_cache: Dict[str, Any] = {"key": None, "files": None, "tree": None}
+
+
+def _save_upload(file: UploadFile, file_path: Path) -> None:
+    """Copy an upload's spooled file to file_path in fixed-size chunks."""
+    file.file.seek(0)
+    with open(file_path, "wb") as out_f:
+        shutil.copyfileobj(file.file, out_f, UPLOAD_CHUNK_SIZE)
+
+
+def _invalidate_kb_cache() -> None:
+    """Mark cached knowledge base listings as stale."""
+    global _kb_version
+    _kb_version += 1
+
+
+def _get_kb_cache() -> Dict[str, Any]:
+    """Get the listing cache, cleared if the knowledge base has changed."""
+    key = (KNOWLEDGE_BASE_DIR.stat().st_mtime_ns, _kb_version)
+    if _kb_cache["key"] != key:
+        _kb_cache.update(key=key, files=None, tree=None)
+    return _kb_cache
+
+
+def get_kb_files() -> List[FileInfo]:
+    """Get all .txt files in the knowledge base, served from cache when unchanged.
+    
+    Returns:
+        Flat list of FileInfo (empty if the knowledge base does not exist)
     """
     if not KNOWLEDGE_BASE_DIR.exists():
         return []
     
+    cache = _get_kb_cache()
+    if cache["files"] is not None:
+        return cache["files"]
+    
+    # scandir entry paths are root + os.sep + relative path, so slice instead of relpath
+    root = str(KNOWLEDGE_BASE_DIR)
+    prefix_len = len(root) + len(os.sep)
+    
     files = []
-    for txt_file in KNOWLEDGE_BASE_DIR.rglob("*.txt"):
-        relative_path = txt_file.relative_to(KNOWLEDGE_BASE_DIR)
-        category = str(relative_path.parent) if relative_path.parent != Path(".") else "root"
+    for entry in scandir_txt_files(root):
+        relative_path = entry.path[prefix_len:]
+        category = os.path.dirname(relative_path) or "root"
         
         files.append(FileInfo(
-            path=str(relative_path),
+            path=relative_path,
             category=category,
-            filename=txt_file.name,
-            size=txt_file.stat().st_size
+            filename=entry.name,
+            size=entry.stat().st_size
         ))
     
+    cache["files"] = files
     return files
 
 
-@router.get("/tree", response_model=FileTreeNode)
-async def get_file_tree():
-    """Get hierarchical file tree for knowledge base.
+@router.get("/version")
+async def get_kb_version():
+    """Get a version string that changes whenever the knowledge base listing may have.
     
-    Returns tree structure for file browser UI.
+    Lets clients keep their copy of /files and /tree until it changes.
     """
+    # /files and /tree are empty while the directory is missing
+    if not KNOWLEDGE_BASE_DIR.exists():
+        return {"version": f"missing-{_kb_version}"}
+    
+    mtime_ns, version = _get_kb_cache()["key"]
+    return {"version": f"{mtime_ns}-{version}"}
+
+
+@router.get("/files", response_model=List[FileInfo])
+async def list_files():
+    """List all files in the knowledge base.
+    
+    Returns flat list of files with metadata.
+    """
+    return Response(
+        content=_FILE_LIST_ADAPTER.dump_json(get_kb_files()),
+        media_type="application/json"
+    )
+
+
+def _build_file_tree() -> FileTreeNode:
+    """Build the knowledge base file tree, served from cache when unchanged."""
     if not KNOWLEDGE_BASE_DIR.exists():
         return FileTreeNode(
             name="knowledge_base",
@@ -92,31 +270,117 @@ async def get_file_tree():
             children=[]
         )
     
-    def build_tree(directory: Path) -> FileTreeNode:
-        """Recursively build file tree."""
-        node = FileTreeNode(
-            name=directory.name,
-            type="directory",
-            path=str(directory.relative_to(KNOWLEDGE_BASE_DIR)) if directory != KNOWLEDGE_BASE_DIR else ""
-        )
+    cache = _get_kb_cache()
+    if cache["tree"] is not None:
+        return cache["tree"]
+    
+    root = FileTreeNode(name=KNOWLEDGE_BASE_DIR.name, type="directory", path="")
+    
+    # Iterative walk: one scandir per directory, children appended in sorted order
+    base = str(KNOWLEDGE_BASE_DIR)
+    prefix_len = len(base) + len(os.sep)
+    stack = [(base, root)]
+    while stack:
+        directory, node = stack.pop()
+        
+        subdirs = []
+        txt_files = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_symlink():
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry)
+                elif entry.is_file(follow_symlinks=False) and entry.name.endswith(".txt"):
+                    txt_files.append(entry)
         
         # Add subdirectories
-        for subdir in sorted(directory.iterdir()):
-            if subdir.is_dir():
-                node.children.append(build_tree(subdir))
+        for entry in sorted(subdirs, key=lambda e: e.name):
+            child = FileTreeNode(
+                name=entry.name,
+                type="directory",
+                path=entry.path[prefix_len:]
+            )
+            node.children.append(child)
+            stack.append((entry.path, child))
         
         # Add files
-        for file in sorted(directory.glob("*.txt")):
+        for entry in sorted(txt_files, key=lambda e: e.name):
             node.children.append(FileTreeNode(
-                name=file.name,
+                name=entry.name,
                 type="file",
-                path=str(file.relative_to(KNOWLEDGE_BASE_DIR)),
-                size=file.stat().st_size
+                path=entry.path[prefix_len:],
+                size=entry.stat().st_size
             ))
-        
-        return node
     
-    return build_tree(KNOWLEDGE_BASE_DIR)
+    cache["tree"] = root
+    return root
+
+
+@router.get("/tree", response_model=FileTreeNode)
+async def get_file_tree():
+    """Get hierarchical file tree for knowledge base.
+    
+    Returns tree structure for file browser UI.
+    """
+    return Response(
+        content=_FILE_TREE_ADAPTER.dump_json(_build_file_tree()),
+        media_type="application/json"
+    )
+
+
+def _resolve_upload_path(filename: str, category: Optional[str]) -> Path:
+    """Resolve where an uploaded file is stored in the knowledge base.
+    
+    When uploading folders, the browser sends webkitRelativePath in the
+    filename (usually "foldername/subfolder/file.txt"); the leading folder
+    name is dropped and subdirectories are preserved. Otherwise the file
+    goes to category/ if given, or the knowledge base root.
+    """
+    # Check if filename contains path separators (folder upload)
+    if "/" in filename or "\\" in filename:
+        # Preserve folder structure
+        # Remove leading folder name and use rest as path
+        parts = filename.replace("\\", "/").split("/")
+        if len(parts) > 1:
+            # Skip the root folder name, preserve subdirectories
+            relative_path = "/".join(parts[1:]) if len(parts) > 2 else parts[-1]
+            return KNOWLEDGE_BASE_DIR / relative_path.replace("/", os.sep)
+        return KNOWLEDGE_BASE_DIR / parts[-1]
+    elif category:
+        # Use category if specified
+        return KNOWLEDGE_BASE_DIR / category / filename
+    # Save to root
+    return KNOWLEDGE_BASE_DIR / filename
+
+
+def _make_dirs(directories: Iterable[Path]) -> None:
+    """Create each directory once; failures surface later as per-file write errors."""
+    for directory in directories:
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to create {directory}: {e}")
+
+
+async def _save_one(
+    file: UploadFile,
+    file_path: Path,
+    semaphore: asyncio.Semaphore
+) -> Tuple[Optional[str], Optional[str]]:
+    """Save a single uploaded file whose parent directory already exists.
+    
+    Returns:
+        Tuple of (uploaded relative path, error message); exactly one is set
+    """
+    try:
+        async with semaphore:
+            await asyncio.to_thread(_save_upload, file, file_path)
+        logger.info(f"Uploaded file: {file_path}")
+        return str(file_path.relative_to(KNOWLEDGE_BASE_DIR)), None
+    except Exception as e:
+        logger.error(f"Failed to upload {file.filename}: {e}")
+        return None, f"{file.filename}: {str(e)}"
 
 
 @router.post("/upload")
@@ -129,51 +393,27 @@ async def upload_files(
     Files are saved preserving their folder structure from the client.
     If webkitRelativePath is provided in filename (from folder upload),
     it preserves the directory structure. Otherwise saves to category/ or root.
+    Files are written concurrently, at most UPLOAD_CONCURRENCY at a time.
     """
-    uploaded = []
     errors = []
-    
+    pending = []
     for file in files:
         # Validate file type
         if not file.filename.endswith(".txt"):
             errors.append(f"{file.filename}: Only .txt files allowed")
             continue
-        
-        # Handle folder structure preservation
-        # When uploading folders, browser sends webkitRelativePath in filename
-        # Format is usually "foldername/subfolder/file.txt"
-        filename = file.filename
-        
-        # Check if filename contains path separators (folder upload)
-        if "/" in filename or "\\" in filename:
-            # Preserve folder structure
-            # Remove leading folder name and use rest as path
-            parts = filename.replace("\\", "/").split("/")
-            if len(parts) > 1:
-                # Skip the root folder name, preserve subdirectories
-                relative_path = "/".join(parts[1:]) if len(parts) > 2 else parts[-1]
-                file_path = KNOWLEDGE_BASE_DIR / relative_path.replace("/", os.sep)
-            else:
-                file_path = KNOWLEDGE_BASE_DIR / parts[-1]
-        elif category:
-            # Use category if specified
-            file_path = KNOWLEDGE_BASE_DIR / category / filename
-        else:
-            # Save to root
-            file_path = KNOWLEDGE_BASE_DIR / filename
-        
-        # Create directory structure
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Save file
-        try:
-            content = await file.read()
-            file_path.write_bytes(content)
-            uploaded.append(str(file_path.relative_to(KNOWLEDGE_BASE_DIR)))
-            logger.info(f"Uploaded file: {file_path}")
-        except Exception as e:
-            errors.append(f"{file.filename}: {str(e)}")
-            logger.error(f"Failed to upload {file.filename}: {e}")
+        pending.append((file, _resolve_upload_path(file.filename, category)))
+    
+    # One mkdir per distinct directory instead of one per file
+    await asyncio.to_thread(_make_dirs, sorted({path.parent for _, path in pending}))
+    
+    semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+    results = await asyncio.gather(*(_save_one(file, path, semaphore) for file, path in pending))
+    
+    uploaded = [path for path, _ in results if path is not None]
+    errors.extend(error for _, error in results if error is not None)
+    
+    _invalidate_kb_cache()
     
     return {
         "uploaded": uploaded,
@@ -189,64 +429,46 @@ async def delete_file(file_path: str):
     Args:
         file_path: Relative path from knowledge_base/ directory
     """
-    full_path = KNOWLEDGE_BASE_DIR / file_path
+    root = os.path.abspath(KNOWLEDGE_BASE_DIR)
+    full_path = os.path.abspath(os.path.join(root, file_path))
     
-    if not full_path.exists():
-        raise HTTPException(status_code=404, detail="File not found")
-    
-    if not full_path.is_file():
-        raise HTTPException(status_code=400, detail="Path is not a file")
+    # Reject paths that escape the knowledge base (e.g. "../")
+    if full_path == root or os.path.commonpath([root, full_path]) != root:
+        raise HTTPException(status_code=400, detail="Path is outside the knowledge base")
     
+    # Let unlink's errno distinguish the failure cases instead of pre-checking
     try:
-        full_path.unlink()
-        logger.info(f"Deleted file: {full_path}")
-        return {"message": f"Deleted {file_path}"}
-    except Exception as e:
+        os.unlink(full_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+    except IsADirectoryError:
+        raise HTTPException(status_code=400, detail="Path is not a file")
+    except OSError as e:
         logger.error(f"Failed to delete {file_path}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    
+    _invalidate_kb_cache()
+    logger.info(f"Deleted file: {full_path}")
+    return {"message": f"Deleted {file_path}"}
 
 
 @router.post("/ingest")
-async def trigger_ingest(background_tasks: BackgroundTasks):
+async def trigger_ingest(request: Request):
     """Trigger ingestion of knowledge base files.
     
-    Runs in background. Use /status or WebSocket for progress.
+    Runs in a separate worker process. Use /status or WebSocket for progress.
     """
-    global _ingest_status
+    global _ingest_status, _ingest_task
     
     if _ingest_status.status == "running":
         raise HTTPException(status_code=409, detail="Ingestion already in progress")
     
-    def run_ingestion():
-        """Background task to run ingestion."""
-        global _ingest_status
-        _ingest_status = IngestStatus(status="running", message="Starting ingestion...")
-        
-        try:
-            from api.config_manager import ConfigManager
-            config_manager = ConfigManager()
-            settings = config_manager.get_default_config()
-            
-            _ingest_status.message = "Loading documents..."
-            _ingest_status.progress = 30
-            
-            ingest_knowledge_base(settings)
-            
-            _ingest_status = IngestStatus(
-                status="completed",
-                message="Ingestion completed successfully",
-                progress=100
-            )
-            logger.info("Ingestion completed successfully")
-        except Exception as e:
-            _ingest_status = IngestStatus(
-                status="error",
-                message=f"Ingestion failed: {str(e)}",
-                progress=0
-            )
-            logger.error(f"Ingestion failed: {e}")
+    settings = request.app.state.config_manager.get_default_config()
+    
+    _ingest_status = IngestStatus(status="running", message="Starting ingestion...")
+    _notify_ingest_listeners()
     
-    background_tasks.add_task(run_ingestion)
+    _ingest_task = asyncio.create_task(_run_ingestion_process(settings.model_dump()))
     return {"message": "Ingestion started", "status": "running"}
 
 
@@ -256,14 +478,45 @@ async def get_ingest_status():
     return _ingest_status
 
 
+@router.get("/ingest/stream")
+async def stream_ingest_status():
+    """Server-sent events stream of ingestion progress.
+    
+    Sends the current status, then one event per status change until
+    ingestion is no longer running. Plain-HTTP counterpart of /ws/ingest,
+    so clients can follow progress without polling /ingest/status.
+    """
+    async def events():
+        event = asyncio.Event()
+        _ingest_listeners.add(event)
+        try:
+            while True:
+                status = _ingest_status
+                yield f"data: {status.model_dump_json()}\n\n"
+                if status.status != "running":
+                    break
+                
+                # Sleep until the ingestion task reports a change
+                await event.wait()
+                event.clear()
+        finally:
+            _ingest_listeners.discard(event)
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
 @router.websocket("/ws/ingest")
 async def ingest_websocket(websocket: WebSocket):
     """WebSocket endpoint for real-time ingestion progress.
     
-    Sends periodic updates while ingestion is running.
+    Sends the current status, then one update per status change until
+    ingestion completes or fails.
     """
     await websocket.accept()
     
+    event = asyncio.Event()
+    _ingest_listeners.add(event)
+    
     try:
         while True:
             # Send current status
@@ -273,10 +526,12 @@ async def ingest_websocket(websocket: WebSocket):
             if _ingest_status.status in ["completed", "error"]:
                 break
             
-            # Wait before next update
-            import asyncio
-            await asyncio.sleep(0.5)
+            # Sleep until the ingestion thread reports a change
+            await event.wait()
+            event.clear()
         
         await websocket.close()
     except WebSocketDisconnect:
         logger.info("Ingestion WebSocket disconnected")
+    finally:
+        _ingest_listeners.discard(event)
@@ -1,10 +1,12 @@
 """Prompt management endpoints."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException
+import orjson
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
+from api.etag import etag_response
 from rag_app.prompt_manager import get_prompt_manager
 
 router = APIRouter()
@@ -19,6 +21,18 @@ class PromptCreateRequest(BaseModel):
     type: str = "system"  # For RAG prompts
 
 
+class PromptRef(BaseModel):
+    """Identifies one stored prompt."""
+    category: str  # "rag" or "eval"
+    title: str
+    metric: Optional[str] = None  # For eval prompts
+
+
+class PromptBatchDeleteRequest(BaseModel):
+    """Request model for deleting several prompts at once."""
+    prompts: List[PromptRef]
+
+
 class PromptResponse(BaseModel):
     """Response model for prompt data."""
     title: str
@@ -30,10 +44,35 @@ class PromptResponse(BaseModel):
     type: Optional[str] = None  # For RAG prompts
 
 
+@router.get("", response_model=Dict[str, List[PromptResponse]])
+async def list_prompts_bulk(request: Request, categories: str = "rag,eval"):
+    """List prompts for several categories in one request.
+    
+    Supports If-None-Match so unchanged listings return 304 without a body.
+    
+    Args:
+        categories: Comma-separated categories, each "rag" or "eval" (default: both)
+    """
+    requested = list(dict.fromkeys(c.strip() for c in categories.split(",") if c.strip()))
+    if not requested or any(category not in ["rag", "eval"] for category in requested):
+        raise HTTPException(status_code=400, detail="Categories must be 'rag' and/or 'eval'")
+    
+    prompt_manager = get_prompt_manager()
+    
+    # Prompts come from our own store (written by save_prompt), so skip revalidation
+    body = orjson.dumps({
+        category: [PromptResponse.model_construct(**p).model_dump() for p in prompt_manager.list_prompts(category)]
+        for category in requested
+    })
+    return etag_response(request, body)
+
+
 @router.get("/{category}", response_model=List[PromptResponse])
-async def list_prompts(category: str):
+async def list_prompts(request: Request, category: str):
     """List all prompts for a category.
     
+    Supports If-None-Match so unchanged listings return 304 without a body.
+    
     Args:
         category: "rag" or "eval"
     """
@@ -43,7 +82,9 @@ async def list_prompts(category: str):
     prompt_manager = get_prompt_manager()
     prompts = prompt_manager.list_prompts(category)
     
-    return [PromptResponse(**p) for p in prompts]
+    # Prompts come from our own store (written by save_prompt), so skip revalidation
+    body = orjson.dumps([PromptResponse.model_construct(**p).model_dump() for p in prompts])
+    return etag_response(request, body)
 
 
 @router.get("/{category}/{title}")
@@ -59,22 +100,38 @@ async def get_prompt(category: str, title: str, metric: Optional[str] = None):
         raise HTTPException(status_code=400, detail="Category must be 'rag' or 'eval'")
     
     prompt_manager = get_prompt_manager()
-    content = prompt_manager.get_prompt(category, title, metric)
+    prompt = prompt_manager.get_prompt_data(category, title, metric)
     
-    if not content:
+    if not prompt or not prompt.get("content"):
         raise HTTPException(status_code=404, detail=f"Prompt '{title}' not found")
     
-    # Find full prompt data
-    prompts = prompt_manager.list_prompts(category)
-    for p in prompts:
-        if category == "eval":
-            if p.get("title") == title and p.get("metric") == metric:
-                return PromptResponse(**p)
-        else:
-            if p.get("title") == title:
-                return PromptResponse(**p)
-    
-    raise HTTPException(status_code=404, detail=f"Prompt '{title}' not found")
+    return PromptResponse(**prompt)
+
+
+@router.post("/batch-delete")
+async def delete_prompts(batch: PromptBatchDeleteRequest):
+    """Delete several prompts in one request.
+    
+    Each category's prompts file is rewritten once. Default prompts cannot
+    be deleted; prompts that do not exist are skipped.
+    """
+    keys_by_category: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+    for prompt in batch.prompts:
+        if prompt.category not in ["rag", "eval"]:
+            raise HTTPException(status_code=400, detail="Category must be 'rag' or 'eval'")
+        if prompt.title == "Default v1.0":
+            raise HTTPException(status_code=400, detail="Cannot delete default prompts")
+        keys_by_category.setdefault(prompt.category, []).append((prompt.title, prompt.metric))
+    
+    prompt_manager = get_prompt_manager()
+    deleted = 0
+    for category, keys in keys_by_category.items():
+        count = prompt_manager.delete_prompts(category, keys)
+        if count is None:
+            raise HTTPException(status_code=500, detail=f"Failed to delete {category} prompts")
+        deleted += count
+    
+    return {"success": True, "deleted": deleted, "message": f"Deleted {deleted} prompt(s)"}
 
 
 @router.post("/{category}")
@@ -3,7 +3,7 @@
 from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, HTTPException, Request
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from rag_app.rag import answer_question
 
@@ -14,8 +14,10 @@ class QueryRequest(BaseModel):
     """Request model for answering a question."""
     question: str
     top_k: Optional[int] = None
+    # Restrict retrieval to one knowledge base category (top-level folder)
+    category: Optional[str] = None
     # Allow any additional config overrides
-    config_overrides: Dict[str, Any] = {}
+    config_overrides: Dict[str, Any] = Field(default_factory=dict)
 
 
 class QueryResponse(BaseModel):
@@ -43,17 +45,16 @@ async def answer_query(request: Request, query: QueryRequest):
     """
     config_manager = request.app.state.config_manager
     
-    # Build config overrides
-    overrides = query.config_overrides.copy()
-    if query.top_k is not None:
-        overrides["top_k"] = query.top_k
-    
     # Get settings with overrides applied
     try:
-        if overrides:
-            settings = config_manager.get_config_with_overrides(overrides)
-        else:
+        if query.top_k is None and not query.config_overrides:
             settings = config_manager.get_default_config()
+        elif query.top_k is None:
+            settings = config_manager.get_config_with_overrides(query.config_overrides)
+        else:
+            settings = config_manager.get_config_with_overrides(
+                {**query.config_overrides, "top_k": query.top_k}
+            )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid configuration: {str(e)}")
     
@@ -62,7 +63,8 @@ async def answer_query(request: Request, query: QueryRequest):
         result = answer_question(
             question=query.question,
             settings=settings,
-            top_k=query.top_k
+            top_k=query.top_k,
+            category=query.category
         )
         return QueryResponse(**result)
     except Exception as e:
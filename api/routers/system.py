@@ -1,13 +1,39 @@
 """System endpoints for health and maintenance."""
 
+import asyncio
+import os
 import shutil
+import subprocess
 from pathlib import Path
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
+from api.routers.datasets import DATASETS_DIR
+from api.routers.eval_router import RUNS_DIR
+from api.routers.knowledge_base import get_kb_files
+
 router = APIRouter()
 
+VECTOR_STORE_DIR = Path("storage/chroma")
+
+
+def _count_entries(directory: Path, want_dirs: bool, suffix: str = "") -> int:
+    """Count directory entries with one scandir, using readdir's cached type info.
+    
+    Args:
+        directory: Directory to scan (missing directories count as 0)
+        want_dirs: Count subdirectories if True, otherwise regular files
+        suffix: Required filename suffix for files
+    """
+    try:
+        with os.scandir(directory) as it:
+            if want_dirs:
+                return sum(1 for e in it if e.is_dir(follow_symlinks=False))
+            return sum(1 for e in it if e.is_file() and e.name.endswith(suffix))
+    except FileNotFoundError:
+        return 0
+
 
 class SystemStatus(BaseModel):
     """System status information."""
@@ -20,34 +46,39 @@ class SystemStatus(BaseModel):
 @router.get("/status", response_model=SystemStatus)
 async def get_system_status():
     """Get system status and statistics."""
-    vector_store_dir = Path("storage/chroma")
-    kb_dir = Path("knowledge_base")
-    datasets_dir = Path("QA_testing_sets")
-    runs_dir = Path("storage/runs")
-    
     # Count files
-    kb_files = len(list(kb_dir.rglob("*.txt"))) if kb_dir.exists() else 0
-    dataset_files = len(list(datasets_dir.glob("*.json"))) if datasets_dir.exists() else 0
-    run_dirs = len([d for d in runs_dir.iterdir() if d.is_dir()]) if runs_dir.exists() else 0
+    kb_files = len(get_kb_files())
+    dataset_files = _count_entries(DATASETS_DIR, want_dirs=False, suffix=".json")
+    run_dirs = _count_entries(RUNS_DIR, want_dirs=True)
     
     return SystemStatus(
-        vector_store_exists=vector_store_dir.exists(),
+        vector_store_exists=VECTOR_STORE_DIR.exists(),
         knowledge_base_files=kb_files,
         datasets=dataset_files,
         eval_runs=run_dirs
     )
 
 
+def _remove_tree(directory: Path) -> None:
+    """Recursively delete directory.
+    
+    On POSIX a single `rm -rf` replaces the per-entry Python stat/unlink
+    calls of shutil.rmtree; other platforms fall back to shutil.
+    """
+    if os.name == "posix":
+        subprocess.run(["rm", "-rf", "--", str(directory)], check=True, capture_output=True)
+    else:
+        shutil.rmtree(directory)
+
+
 @router.post("/reset")
 async def reset_vector_store():
     """Reset the vector store (deletes all indexed documents)."""
-    vector_store_dir = Path("storage/chroma")
-    
-    if not vector_store_dir.exists():
+    if not VECTOR_STORE_DIR.exists():
         return {"message": "Vector store does not exist"}
     
     try:
-        shutil.rmtree(vector_store_dir)
+        await asyncio.to_thread(_remove_tree, VECTOR_STORE_DIR)
         return {"message": "Vector store reset successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to reset: {str(e)}")
@@ -1,19 +1,35 @@
-"""Run the FastAPI development server.
+"""Run the FastAPI server.
 
 Usage:
     python -m api.server
     
 Or with uvicorn directly:
     uvicorn api.main:app --reload --port 8000
+
+Environment:
+    API_DEV: Set to 1 to enable auto-reload (single process)
+    API_WORKERS: Number of worker processes when not in dev mode (default: 1).
+        Evaluation and ingestion progress is tracked in process memory, so
+        status polling and WebSockets only see tasks started on the same
+        worker; raise this only behind sticky routing.
 """
 
+import os
+import sys
+
 if __name__ == "__main__":
     import uvicorn
     
+    dev_mode = os.environ.get("API_DEV", "").lower() in ("1", "true", "yes")
+    
     uvicorn.run(
         "api.main:app",
         host="127.0.0.1",
         port=8000,
-        reload=True,
+        # uvloop is not available on Windows; uvicorn[standard] installs it elsewhere
+        loop="auto" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=None if dev_mode else int(os.environ.get("API_WORKERS", "1")),
+        reload=dev_mode,
         log_level="info"
     )
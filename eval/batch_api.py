@@ -0,0 +1,86 @@
+"""OpenAI Batch API transport for offline (non-interactive) judge runs."""
+
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import orjson
+from openai import OpenAI
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+# Status polling backs off exponentially between these bounds
+BATCH_POLL_INITIAL_SECONDS = 5.0
+BATCH_POLL_MAX_SECONDS = 60.0
+_BATCH_FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def _message_content(item: Dict[str, Any]) -> Optional[str]:
+    """Extract the assistant message from one Batch API output line."""
+    response = item.get("response") or {}
+    if item.get("error") or response.get("status_code") != 200:
+        logger.error(f"Batch request {item.get('custom_id')} failed: {item.get('error') or response.get('body')}")
+        return None
+    
+    message = response["body"]["choices"][0]["message"]
+    if message.get("refusal"):
+        logger.error(f"Judge refused to answer: {message['refusal']}")
+        return None
+    return message.get("content")
+
+
+def run_chat_batch(
+    requests: Dict[str, Dict[str, Any]],
+    client: Optional[OpenAI] = None
+) -> Dict[str, Optional[str]]:
+    """
+    Run chat completion requests as one Batch API job and wait for it.
+    
+    The requests are uploaded as a single JSONL file, the job is polled
+    until it reaches a final status, and the output file is downloaded.
+    Expired or cancelled jobs still return whatever finished in time.
+    
+    Args:
+        requests: custom_id -> chat completion request body
+        client: OpenAI client (default: one built from the environment)
+    
+    Returns:
+        custom_id -> assistant message content (None if that request failed)
+    """
+    client = client or OpenAI()
+    
+    payload = b"".join(
+        orjson.dumps({"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}) + b"\n"
+        for custom_id, body in requests.items()
+    )
+    input_file = client.files.create(file=("judge_batch.jsonl", payload), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=BATCH_COMPLETION_WINDOW
+    )
+    logger.info(f"Submitted judge batch {batch.id} with {len(requests)} requests")
+    
+    delay = BATCH_POLL_INITIAL_SECONDS
+    while batch.status not in _BATCH_FINAL_STATUSES:
+        time.sleep(delay)
+        delay = min(delay * 2, BATCH_POLL_MAX_SECONDS)
+        batch = client.batches.retrieve(batch.id)
+    
+    if batch.status != "completed":
+        logger.error(f"Judge batch {batch.id} ended with status '{batch.status}'")
+    
+    contents: Dict[str, Optional[str]] = dict.fromkeys(requests)
+    if batch.output_file_id:
+        for line in client.files.content(batch.output_file_id).content.splitlines():
+            if line.strip():
+                item = orjson.loads(line)
+                contents[item["custom_id"]] = _message_content(item)
+    
+    failed = sum(content is None for content in contents.values())
+    if failed:
+        logger.warning(f"Judge batch {batch.id}: {failed}/{len(requests)} requests returned no result")
+    
+    return contents
@@ -1,19 +1,30 @@
 """Dataset loading and validation."""
 
-import json
+from functools import lru_cache
 from pathlib import Path
 
 from eval.dataset_schema import EvaluationDataset
 
 
+@lru_cache(maxsize=32)
+def _load_cached(path_str: str, mtime_ns: int, size: int) -> EvaluationDataset:
+    """Parse a dataset file; keyed on mtime/size so edits invalidate the entry."""
+    return EvaluationDataset.model_validate_json(Path(path_str).read_bytes())
+
+
 def load_dataset(dataset_path: str) -> EvaluationDataset:
-    """Load and validate evaluation dataset from JSON."""
+    """Load and validate evaluation dataset from JSON.
+    
+    The raw bytes are parsed and validated in one pass by pydantic-core,
+    without building an intermediate dict. Results are cached per
+    (path, mtime, size), and each call returns a shallow copy so callers
+    can reassign fields (e.g. truncate records) without touching the cache.
+    """
     path = Path(dataset_path)
     
-    if not path.exists():
+    try:
+        st = path.stat()
+    except FileNotFoundError:
         raise FileNotFoundError(f"Dataset not found: {dataset_path}")
     
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    
-    return EvaluationDataset(**data)
+    return _load_cached(str(path.resolve()), st.st_mtime_ns, st.st_size).model_copy()
@@ -0,0 +1,42 @@
+"""On-disk cache of judge API responses.
+
+Entries are content-addressed by the fully formatted judge prompt, so
+editing a prompt template or its inputs naturally yields new keys.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from rag_app.utils import clear_json_cache, get_json_cache_entry, put_json_cache_entry
+
+
+def judge_cache_key(
+    prompt: str,
+    model: str,
+    temperature: float,
+    sample_idx: int,
+    score_only: bool = False
+) -> str:
+    """Build the cache key for one judge sample.
+    
+    Score-only responses (no verdict) are keyed separately so they are never
+    served to callers that asked for reasoning.
+    """
+    mode = "score|" if score_only else ""
+    return hashlib.sha256(f"{mode}{model}|{temperature}|{sample_idx}|{prompt}".encode("utf-8")).hexdigest()
+
+
+def get_cached_judgement(cache_dir: Path, key: str) -> Optional[Dict[str, Any]]:
+    """Return the cached judge response for key, or None on a miss."""
+    return get_json_cache_entry(cache_dir, key)
+
+
+def put_cached_judgement(cache_dir: Path, key: str, result: Dict[str, Any]) -> None:
+    """Store a judge response atomically."""
+    put_json_cache_entry(cache_dir, key, result)
+
+
+def clear_judge_cache(cache_dir: Path) -> None:
+    """Delete every cached judge response."""
+    clear_json_cache(cache_dir)
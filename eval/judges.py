@@ -2,13 +2,25 @@
 Pure functional LLM-as-judge implementations for evaluation metrics.
 Handles all judging logic with proper JSON validation and error handling.
 """
-import json
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
-from rag_app.config import get_settings
+import math
+import re
+import weakref
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Callable, Awaitable, List, Dict, Any, Optional
+import httpx
+import orjson
+from openai import APIConnectionError, APITimeoutError, AsyncOpenAI, InternalServerError, RateLimitError
+from rag_app.config import Settings as AppSettings, get_settings
 from rag_app.prompt_manager import get_prompt_manager
+from .batch_api import run_chat_batch
+from .judge_cache import get_cached_judgement, judge_cache_key, put_cached_judgement
+from .rate_limit import AsyncLimiter
 from .prompts import (
+    BATCH_JUDGE_PROMPT,
     CONTEXTUAL_PRECISION_PROMPT,
     CORRECTNESS_PROMPT,
     FAITHFULNESS_PROMPT,
@@ -17,124 +29,416 @@ from .prompts import (
 
 logger = logging.getLogger(__name__)
 
+JUDGE_SYSTEM_PROMPT = "You are an expert evaluation assistant. Always respond with valid JSON only."
+# Rough completion budget added to the prompt's token estimate for rate limiting
+JUDGE_RESPONSE_TOKEN_ESTIMATE = 256
+# Completion cap for score-only streaming; the score is the schema's first field
+JUDGE_SCORE_ONLY_MAX_TOKENS = 16
+# Matches a complete "score" value in a partially streamed JSON response
+_SCORE_PATTERN = re.compile(r'"score"\s*:\s*(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)\s*[,}]')
+# Shared connection pool per client; keep-alive is raised to the limiter's
+# concurrency if that is higher so concurrent calls reuse live sockets
+JUDGE_MAX_CONNECTIONS = 100
+JUDGE_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+# Samples launched per wave after the first when early termination is enabled
+SAMPLE_WAVE_SIZE = 2
 
-def _call_judge_api(
+
+# Strict structured output schema for a single judgement
+_JUDGEMENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "number", "minimum": 0, "maximum": 1},
+        "verdict": {"type": "string"}
+    },
+    "required": ["score", "verdict"],
+    "additionalProperties": False
+}
+_JUDGE_SCHEMA = {"name": "judge", "schema": _JUDGEMENT_SCHEMA, "strict": True}
+
+
+def _batch_judge_schema(num_cases: int) -> Dict[str, Any]:
+    """Strict structured output schema for a list-wise response of num_cases results."""
+    case_schema = {
+        "type": "object",
+        "properties": {"case": {"type": "integer"}, **_JUDGEMENT_SCHEMA["properties"]},
+        "required": ["case", "score", "verdict"],
+        "additionalProperties": False
+    }
+    return {
+        "name": "judge_batch",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "results": {
+                    "type": "array",
+                    "items": case_schema,
+                    "minItems": num_cases,
+                    "maxItems": num_cases
+                }
+            },
+            "required": ["results"],
+            "additionalProperties": False
+        },
+        "strict": True
+    }
+
+
+# metric -> (prompt-library setting, built-in fallback prompt, prompt fields)
+METRIC_SPECS = {
+    "contextual_precision": (
+        "eval_prompt_contextual_precision",
+        CONTEXTUAL_PRECISION_PROMPT,
+        ("question", "expected_answer", "contexts"),
+    ),
+    "correctness": (
+        "eval_prompt_correctness",
+        CORRECTNESS_PROMPT,
+        ("question", "expected_answer", "answer", "contexts"),
+    ),
+    "faithfulness": (
+        "eval_prompt_faithfulness",
+        FAITHFULNESS_PROMPT,
+        ("question", "contexts", "answer"),
+    ),
+    "contextual_relevance": (
+        "eval_prompt_contextual_relevance",
+        CONTEXTUAL_RELEVANCE_PROMPT,
+        ("question", "expected_answer", "contexts"),
+    ),
+}
+
+# AsyncOpenAI holds an httpx pool bound to the loop it was first used on,
+# so keep one client per event loop (each eval thread runs its own
+# long-lived loop, see eval.metrics._run_sync).
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+_limiter: Optional[AsyncLimiter] = None
+
+
+def _get_async_client() -> AsyncOpenAI:
+    """Return the AsyncOpenAI client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        connections = max(JUDGE_MAX_CONNECTIONS, get_settings().judge_max_concurrency)
+        # Retries are handled in _call_judge_api_async, after the limiter
+        client = AsyncOpenAI(
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+                timeout=JUDGE_HTTP_TIMEOUT,
+            ),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def _get_limiter(settings) -> AsyncLimiter:
+    """Return the process-wide judge limiter, rebuilt if its settings changed."""
+    global _limiter
+    limits = (
+        settings.judge_max_concurrency,
+        settings.judge_requests_per_minute,
+        settings.judge_tokens_per_minute,
+    )
+    if _limiter is None or (
+        _limiter.max_concurrent,
+        _limiter.requests_per_minute,
+        _limiter.tokens_per_minute,
+    ) != limits:
+        _limiter = AsyncLimiter(*limits)
+    return _limiter
+
+
+def _judge_cache_dir(settings, temperature: float) -> Optional[Path]:
+    """Cache directory to use for this judge call, or None if caching is off.
+    
+    Sampled (temperature > 0) responses are only cached when
+    judge_cache_stochastic is set, since replaying them hides judge variance.
+    """
+    if not settings.judge_cache_enabled:
+        return None
+    if temperature > 0 and not settings.judge_cache_stochastic:
+        return None
+    return Path(settings.judge_cache_dir)
+
+
+def _retry_after_seconds(error: RateLimitError, attempt: int) -> float:
+    """Delay requested by a 429's Retry-After header, else exponential backoff."""
+    try:
+        return float(error.response.headers["retry-after"])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return float(2 ** attempt)
+
+
+def _is_valid_batch_result(result: Dict[str, Any], num_cases: int) -> bool:
+    """Check a list-wise response has one scored entry per case."""
+    results = result.get("results")
+    return (
+        isinstance(results, list)
+        and len(results) == num_cases
+        and all(isinstance(r, dict) and "score" in r for r in results)
+    )
+
+
+def _prompt_cache_key(prompt: str) -> str:
+    """OpenAI prompt_cache_key shared by all calls with this exact prompt."""
+    return "judge-" + hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _judge_request_body(
     prompt: str,
     model: str,
     temperature: float,
+    num_cases: Optional[int] = None
+) -> Dict[str, Any]:
+    """Chat completion parameters for one judge call with strict structured output."""
+    json_schema = _JUDGE_SCHEMA if num_cases is None else _batch_judge_schema(num_cases)
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": JUDGE_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": temperature,
+        "response_format": {"type": "json_schema", "json_schema": json_schema}
+    }
+
+
+async def _stream_score(client: AsyncOpenAI, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Stream a judge response and stop as soon as its score has been emitted.
+    
+    Returns:
+        {"score": float, "verdict": ""} or None if no score could be parsed
+    """
+    stream = await client.chat.completions.create(
+        **request, stream=True, max_tokens=JUDGE_SCORE_ONLY_MAX_TOKENS
+    )
+    buffer = ""
+    try:
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            buffer += chunk.choices[0].delta.content or ""
+            match = _SCORE_PATTERN.search(buffer)
+            if match:
+                return {"score": float(match.group(1)), "verdict": ""}
+    finally:
+        # Abandon the rest of the completion
+        await stream.close()
+    return None
+
+
+async def _call_judge_api_async(
+    prompt: str,
+    model: str,
+    temperature: float,
+    limiter: AsyncLimiter,
+    sample_idx: int = 0,
+    cache_dir: Optional[Path] = None,
+    num_cases: Optional[int] = None,
+    score_only: bool = False,
     max_retries: int = 3
 ) -> Optional[Dict[str, Any]]:
     """
-    Call OpenAI API with JSON output enforcement and retry logic.
+    Call OpenAI API with strict structured output and retry logic.
+    
+    The response is constrained to the judge JSON schema, so only rate
+    limits and transient network/server errors are retried: 429 responses
+    wait for the server's Retry-After delay and the others back off
+    exponentially (1s, 2s, 4s).
+    When cache_dir is given, valid responses are read from and written to
+    the on-disk judge cache.
+    
+    Args:
+        num_cases: For list-wise prompts, the number of cases; the response
+                   must then hold a "results" array of that length
+        score_only: Only the score is needed (single-row prompts): stream the
+                    response and stop once the score is parsed, falling back
+                    to a regular call if it cannot be
     
     Returns:
         Parsed JSON dict on success, None on failure
     """
-    client = OpenAI()
+    cache_key = None
+    if cache_dir is not None:
+        cache_key = judge_cache_key(prompt, model, temperature, sample_idx, score_only)
+        cached = get_cached_judgement(cache_dir, cache_key)
+        if cached is not None:
+            return cached
+    
+    client = _get_async_client()
+    estimated_tokens = len(prompt) // 4 + JUDGE_RESPONSE_TOKEN_ESTIMATE * (num_cases or 1)
+    request = _judge_request_body(prompt, model, temperature, num_cases)
+    # Route every sample of this prompt to the same server-side prompt cache
+    # (sent via extra_body so older SDKs without the parameter still work)
+    request["extra_body"] = {"prompt_cache_key": _prompt_cache_key(prompt)}
+    streaming = score_only and num_cases is None
     
     for attempt in range(max_retries):
         try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": "You are an expert evaluation assistant. Always respond with valid JSON only."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=temperature,
-                response_format={"type": "json_object"}
-            )
+            result = None
+            if streaming:
+                async with limiter.slot(estimated_tokens=estimated_tokens):
+                    result = await _stream_score(client, request)
+                if result is None:
+                    logger.warning("Could not parse streamed judge score, retrying without streaming")
+                    streaming = False
             
-            result = json.loads(response.choices[0].message.content)
+            if result is None:
+                async with limiter.slot(estimated_tokens=estimated_tokens):
+                    response = await client.chat.completions.create(**request)
+                
+                message = response.choices[0].message
+                if getattr(message, "refusal", None):
+                    logger.error(f"Judge refused to answer: {message.refusal}")
+                    return None
+                
+                result = orjson.loads(message.content)
             
-            # Validate required fields
-            if "score" not in result:
-                logger.warning(f"Judge response missing 'score' field (attempt {attempt + 1})")
-                continue
+            # Defensive check: the schema already fixes the array length
+            if num_cases is not None and not _is_valid_batch_result(result, num_cases):
+                logger.error(f"Batch judge response is not {num_cases} scored results")
+                return None
             
+            if cache_key is not None:
+                put_cached_judgement(cache_dir, cache_key, result)
             return result
             
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error (attempt {attempt + 1}): {e}")
+        except orjson.JSONDecodeError as e:
+            # Only possible for truncated output; a retry would hit the same limit
+            logger.error(f"JSON decode error: {e}")
+            return None
+        except RateLimitError as e:
+            delay = _retry_after_seconds(e, attempt)
+            logger.warning(f"Judge rate limited (attempt {attempt + 1}), retrying in {delay:.1f}s")
+            if attempt + 1 < max_retries:
+                await asyncio.sleep(delay)
+        except (APIConnectionError, APITimeoutError, InternalServerError) as e:
+            delay = float(2 ** attempt)
+            logger.warning(f"Transient API error (attempt {attempt + 1}), retrying in {delay:.0f}s: {e}")
+            if attempt + 1 < max_retries:
+                await asyncio.sleep(delay)
         except Exception as e:
-            logger.error(f"API call error (attempt {attempt + 1}): {e}")
+            logger.error(f"API call error: {e}")
+            return None
     
     return None
 
 
-def judge_contextual_precision(
-    question: str,
-    contexts: List[str],
-    expected_answer: str,
-    answer: str = "",
-    model: Optional[str] = None,
-    num_samples: Optional[int] = None,
-    temperature: Optional[float] = None,
-    include_reasoning: Optional[bool] = None,
-    prompt_template: Optional[str] = None
-) -> Dict[str, Any]:
+def _clamp_score(value: Any) -> float:
+    """Convert a judge score to float in [0, 1]; raises ValueError/TypeError if invalid."""
+    return max(0.0, min(1.0, float(value)))
+
+
+def _standard_error(scores: List[float]) -> float:
+    """Standard error of the mean of at least two scores."""
+    n = len(scores)
+    mean = sum(scores) / n
+    variance = sum((score - mean) ** 2 for score in scores) / (n - 1)
+    return math.sqrt(variance / n)
+
+
+async def _gather_samples(
+    make_call: Callable[[int], Awaitable[Optional[Dict[str, Any]]]],
+    row_scores: Callable[[Dict[str, Any]], List[float]],
+    num_samples: int,
+    settings
+) -> List[Optional[Dict[str, Any]]]:
     """
-    Evaluate contextual precision using OpenAI LLM-as-judge.
+    Collect up to num_samples judge responses, stopping early once scores agree.
     
-    All parameters are optional and will be loaded from .env defaults if not provided.
+    With judge_se_threshold > 0, samples are launched in waves (first
+    judge_min_samples, then SAMPLE_WAVE_SIZE at a time) and sampling stops
+    once the standard error of the mean score is below the threshold for
+    every row. Otherwise all samples are launched at once.
     
     Args:
-        question: The question being answered
-        contexts: List of retrieved context strings (ordered by ranking)
-        expected_answer: The expected/golden answer
-        model: OpenAI model to use (default: from settings.judge_model)
-        num_samples: Number of samples to average (default: from settings.judge_num_samples)
-        temperature: Sampling temperature (default: from settings.judge_temperature)
-        include_reasoning: Include verdict reasoning (default: from settings.include_metric_reasons)
-        prompt_template: Custom prompt template (default: from prompts.py)
+        make_call: Returns the judge call coroutine for a sample index
+        row_scores: Extracts the per-row scores from one response
+        num_samples: Maximum number of samples
+        settings: Application settings
     
     Returns:
-        {
-            "score": float (0.0-1.0, averaged across samples),
-            "verdict": str (explanation, empty if include_reasoning=False),
-            "samples": List[float] (individual scores),
-            "error": str (present only if evaluation failed)
-        }
+        Responses in sample order (None for failed calls)
     """
+    se_threshold = settings.judge_se_threshold
+    if se_threshold > 0:
+        wave = settings.judge_min_samples
+    else:
+        wave = num_samples
+    
+    results = []
+    while len(results) < num_samples:
+        wave = min(wave, num_samples - len(results))
+        results.extend(await asyncio.gather(*[
+            make_call(sample_idx)
+            for sample_idx in range(len(results), len(results) + wave)
+        ]))
+        wave = SAMPLE_WAVE_SIZE
+        
+        # Failures and early stopping are only decided once enough samples are in
+        if any(result is None for result in results):
+            break
+        if len(results) < max(settings.judge_min_samples, 2) or len(results) >= num_samples:
+            continue
+        try:
+            per_row = zip(*[row_scores(result) for result in results])
+            if all(_standard_error(list(scores)) < se_threshold for scores in per_row):
+                break
+        except (KeyError, TypeError, ValueError):
+            # Leave invalid scores for _aggregate_samples to report
+            break
+    
+    return results
+
+
+async def _sample_judge(
+    prompt: str,
+    model: str,
+    temperature: float,
+    num_samples: int,
+    include_reasoning: bool,
+    settings
+) -> Dict[str, Any]:
+    """
+    Run up to num_samples judge calls and average their scores.
     
-    # Load defaults from settings
-    settings = get_settings()
-    model = model or settings.judge_model
-    num_samples = num_samples if num_samples is not None else settings.judge_num_samples
-    temperature = temperature if temperature is not None else settings.judge_temperature
-    include_reasoning = include_reasoning if include_reasoning is not None else settings.include_metric_reasons
-    
-    # Load prompt from library or fallback to default
-    if prompt_template is None:
-        prompt_manager = get_prompt_manager()
-        prompt_title = settings.eval_prompt_contextual_precision
-        prompt_template = prompt_manager.get_prompt("eval", prompt_title, metric="contextual_precision")
-        if not prompt_template:
-            logger.warning(f"Eval prompt '{prompt_title}' not found, using default")
-            prompt_template = CONTEXTUAL_PRECISION_PROMPT
-    
-    # Format contexts
-    contexts_formatted = "\n\n".join([
-        f"Context {i+1}:\n{ctx}" 
-        for i, ctx in enumerate(contexts)
-    ])
-    
-    # Format prompt
-    prompt = prompt_template.format(
-        question=question,
-        expected_answer=expected_answer,
-        contexts=contexts_formatted
+    Returns:
+        Result dict in the format documented on _judge
+    """
+    limiter = _get_limiter(settings)
+    cache_dir = _judge_cache_dir(settings, temperature)
+    
+    results = await _gather_samples(
+        lambda sample_idx: _call_judge_api_async(
+            prompt, model, temperature, limiter, sample_idx, cache_dir, score_only=not include_reasoning
+        ),
+        lambda result: [_clamp_score(result["score"])],
+        num_samples,
+        settings
     )
     
+    return _aggregate_samples(results, include_reasoning)
+
+
+def _aggregate_samples(
+    results: List[Optional[Dict[str, Any]]],
+    include_reasoning: bool
+) -> Dict[str, Any]:
+    """
+    Average the scores of per-sample judge responses.
+    
+    Returns:
+        Result dict in the format documented on _judge
+    """
     samples = []
     verdict = ""
     
-    # Run multiple judge samples
-    for sample_num in range(num_samples):
-        result = _call_judge_api(prompt, model, temperature)
-        
+    for sample_num, result in enumerate(results):
         if result is None:
             # Judge failed - return error result
-            error_msg = f"Judge failed to return valid JSON after retries (sample {sample_num + 1})"
+            error_msg = f"Judge failed to return a valid judgement (sample {sample_num + 1})"
             logger.error(error_msg)
             return {
                 "score": 0.0,
@@ -145,8 +449,7 @@ def judge_contextual_precision(
         
         # Extract score and verdict
         try:
-            score = float(result["score"])
-            score = max(0.0, min(1.0, score))  # Clamp to [0, 1]
+            score = _clamp_score(result["score"])
             samples.append(score)
             
             if include_reasoning:
@@ -172,136 +475,111 @@ def judge_contextual_precision(
     }
 
 
-def judge_correctness(
-    question: str,
-    contexts: List[str],
-    expected_answer: str,
-    answer: str,
-    model: Optional[str] = None,
-    num_samples: Optional[int] = None,
-    temperature: Optional[float] = None,
-    include_reasoning: Optional[bool] = None,
-    prompt_template: Optional[str] = None
-) -> Dict[str, Any]:
-    """Evaluate correctness of generated answer using OpenAI LLM-as-judge.
-    
-    Args:
-        question: The question being answered
-        contexts: List of retrieved context strings (unused for this metric, for consistency)
-        expected_answer: The expected/golden answer
-        answer: Generated answer to evaluate
-        model: OpenAI model to use (default: from settings.judge_model)
-        num_samples: Number of samples to average (default: from settings.judge_num_samples)
-        temperature: Sampling temperature (default: from settings.judge_temperature)
-        include_reasoning: Include verdict reasoning (default: from settings.include_metric_reasons)
-        prompt_template: Custom prompt template (default: from prompt library)
+def clear_prompt_cache(category: str = "eval") -> None:
+    """Forget memoized eval prompt lookups (registered as a prompt-manager listener)."""
+    if category == "eval":
+        _get_eval_prompt.cache_clear()
+
+
+@lru_cache(maxsize=64)
+def _get_eval_prompt(title: str, metric: str, mtime_ns: int) -> Optional[str]:
+    """Look up an eval prompt from the library, memoized across judge calls.
     
-    Returns:
-        Same structure as judge_contextual_precision
+    mtime_ns is the eval prompts file's modification time, so edits made by
+    other processes select a new entry.
     """
-    # Load defaults from settings
-    settings = get_settings()
-    model = model or settings.judge_model
-    num_samples = num_samples if num_samples is not None else settings.judge_num_samples
-    temperature = temperature if temperature is not None else settings.judge_temperature
-    include_reasoning = include_reasoning if include_reasoning is not None else settings.include_metric_reasons
-    
-    # Load prompt from library or fallback to default
-    if prompt_template is None:
-        prompt_manager = get_prompt_manager()
-        prompt_title = settings.eval_prompt_correctness
-        prompt_template = prompt_manager.get_prompt("eval", prompt_title, metric="correctness")
-        if not prompt_template:
-            logger.warning(f"Eval prompt '{prompt_title}' not found, using default")
-            prompt_template = CORRECTNESS_PROMPT
-    
-    # Format contexts for prompt template
-    contexts_formatted = "\n\n".join([
-        f"Context {i+1}:\n{ctx}" 
+    prompt_manager = get_prompt_manager()
+    prompt_manager.add_change_listener(clear_prompt_cache)
+    return prompt_manager.get_prompt("eval", title, metric=metric)
+
+
+@lru_cache(maxsize=1024)
+def format_contexts(contexts: tuple) -> str:
+    """Render retrieved contexts for judge prompts, memoized across metrics."""
+    return "\n\n".join([
+        f"Context {i+1}:\n{ctx}"
         for i, ctx in enumerate(contexts)
     ])
-    
-    # Format prompt
-    prompt = prompt_template.format(
-        question=question,
-        expected_answer=expected_answer,
-        answer=answer,
-        contexts=contexts_formatted
-    )
-    
-    samples = []
-    verdict = ""
-    
-    # Run multiple judge samples
-    for sample_num in range(num_samples):
-        result = _call_judge_api(prompt, model, temperature)
-        
-        if result is None:
-            error_msg = f"Judge failed to return valid JSON after retries (sample {sample_num + 1})"
-            logger.error(error_msg)
-            return {
-                "score": 0.0,
-                "verdict": "",
-                "samples": [],
-                "error": error_msg
-            }
-        
-        try:
-            score = float(result["score"])
-            score = max(0.0, min(1.0, score))
-            samples.append(score)
-            
-            if include_reasoning:
-                verdict = result.get("verdict", "")
-                
-        except (ValueError, TypeError) as e:
-            error_msg = f"Invalid score format in judge response: {e}"
-            logger.error(error_msg)
-            return {
-                "score": 0.0,
-                "verdict": "",
-                "samples": [],
-                "error": error_msg
-            }
-    
-    avg_score = sum(samples) / len(samples) if samples else 0.0
-    
-    return {
-        "score": avg_score,
-        "verdict": verdict if include_reasoning else "",
-        "samples": samples
+
+
+def _load_metric_prompt(metric: str, settings) -> str:
+    """Load the selected library prompt for metric, falling back to the default."""
+    setting_name, default_prompt, _ = METRIC_SPECS[metric]
+    prompt_title = getattr(settings, setting_name)
+    prompt_template = _get_eval_prompt(prompt_title, metric, get_prompt_manager().mtime_ns("eval"))
+    if not prompt_template:
+        logger.warning(f"Eval prompt '{prompt_title}' not found, using default")
+        prompt_template = default_prompt
+    return prompt_template
+
+
+def _format_prompt(
+    metric: str,
+    prompt_template: str,
+    question: str,
+    contexts: List[str],
+    expected_answer: str,
+    answer: str = "",
+    contexts_formatted: Optional[str] = None
+) -> str:
+    """Fill the metric's prompt fields into prompt_template."""
+    if contexts_formatted is None:
+        contexts_formatted = format_contexts(tuple(contexts))
+    
+    values = {
+        "question": question,
+        "expected_answer": expected_answer,
+        "answer": answer,
+        "contexts": contexts_formatted,
     }
+    return prompt_template.format(**{field: values[field] for field in METRIC_SPECS[metric][2]})
 
 
-def judge_faithfulness(
+async def _judge(
+    metric: str,
     question: str,
     contexts: List[str],
     expected_answer: str,
-    answer: str,
+    answer: str = "",
     model: Optional[str] = None,
     num_samples: Optional[int] = None,
     temperature: Optional[float] = None,
     include_reasoning: Optional[bool] = None,
-    prompt_template: Optional[str] = None
+    prompt_template: Optional[str] = None,
+    contexts_formatted: Optional[str] = None,
+    settings: Optional[AppSettings] = None
 ) -> Dict[str, Any]:
-    """Evaluate faithfulness of generated answer to contexts using OpenAI LLM-as-judge.
+    """
+    Evaluate one metric using OpenAI LLM-as-judge.
+    
+    All parameters after answer are optional and will be loaded from .env
+    defaults if not provided. Each metric only uses the prompt fields listed
+    in METRIC_SPECS (e.g. faithfulness ignores expected_answer).
     
     Args:
+        metric: Metric name (a key of METRIC_SPECS)
         question: The question being answered
-        contexts: List of retrieved context strings
-        expected_answer: The expected/golden answer (unused for this metric, for consistency)
+        contexts: List of retrieved context strings (ordered by ranking)
+        expected_answer: The expected/golden answer
         answer: Generated answer to evaluate
         model: OpenAI model to use (default: from settings.judge_model)
         num_samples: Number of samples to average (default: from settings.judge_num_samples)
         temperature: Sampling temperature (default: from settings.judge_temperature)
         include_reasoning: Include verdict reasoning (default: from settings.include_metric_reasons)
         prompt_template: Custom prompt template (default: from prompt library)
+        contexts_formatted: Pre-rendered contexts (default: formatted from contexts)
+        settings: Application settings (default: get_settings())
     
     Returns:
-        Same structure as judge_contextual_precision
+        {
+            "score": float (0.0-1.0, averaged across samples),
+            "verdict": str (explanation, empty if include_reasoning=False),
+            "samples": List[float] (individual scores),
+            "error": str (present only if evaluation failed)
+        }
     """
     # Load defaults from settings
-    settings = get_settings()
+    settings = settings or get_settings()
     model = model or settings.judge_model
     num_samples = num_samples if num_samples is not None else settings.judge_num_samples
     temperature = temperature if temperature is not None else settings.judge_temperature
@@ -309,165 +587,209 @@ def judge_faithfulness(
     
     # Load prompt from library or fallback to default
     if prompt_template is None:
-        prompt_manager = get_prompt_manager()
-        prompt_title = settings.eval_prompt_faithfulness
-        prompt_template = prompt_manager.get_prompt("eval", prompt_title, metric="faithfulness")
-        if not prompt_template:
-            logger.warning(f"Eval prompt '{prompt_title}' not found, using default")
-            prompt_template = FAITHFULNESS_PROMPT
-    
-    # Format contexts
-    contexts_formatted = "\n\n".join([
-        f"Context {i+1}:\n{ctx}" 
-        for i, ctx in enumerate(contexts)
-    ])
+        prompt_template = _load_metric_prompt(metric, settings)
     
-    # Format prompt
-    prompt = prompt_template.format(
-        question=question,
-        contexts=contexts_formatted,
-        answer=answer
+    prompt = _format_prompt(
+        metric, prompt_template, question, contexts, expected_answer, answer, contexts_formatted
     )
     
-    samples = []
-    verdict = ""
+    return await _sample_judge(
+        prompt, model, temperature, num_samples, include_reasoning, settings
+    )
+
+
+judge_contextual_precision = partial(_judge, "contextual_precision")
+judge_correctness = partial(_judge, "correctness")
+judge_faithfulness = partial(_judge, "faithfulness")
+judge_contextual_relevance = partial(_judge, "contextual_relevance")
+
+
+def _order_batch_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Order list-wise results by their "case" number when it is a full 1..N set."""
+    try:
+        cases = [int(r["case"]) for r in results]
+    except (KeyError, TypeError, ValueError):
+        return results
+    if sorted(cases) != list(range(1, len(results) + 1)):
+        return results
+    return [r for _, r in sorted(zip(cases, results), key=lambda pair: pair[0])]
+
+
+async def _judge_chunk(
+    row_prompts: List[str],
+    model: str,
+    temperature: float,
+    num_samples: int,
+    include_reasoning: bool,
+    settings
+) -> List[Dict[str, Any]]:
+    """Score one chunk of rows with a single list-wise prompt per sample."""
+    if len(row_prompts) == 1:
+        return [await _sample_judge(
+            row_prompts[0], model, temperature, num_samples, include_reasoning, settings
+        )]
+    
+    batch_prompt = BATCH_JUDGE_PROMPT.format(
+        num_cases=len(row_prompts),
+        cases="\n\n".join(f"### Case {i}\n{prompt}" for i, prompt in enumerate(row_prompts, 1))
+    )
     
-    # Run multiple judge samples
-    for sample_num in range(num_samples):
-        result = _call_judge_api(prompt, model, temperature)
-        
-        if result is None:
-            error_msg = f"Judge failed to return valid JSON after retries (sample {sample_num + 1})"
-            logger.error(error_msg)
-            return {
-                "score": 0.0,
-                "verdict": "",
-                "samples": [],
-                "error": error_msg
-            }
-        
-        try:
-            score = float(result["score"])
-            score = max(0.0, min(1.0, score))
-            samples.append(score)
-            
-            if include_reasoning:
-                verdict = result.get("verdict", "")
-                
-        except (ValueError, TypeError) as e:
-            error_msg = f"Invalid score format in judge response: {e}"
-            logger.error(error_msg)
-            return {
-                "score": 0.0,
-                "verdict": "",
-                "samples": [],
-                "error": error_msg
-            }
+    limiter = _get_limiter(settings)
+    cache_dir = _judge_cache_dir(settings, temperature)
     
-    avg_score = sum(samples) / len(samples) if samples else 0.0
+    responses = await _gather_samples(
+        lambda sample_idx: _call_judge_api_async(
+            batch_prompt, model, temperature, limiter, sample_idx, cache_dir, num_cases=len(row_prompts)
+        ),
+        lambda response: [_clamp_score(r["score"]) for r in _order_batch_results(response["results"])],
+        num_samples,
+        settings
+    )
     
-    return {
-        "score": avg_score,
-        "verdict": verdict if include_reasoning else "",
-        "samples": samples
-    }
+    if any(response is None for response in responses):
+        logger.warning(f"Batch judging failed for {len(row_prompts)} rows, falling back to single-row judging")
+        return list(await asyncio.gather(*[
+            _sample_judge(prompt, model, temperature, num_samples, include_reasoning, settings)
+            for prompt in row_prompts
+        ]))
+    
+    per_sample = [_order_batch_results(response["results"]) for response in responses]
+    return [
+        _aggregate_samples(list(row_results), include_reasoning)
+        for row_results in zip(*per_sample)
+    ]
 
 
-def judge_contextual_relevance(
-    question: str,
-    contexts: List[str],
-    expected_answer: str,
-    answer: str = "",  # For consistency with other judges
+async def judge_batch(
+    metric: str,
+    rows: List[Dict[str, Any]],
+    batch_size: int = 8,
     model: Optional[str] = None,
     num_samples: Optional[int] = None,
     temperature: Optional[float] = None,
     include_reasoning: Optional[bool] = None,
-    prompt_template: Optional[str] = None
-) -> Dict[str, Any]:
-    """Evaluate contextual relevance using OpenAI LLM-as-judge.
+    prompt_template: Optional[str] = None,
+    settings: Optional[AppSettings] = None
+) -> List[Dict[str, Any]]:
+    """Evaluate a metric for many rows, scoring up to batch_size rows per API call.
+    
+    Rows are split into chunks whose single-row prompts are combined into one
+    list-wise prompt (BATCH_JUDGE_PROMPT). A chunk whose response does not hold
+    one scored result per row is re-judged row by row.
     
     Args:
-        question: The question being answered
-        contexts: List of retrieved context strings
-        expected_answer: The expected/golden answer
-        answer: Generated answer (unused for this metric, for consistency)
+        metric: Metric name (a key of METRIC_SPECS)
+        rows: Dicts with question, contexts, expected_answer and answer
+        batch_size: Maximum rows scored per API call
         model: OpenAI model to use (default: from settings.judge_model)
         num_samples: Number of samples to average (default: from settings.judge_num_samples)
         temperature: Sampling temperature (default: from settings.judge_temperature)
         include_reasoning: Include verdict reasoning (default: from settings.include_metric_reasons)
-        prompt_template: Custom prompt template (default: from prompt library)
+        prompt_template: Custom single-row prompt template (default: from prompt library)
+        settings: Application settings (default: get_settings())
     
     Returns:
-        Same structure as judge_contextual_precision
+        One result per row, in row order, each with the same structure as
+        _judge
     """
     # Load defaults from settings
-    settings = get_settings()
+    settings = settings or get_settings()
     model = model or settings.judge_model
     num_samples = num_samples if num_samples is not None else settings.judge_num_samples
     temperature = temperature if temperature is not None else settings.judge_temperature
     include_reasoning = include_reasoning if include_reasoning is not None else settings.include_metric_reasons
     
-    # Load prompt from library or fallback to default
     if prompt_template is None:
-        prompt_manager = get_prompt_manager()
-        prompt_title = settings.eval_prompt_contextual_relevance
-        prompt_template = prompt_manager.get_prompt("eval", prompt_title, metric="contextual_relevance")
-        if not prompt_template:
-            logger.warning(f"Eval prompt '{prompt_title}' not found, using default")
-            prompt_template = CONTEXTUAL_RELEVANCE_PROMPT
-    
-    # Format contexts
-    contexts_formatted = "\n\n".join([
-        f"Context {i+1}:\n{ctx}" 
-        for i, ctx in enumerate(contexts)
+        prompt_template = _load_metric_prompt(metric, settings)
+    
+    row_prompts = [_format_prompt(metric, prompt_template, **row) for row in rows]
+    
+    chunk_results = await asyncio.gather(*[
+        _judge_chunk(
+            row_prompts[start:start + batch_size],
+            model, temperature, num_samples, include_reasoning, settings
+        )
+        for start in range(0, len(row_prompts), batch_size)
     ])
     
-    # Format prompt
-    prompt = prompt_template.format(
-        question=question,
-        expected_answer=expected_answer,
-        contexts=contexts_formatted
-    )
+    return [result for chunk in chunk_results for result in chunk]
+
+
+def judge_offline(
+    metrics: List[str],
+    rows: List[Dict[str, Any]],
+    settings: AppSettings
+) -> List[Dict[str, Dict[str, Any]]]:
+    """
+    Judge every (row, metric, sample) prompt in one OpenAI Batch API job.
     
-    samples = []
-    verdict = ""
+    Batch jobs cost about half as much as interactive calls but can take up
+    to their completion window, so this blocks until the job has finished.
+    All judge_num_samples samples are requested (no early stopping) and
+    responses always carry a verdict. With judge caching enabled, cached
+    samples are reused instead of resubmitted and new ones are stored.
     
-    # Run multiple judge samples
-    for sample_num in range(num_samples):
-        result = _call_judge_api(prompt, model, temperature)
-        
-        if result is None:
-            error_msg = f"Judge failed to return valid JSON after retries (sample {sample_num + 1})"
-            logger.error(error_msg)
-            return {
-                "score": 0.0,
-                "verdict": "",
-                "samples": [],
-                "error": error_msg
-            }
-        
-        try:
-            score = float(result["score"])
-            score = max(0.0, min(1.0, score))
-            samples.append(score)
-            
-            if include_reasoning:
-                verdict = result.get("verdict", "")
-                
-        except (ValueError, TypeError) as e:
-            error_msg = f"Invalid score format in judge response: {e}"
-            logger.error(error_msg)
-            return {
-                "score": 0.0,
-                "verdict": "",
-                "samples": [],
-                "error": error_msg
-            }
+    Args:
+        metrics: Metric names (keys of METRIC_SPECS)
+        rows: Dicts with question, expected_answer, answer and contexts
+        settings: Application settings (judge model, sampling, prompts)
     
-    avg_score = sum(samples) / len(samples) if samples else 0.0
+    Returns:
+        Per-row {metric: result} dicts, in row order, each result with the
+        same structure as _judge
+    """
+    model = settings.judge_model
+    temperature = settings.judge_temperature
+    num_samples = settings.judge_num_samples
+    cache_dir = _judge_cache_dir(settings, temperature)
+    
+    responses: Dict[str, Optional[Dict[str, Any]]] = {}
+    requests: Dict[str, Dict[str, Any]] = {}
+    # custom_id -> (prompt, sample_idx), to store new responses in the cache
+    pending: Dict[str, Any] = {}
+    
+    for metric in metrics:
+        prompt_template = _load_metric_prompt(metric, settings)
+        for row_idx, row in enumerate(rows):
+            prompt = _format_prompt(metric, prompt_template, **row)
+            for sample_idx in range(num_samples):
+                custom_id = f"{row_idx}:{metric}:{sample_idx}"
+                if cache_dir is not None:
+                    cached = get_cached_judgement(
+                        cache_dir, judge_cache_key(prompt, model, temperature, sample_idx)
+                    )
+                    if cached is not None:
+                        responses[custom_id] = cached
+                        continue
+                
+                body = _judge_request_body(prompt, model, temperature)
+                body["prompt_cache_key"] = _prompt_cache_key(prompt)
+                requests[custom_id] = body
+                pending[custom_id] = (prompt, sample_idx)
+    
+    if requests:
+        for custom_id, content in run_chat_batch(requests).items():
+            result = None
+            if content is not None:
+                try:
+                    result = orjson.loads(content)
+                except orjson.JSONDecodeError as e:
+                    logger.error(f"JSON decode error in batch response {custom_id}: {e}")
+            responses[custom_id] = result
+            
+            if result is not None and cache_dir is not None:
+                prompt, sample_idx = pending[custom_id]
+                put_cached_judgement(
+                    cache_dir, judge_cache_key(prompt, model, temperature, sample_idx), result
+                )
     
-    return {
-        "score": avg_score,
-        "verdict": verdict if include_reasoning else "",
-        "samples": samples
-    }
+    return [
+        {
+            metric: _aggregate_samples(
+                [responses[f"{row_idx}:{metric}:{sample_idx}"] for sample_idx in range(num_samples)],
+                settings.include_metric_reasons
+            )
+            for metric in metrics
+        }
+        for row_idx in range(len(rows))
+    ]
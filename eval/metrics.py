@@ -1,18 +1,27 @@
 """Custom LLM-as-judge metrics registry and computation."""
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Callable
+import threading
+from typing import Any, Callable, Dict, List, Tuple
 
 from rag_app.config import Settings as AppSettings
 from .judges import (
+    METRIC_SPECS,
+    format_contexts,
+    judge_batch,
     judge_contextual_precision,
     judge_contextual_relevance,
     judge_correctness,
-    judge_faithfulness
+    judge_faithfulness,
+    judge_offline
 )
 
 logger = logging.getLogger(__name__)
 
+# Per-thread event loop reused by the *_sync wrappers
+_thread_state = threading.local()
+
 DEFAULT_METRICS = [
     "contextual_precision",
     "contextual_relevance",
@@ -29,60 +38,237 @@ METRIC_REGISTRY: Dict[str, Callable] = {
 }
 
 
-def compute_metrics(
+def _normalize_result(name: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a judge result into the score/reason/samples report format."""
+    # Check for judge errors
+    if "error" in result:
+        logger.error(f"Judge error for {name}: {result['error']}")
+        return {
+            "score": 0.0,
+            "reason": f"Judge Error: {result['error']}",
+            "samples": []
+        }
+    
+    return {
+        "score": result["score"],
+        "reason": result["verdict"],
+        "samples": result.get("samples", [])
+    }
+
+
+def _error_result(name: str, error: Exception) -> Dict[str, Any]:
+    logger.error(f"Error computing {name}: {error}")
+    return {
+        "score": 0.0,
+        "reason": f"Error: {str(error)}",
+        "samples": []
+    }
+
+
+async def _compute_metric(
+    name: str,
     question: str,
     expected_answer: str,
     answer: str,
     contexts: List[str],
+    contexts_formatted: str,
     settings: AppSettings,
-    selected_metrics: List[str] = None,
-) -> Dict[str, Dict[str, Any]]:
-    """Compute selected evaluation metrics using LLM-as-judge."""
-    selected_metrics = selected_metrics or DEFAULT_METRICS
-    results = {}
-    
-    for name in selected_metrics:
+) -> Dict[str, Any]:
+    """Run one registered judge and normalize its result."""
+    try:
+        judge_func = METRIC_REGISTRY[name]
+        
+        # Built-in judges take the caller's settings; custom registry entries
+        # load their own. Pass answer to all judges for consistency (even if
+        # not used by all)
+        extra = {"settings": settings} if name in METRIC_SPECS else {}
+        result = await judge_func(
+            question=question,
+            contexts=contexts,
+            expected_answer=expected_answer,
+            answer=answer,
+            contexts_formatted=contexts_formatted,
+            **extra
+        )
+        return _normalize_result(name, result)
+        
+    except Exception as e:
+        return _error_result(name, e)
+
+
+async def _compute_metric_batch(
+    name: str,
+    rows: List[Dict[str, Any]],
+    batch_size: int,
+    settings: AppSettings,
+) -> List[Dict[str, Any]]:
+    """Run one metric over all rows, list-wise when the metric supports it."""
+    try:
+        if name in METRIC_SPECS:
+            results = await judge_batch(name, rows, batch_size=batch_size, settings=settings)
+        else:
+            # Custom registry entries without a known prompt are judged per row
+            results = await asyncio.gather(*[METRIC_REGISTRY[name](**row) for row in rows])
+        return [_normalize_result(name, result) for result in results]
+        
+    except Exception as e:
+        error_result = _error_result(name, e)
+        return [dict(error_result) for _ in rows]
+
+
+def _valid_metric_names(selected_metrics: List[str] = None) -> List[str]:
+    names = []
+    for name in selected_metrics or DEFAULT_METRICS:
         if name not in METRIC_REGISTRY:
             logger.warning(f"Unknown metric '{name}' - available: {list(METRIC_REGISTRY.keys())}")
             continue
-        
+        names.append(name)
+    return names
+
+
+async def compute_metrics(
+    question: str,
+    expected_answer: str,
+    answer: str,
+    contexts: List[str],
+    settings: AppSettings,
+    selected_metrics: List[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Compute selected evaluation metrics using LLM-as-judge.
+    
+    All metrics (and their judge samples) are requested concurrently.
+    """
+    names = _valid_metric_names(selected_metrics)
+    
+    # Render contexts once and share them across all metric prompts
+    contexts_formatted = format_contexts(tuple(contexts))
+    
+    results = await asyncio.gather(*[
+        _compute_metric(name, question, expected_answer, answer, contexts, contexts_formatted, settings)
+        for name in names
+    ])
+    
+    return dict(zip(names, results))
+
+
+def _run_sync(coro):
+    """Run coro on this thread's long-lived event loop.
+    
+    Unlike asyncio.run, the loop is kept between calls so the judge client
+    bound to it (and its keep-alive connections) is reused across questions.
+    """
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _thread_state.loop = loop
+    return loop.run_until_complete(coro)
+
+
+def compute_metrics_sync(
+    question: str,
+    expected_answer: str,
+    answer: str,
+    contexts: List[str],
+    settings: AppSettings,
+    selected_metrics: List[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Blocking wrapper around compute_metrics for callers without an event loop."""
+    return _run_sync(compute_metrics(
+        question=question,
+        expected_answer=expected_answer,
+        answer=answer,
+        contexts=contexts,
+        settings=settings,
+        selected_metrics=selected_metrics,
+    ))
+
+
+async def compute_metrics_batch(
+    rows: List[Dict[str, Any]],
+    settings: AppSettings,
+    selected_metrics: List[str] = None,
+    batch_size: int = None,
+) -> List[Dict[str, Dict[str, Any]]]:
+    """Compute selected metrics for many rows, scoring several rows per judge call.
+    
+    Args:
+        rows: Dicts with question, expected_answer, answer and contexts
+        settings: Application settings
+        selected_metrics: Metrics to compute (default: DEFAULT_METRICS)
+        batch_size: Rows per judge call (default: settings.judge_batch_size)
+    
+    Returns:
+        Per-row metric results, in row order, shaped like compute_metrics output
+    """
+    names = _valid_metric_names(selected_metrics)
+    batch_size = batch_size or settings.judge_batch_size
+    
+    per_metric = await asyncio.gather(*[
+        _compute_metric_batch(name, rows, batch_size, settings)
+        for name in names
+    ])
+    
+    return [
+        {name: per_metric[m][r] for m, name in enumerate(names)}
+        for r in range(len(rows))
+    ]
+
+
+def compute_metrics_batch_sync(
+    rows: List[Dict[str, Any]],
+    settings: AppSettings,
+    selected_metrics: List[str] = None,
+    batch_size: int = None,
+) -> List[Dict[str, Dict[str, Any]]]:
+    """Blocking wrapper around compute_metrics_batch."""
+    return _run_sync(compute_metrics_batch(rows, settings, selected_metrics, batch_size))
+
+
+def compute_metrics_offline(
+    rows: List[Dict[str, Any]],
+    settings: AppSettings,
+    selected_metrics: List[str] = None,
+) -> List[Dict[str, Dict[str, Any]]]:
+    """Compute selected metrics for many rows through one OpenAI Batch API job.
+    
+    Blocks until the batch job finishes. Registry metrics without a known
+    prompt cannot be submitted offline and are judged interactively instead.
+    
+    Args:
+        rows: Dicts with question, expected_answer, answer and contexts
+        settings: Application settings
+        selected_metrics: Metrics to compute (default: DEFAULT_METRICS)
+    
+    Returns:
+        Per-row metric results, in row order, shaped like compute_metrics output
+    """
+    names = _valid_metric_names(selected_metrics)
+    offline_names = [name for name in names if name in METRIC_SPECS]
+    interactive_names = [name for name in names if name not in METRIC_SPECS]
+    
+    per_row = [{} for _ in rows]
+    if offline_names:
         try:
-            judge_func = METRIC_REGISTRY[name]
-            
-            # Call judge function - all parameters loaded from settings inside judge
-            # Pass answer to all judges for consistency (even if not used by all)
-            result = judge_func(
-                question=question,
-                contexts=contexts,
-                expected_answer=expected_answer,
-                answer=answer
-            )
-            
-            # Check for judge errors
-            if "error" in result:
-                logger.error(f"Judge error for {name}: {result['error']}")
-                results[name] = {
-                    "score": 0.0,
-                    "reason": f"Judge Error: {result['error']}",
-                    "samples": []
-                }
-                continue
-            
-            results[name] = {
-                "score": result["score"],
-                "reason": result["verdict"],
-                "samples": result.get("samples", [])
-            }
-            
+            for row_results, raw_results in zip(per_row, judge_offline(offline_names, rows, settings)):
+                for name, result in raw_results.items():
+                    row_results[name] = _normalize_result(name, result)
         except Exception as e:
-            logger.error(f"Error computing {name}: {e}")
-            results[name] = {
-                "score": 0.0,
-                "reason": f"Error: {str(e)}",
-                "samples": []
-            }
+            for name in offline_names:
+                error_result = _error_result(name, e)
+                for row_results in per_row:
+                    row_results[name] = dict(error_result)
     
-    return results
+    if interactive_names:
+        per_metric = _run_sync(asyncio.gather(*[
+            _compute_metric_batch(name, rows, 1, settings)
+            for name in interactive_names
+        ]))
+        for name, results in zip(interactive_names, per_metric):
+            for row_results, result in zip(per_row, results):
+                row_results[name] = result
+    
+    # Keep the selected metric order, as compute_metrics does
+    return [{name: row_results[name] for name in names} for row_results in per_row]
 
 
 def compute_overall_score(metric_results: Dict[str, Dict[str, Any]], weights: Dict[str, float]) -> float:
@@ -92,6 +278,33 @@ def compute_overall_score(metric_results: Dict[str, Dict[str, Any]], weights: Di
         scores = [r["score"] for r in metric_results.values()]
         return sum(scores) / len(scores) if scores else 0.0
     
-    weighted = [metric_results[m]["score"] * w for m, w in weights.items() if m in metric_results]
-    total_weight = sum(w for m, w in weights.items() if m in metric_results)
-    return sum(weighted) / total_weight if total_weight > 0 else 0.0
+    return _weighted_score(metric_results, list(weights.items()))
+
+
+def _weighted_score(metric_results: Dict[str, Dict[str, Any]], weight_items: List[Tuple[str, float]]) -> float:
+    """Weighted mean over the weighted metrics present, in a single pass."""
+    weighted_sum = 0.0
+    total_weight = 0.0
+    for metric, weight in weight_items:
+        result = metric_results.get(metric)
+        if result is not None:
+            weighted_sum += result["score"] * weight
+            total_weight += weight
+    return weighted_sum / total_weight if total_weight > 0 else 0.0
+
+
+def compute_overall_scores_batch(
+    all_results: List[Dict[str, Dict[str, Any]]],
+    weights: Dict[str, float]
+) -> List[float]:
+    """Compute the overall score for each row's metric results.
+    
+    Equivalent to calling compute_overall_score per row, but unpacks the
+    weights (dropping zero weights) once for the whole batch.
+    """
+    if not weights:
+        return [compute_overall_score(metric_results, weights) for metric_results in all_results]
+    
+    # Zero weights add nothing to either the weighted sum or the total weight
+    weight_items = [(metric, weight) for metric, weight in weights.items() if weight]
+    return [_weighted_score(metric_results, weight_items) for metric_results in all_results]
@@ -106,3 +106,17 @@ Respond with a JSON object containing:
 
 Your response must be valid JSON only, no additional text.
 """
+
+# List-wise wrapper: each case is a fully formatted single-row prompt from above
+# (or the prompt library), so custom per-metric prompts work in batch mode too.
+BATCH_JUDGE_PROMPT = """You will evaluate {num_cases} independent cases. Each case below contains its own complete evaluation instructions. Judge every case on its own merits, without comparing it to the other cases.
+
+{cases}
+
+Respond with a JSON object containing one result per case:
+{{"results": [{{"case": <case number>, "score": <float between 0.0 and 1.0>, "verdict": "<brief explanation>"}}, ...]}}
+
+The "results" array must contain exactly {num_cases} entries, in the same order as the cases above.
+
+Your response must be valid JSON only, no additional text.
+"""
@@ -0,0 +1,82 @@
+"""Client-side concurrency and rate limiting for judge API calls."""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Tuple
+
+WINDOW_SECONDS = 60.0
+# Poll interval while waiting for an in-flight slot to free up
+SLOT_POLL_SECONDS = 0.05
+
+
+class AsyncLimiter:
+    """Caps in-flight requests plus requests and tokens per sliding minute.
+    
+    State is guarded by a threading.Lock rather than asyncio primitives so a
+    single limiter can be shared by every event loop in the process (each
+    evaluation thread drives its own loop), keeping the combined request
+    rate under the account's limits.
+    
+    Args:
+        max_concurrent: Maximum requests in flight at once
+        requests_per_minute: Request cap per 60s window (0 disables)
+        tokens_per_minute: Estimated token cap per 60s window (0 disables)
+    """
+    
+    def __init__(self, max_concurrent: int, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self.max_concurrent = max_concurrent
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._requests: Deque[float] = deque()
+        self._tokens: Deque[Tuple[float, int]] = deque()
+        self._token_total = 0
+    
+    def _prune(self, now: float) -> None:
+        cutoff = now - WINDOW_SECONDS
+        while self._requests and self._requests[0] <= cutoff:
+            self._requests.popleft()
+        while self._tokens and self._tokens[0][0] <= cutoff:
+            self._token_total -= self._tokens.popleft()[1]
+    
+    def _try_acquire(self, estimated_tokens: int) -> float:
+        """Take a slot if limits allow; otherwise return seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            
+            if self._in_flight >= self.max_concurrent:
+                return SLOT_POLL_SECONDS
+            if self.requests_per_minute and len(self._requests) >= self.requests_per_minute:
+                return self._requests[0] + WINDOW_SECONDS - now
+            # An oversized request is let through once the window is empty
+            if (
+                self.tokens_per_minute
+                and self._tokens
+                and self._token_total + estimated_tokens > self.tokens_per_minute
+            ):
+                return self._tokens[0][0] + WINDOW_SECONDS - now
+            
+            self._in_flight += 1
+            self._requests.append(now)
+            self._tokens.append((now, estimated_tokens))
+            self._token_total += estimated_tokens
+            return 0.0
+    
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+    
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0) -> AsyncIterator[None]:
+        """Wait until a request of estimated_tokens fits, then hold a slot."""
+        while (delay := self._try_acquire(estimated_tokens)) > 0:
+            await asyncio.sleep(delay)
+        try:
+            yield
+        finally:
+            self._release()
@@ -1,10 +1,11 @@
 """Reporting utilities for evaluation results."""
 
 import heapq
-import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Tuple
+
+import orjson
 
 from rag_app.config import Settings as AppSettings
 
@@ -14,67 +15,144 @@ TOP_N_WORST = 5
 METRIC_N_WORST = 3
 
 
+def _worst_overall_item(r: Dict[str, Any], score: float) -> Dict[str, Any]:
+    return {
+        "record_id": r["record_id"],
+        "question": r["question"],
+        "overall_score": score,
+        "answer": r["answer"][:200],
+    }
+
+
+def _worst_metric_item(r: Dict[str, Any], score: float) -> Dict[str, Any]:
+    return {
+        "record_id": r["record_id"],
+        "question": r["question"],
+        "score": score,
+        "answer": r["answer"][:200],
+    }
+
+
+def _keep_worst(
+    heap: List[Tuple[float, int, Dict[str, Any]]],
+    size: int,
+    score: float,
+    idx: int,
+    make_item: Callable[[Dict[str, Any], float], Dict[str, Any]],
+    r: Dict[str, Any]
+) -> None:
+    """Track the size lowest-scoring records in a bounded heap.
+    
+    Entries are keyed on (-score, -idx) so the heap root is the best record
+    kept; on ties the earlier record wins, matching heapq.nsmallest. Records
+    arrive in idx order, so a full heap only admits a strictly lower score
+    and the check is a single float comparison. The summary item is only
+    built, via make_item(r, score), for records that enter the heap.
+    """
+    if len(heap) < size:
+        heapq.heappush(heap, (-score, -idx, make_item(r, score)))
+    elif -score > heap[0][0]:
+        heapq.heapreplace(heap, (-score, -idx, make_item(r, score)))
+
+
+def _sorted_worst(heap: List[Tuple[float, int, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Heap entries as summary items, lowest score first."""
+    return [item for _, _, item in sorted(heap, reverse=True)]
+
+
 def generate_summary(run_folder: Path, settings: AppSettings) -> Tuple[Dict[str, Any], str]:
-    """Generate summary statistics and markdown report."""
-    results = []
-    with open(run_folder / "report.jsonl", "r", encoding="utf-8") as f:
+    """Generate summary statistics and markdown report.
+    
+    report.jsonl is aggregated in a single streaming pass that updates every
+    accumulator per record; only the worst records' summary items are kept
+    in memory.
+    """
+    total_questions = 0
+    metric_names: Tuple[str, ...] = ()
+    # Per-metric score sums, by position in metric_names
+    metric_sums: List[float] = []
+    overall_sum = 0.0
+    retrieval_time_sum = 0.0
+    generation_time_sum = 0.0
+    total_time_sum = 0.0
+    timed_count = 0
+    token_count = 0
+    prompt_tokens_sum = 0
+    completion_tokens_sum = 0
+    total_tokens_sum = 0
+    worst_overall_heap: List[Tuple[float, int, Dict[str, Any]]] = []
+    worst_metric_heaps: Dict[str, List[Tuple[float, int, Dict[str, Any]]]] = {}
+    # (position, metric name, its worst heap), fixed by the first record
+    metric_slots: Tuple[Tuple[int, str, List[Tuple[float, int, Dict[str, Any]]]], ...] = ()
+    # Module-level lookups bound to locals for the per-record loop
+    loads = orjson.loads
+    keep_worst = _keep_worst
+    
+    with open(run_folder / "report.jsonl", "rb") as f:
         for line in f:
-            if line.strip():
-                results.append(json.loads(line))
-    
-    if not results:
+            if not line.strip():
+                continue
+            r = loads(line)
+            idx = total_questions
+            total_questions += 1
+            
+            # Get metrics actually used from first result
+            if idx == 0:
+                metric_names = tuple(r["metrics"])
+                metric_sums = [0.0] * len(metric_names)
+                worst_metric_heaps = {m: [] for m in metric_names}
+                metric_slots = tuple(
+                    (pos, m, worst_metric_heaps[m]) for pos, m in enumerate(metric_names)
+                )
+            
+            metrics = r["metrics"]
+            for pos, metric_name, heap in metric_slots:
+                metric = metrics.get(metric_name)
+                score = 0.0 if metric is None else metric.get("score", 0.0)
+                metric_sums[pos] += score
+                keep_worst(heap, METRIC_N_WORST, score, idx, _worst_metric_item, r)
+            
+            overall_score = r["overall_score"]
+            overall_sum += overall_score
+            keep_worst(worst_overall_heap, TOP_N_WORST, overall_score, idx, _worst_overall_item, r)
+            
+            # Answers replayed from the answer cache made no calls to time
+            if not r.get("answer_cached"):
+                timed_count += 1
+                retrieval_time_sum += r.get("retrieval_time_ms", 0.0)
+                generation_time_sum += r.get("generation_time_ms", 0.0)
+                total_time_sum += r.get("total_time_ms", 0.0)
+            
+            # Token averages only cover results with token data
+            total_tokens = r.get("total_tokens")
+            if total_tokens is not None:
+                token_count += 1
+                prompt_tokens_sum += r.get("prompt_tokens", 0)
+                completion_tokens_sum += r.get("completion_tokens", 0)
+                total_tokens_sum += total_tokens
+    
+    if not total_questions:
         raise ValueError("No results found")
     
-    total_questions = len(results)
-    
-    # Get metrics actually used from first result
-    first_result_metrics = results[0]["metrics"].keys() if results else []
-    metric_names = list(first_result_metrics)
-    
-    metric_sums = {m: 0.0 for m in metric_names}
-    
-    for result in results:
-        for metric_name in metric_names:
-            score = result["metrics"].get(metric_name, {}).get("score", 0.0)
-            metric_sums[metric_name] += score
-    
-    metric_averages = {m: metric_sums[m] / total_questions for m in metric_names}
-    average_overall_score = sum(r["overall_score"] for r in results) / total_questions
+    metric_averages = {m: metric_sums[pos] / total_questions for pos, m in enumerate(metric_names)}
+    average_overall_score = overall_sum / total_questions
     
     # Calculate average timing metrics
-    average_retrieval_time = sum(r.get("retrieval_time_ms", 0.0) for r in results) / total_questions
-    average_generation_time = sum(r.get("generation_time_ms", 0.0) for r in results) / total_questions
-    average_total_time = sum(r.get("total_time_ms", 0.0) for r in results) / total_questions
-    
-    # Calculate average token usage (only from results with token data)
-    results_with_tokens = [r for r in results if r.get("total_tokens") is not None]
-    if results_with_tokens:
-        average_prompt_tokens = sum(r.get("prompt_tokens", 0) for r in results_with_tokens) / len(results_with_tokens)
-        average_completion_tokens = sum(r.get("completion_tokens", 0) for r in results_with_tokens) / len(results_with_tokens)
-        average_total_tokens = sum(r.get("total_tokens", 0) for r in results_with_tokens) / len(results_with_tokens)
+    timed_count = timed_count or 1
+    average_retrieval_time = retrieval_time_sum / timed_count
+    average_generation_time = generation_time_sum / timed_count
+    average_total_time = total_time_sum / timed_count
+    
+    if token_count:
+        average_prompt_tokens = prompt_tokens_sum / token_count
+        average_completion_tokens = completion_tokens_sum / token_count
+        average_total_tokens = total_tokens_sum / token_count
     else:
         average_prompt_tokens = None
         average_completion_tokens = None
         average_total_tokens = None
     
-    worst_overall = heapq.nsmallest(TOP_N_WORST, results, key=lambda x: x["overall_score"])
-    
-    worst_by_metric = {}
-    for metric_name in metric_names:
-        worst = heapq.nsmallest(
-            METRIC_N_WORST,
-            results,
-            key=lambda x: x["metrics"].get(metric_name, {}).get("score", 0.0)
-        )
-        worst_by_metric[metric_name] = [
-            {
-                "record_id": r["record_id"],
-                "question": r["question"],
-                "score": r["metrics"].get(metric_name, {}).get("score", 0.0),
-                "answer": r["answer"][:200],
-            }
-            for r in worst
-        ]
+    worst_by_metric = {m: _sorted_worst(worst_metric_heaps[m]) for m in metric_names}
     
     summary_dict = {
         "total_questions": total_questions,
@@ -86,31 +164,27 @@ def generate_summary(run_folder: Path, settings: AppSettings) -> Tuple[Dict[str,
         "average_prompt_tokens": average_prompt_tokens,
         "average_completion_tokens": average_completion_tokens,
         "average_total_tokens": average_total_tokens,
-        "worst_overall": [
-            {
-                "record_id": r["record_id"],
-                "question": r["question"],
-                "overall_score": r["overall_score"],
-                "answer": r["answer"][:200],
-            }
-            for r in worst_overall
-        ],
+        "worst_overall": _sorted_worst(worst_overall_heap),
         "worst_by_metric": worst_by_metric,
     }
     
     markdown_text = _generate_markdown(summary_dict, settings, run_folder)
     
-    with open(run_folder / "summary.md", "w", encoding="utf-8") as f:
-        f.write(markdown_text)
-    
-    with open(run_folder / "summary.json", "w", encoding="utf-8") as f:
-        json.dump(summary_dict, f, indent=2)
+    # Encode once and write raw bytes, skipping the text layer
+    (run_folder / "summary.md").write_bytes(markdown_text.encode("utf-8"))
+    (run_folder / "summary.json").write_bytes(orjson.dumps(summary_dict, option=orjson.OPT_INDENT_2))
     
     return summary_dict, markdown_text
 
 
 def _generate_markdown(summary: Dict[str, Any], settings: AppSettings, run_folder: Path) -> str:
     """Generate markdown formatted report."""
+    # Display name per metric, computed once rather than per line
+    display_names = {
+        metric: metric.replace('_', ' ').title()
+        for metric in summary["metric_averages"].keys() | summary["worst_by_metric"].keys()
+    }
+    
     lines = [
         "# RPerformance Metrics\n",
         f"- **Average Retrieval Time**: {summary.get('average_retrieval_time_ms', 0):.1f} ms",
@@ -135,7 +209,7 @@ def _generate_markdown(summary: Dict[str, Any], settings: AppSettings, run_folde
     ])
     
     for metric, avg in summary["metric_averages"].items():
-        lines.append(f"- **{metric.replace('_', ' ').title()}**: {avg:.3f}")
+        lines.append(f"- **{display_names[metric]}**: {avg:.3f}")
     
     lines.append("\n## Worst Performing Questions (Overall)\n")
     for i, item in enumerate(summary["worst_overall"], 1):
@@ -145,7 +219,7 @@ def _generate_markdown(summary: Dict[str, Any], settings: AppSettings, run_folde
     
     lines.append("## Worst by Metric\n")
     for metric, items in summary["worst_by_metric"].items():
-        lines.append(f"### {metric.replace('_', ' ').title()}\n")
+        lines.append(f"### {display_names[metric]}\n")
         for i, item in enumerate(items, 1):
             lines.append(f"{i}. **{item['question']}** - Score: {item['score']:.3f}\n")
     
@@ -3,30 +3,45 @@
 import json
 import logging
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from eval.dataset_loader import load_dataset
-from eval.metrics import compute_metrics, compute_overall_score
+from eval.dataset_schema import DatasetRecord
+from eval.metrics import (
+    compute_metrics_batch_sync,
+    compute_metrics_offline,
+    compute_metrics_sync,
+    compute_overall_scores_batch,
+)
 from eval.reporting import generate_summary
 from rag_app.config import Settings as AppSettings
-from rag_app.rag import answer_question
+from rag_app.rag import answer_question, embed_questions, get_config_snapshot
 from rag_app.utils import truncate_text
 
 logger = logging.getLogger(__name__)
 console = Console()
 
 MAX_CONTEXT_CHARS = 1500
+JSONL_BUFFER_SIZE = 1 << 16
+# Records written between explicit flushes of report.jsonl
+JSONL_FLUSH_EVERY = 10
 
+# (record, rag_result, contexts passed to the judges)
+Answered = Tuple[DatasetRecord, Dict[str, Any], List[str]]
 
-def create_run_folder(run_name: str = None) -> Path:
-    """Create run folder with timestamp."""
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    folder_name = f"{timestamp}_{run_name}" if run_name else timestamp
+
+def create_run_folder(run_name: str = None, folder_name: str = None) -> Path:
+    """Create run folder with timestamp, or with folder_name when given."""
+    if folder_name is None:
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        folder_name = f"{timestamp}_{run_name}" if run_name else timestamp
     run_folder = Path("storage/runs") / folder_name
     run_folder.mkdir(parents=True, exist_ok=True)
     return run_folder
@@ -41,6 +56,145 @@ def save_config_snapshot(run_folder: Path, settings: AppSettings) -> None:
         json.dump(config_snapshot, f, indent=2)
 
 
+def _embed_questions(records: List[DatasetRecord], settings: AppSettings) -> Dict[str, List[float]]:
+    """Embed every distinct question up front in batched requests.
+    
+    Returns an empty mapping on failure, in which case each question is
+    embedded on its own while answering.
+    """
+    questions = list(dict.fromkeys(record.question for record in records))
+    try:
+        return dict(zip(questions, embed_questions(questions, settings)))
+    except Exception as e:
+        logger.warning(f"Batch question embedding failed, embedding per question: {e}")
+        return {}
+
+
+def _answer_record(
+    record: DatasetRecord,
+    settings: AppSettings,
+    query_embeddings: Dict[str, List[float]],
+    config_snapshot: Dict[str, Any],
+) -> Optional[Answered]:
+    """Answer one dataset record; returns None (after logging) if it fails."""
+    try:
+        rag_result = answer_question(
+            record.question,
+            settings,
+            query_embedding=query_embeddings.get(record.question),
+            config_snapshot=config_snapshot,
+        )
+        
+        contexts_for_eval = rag_result["contexts"]
+        if settings.max_contexts_for_eval:
+            contexts_for_eval = contexts_for_eval[:settings.max_contexts_for_eval]
+        
+        return record, rag_result, contexts_for_eval
+        
+    except Exception as e:
+        logger.error(f"Error processing record {record.id}: {e}", exc_info=True)
+        console.print(f"[red]Error processing {record.id}: {e}[/red]")
+        return None
+
+
+def _judge_answered(
+    answered: List[Answered],
+    settings: AppSettings,
+    selected_metrics: Optional[List[str]],
+    run_id: str,
+    offline: bool = False,
+) -> List[Dict[str, Any]]:
+    """Judge answered records together and build their report.jsonl records.
+    
+    Returns an empty list (after logging each record) if judging fails.
+    """
+    rows = [
+        {
+            "question": record.question,
+            "expected_answer": record.expected_answer,
+            "answer": rag_result["answer"],
+            "contexts": contexts_for_eval,
+        }
+        for record, rag_result, contexts_for_eval in answered
+    ]
+    
+    try:
+        if offline:
+            metric_results_list = compute_metrics_offline(
+                rows=rows,
+                settings=settings,
+                selected_metrics=selected_metrics,
+            )
+        elif settings.judge_batch_size == 1:
+            metric_results_list = [
+                compute_metrics_sync(**row, settings=settings, selected_metrics=selected_metrics)
+                for row in rows
+            ]
+        else:
+            metric_results_list = compute_metrics_batch_sync(
+                rows=rows,
+                settings=settings,
+                selected_metrics=selected_metrics,
+                batch_size=settings.judge_batch_size,
+            )
+        
+        overall_scores = compute_overall_scores_batch(metric_results_list, settings.overall_score_weights)
+        
+    except Exception as e:
+        for record, _, _ in answered:
+            logger.error(f"Error processing record {record.id}: {e}", exc_info=True)
+            console.print(f"[red]Error processing {record.id}: {e}[/red]")
+        return []
+    
+    # Records judged together finish together and share one timestamp
+    timestamp_utc = datetime.utcnow().isoformat()
+    return [
+        {
+            "run_id": run_id,
+            "record_id": record.id,
+            "question": record.question,
+            "expected_answer": record.expected_answer,
+            "expected_sources": record.expected_sources,
+            "answer": rag_result["answer"],
+            "contexts": [truncate_text(ctx, MAX_CONTEXT_CHARS) for ctx in rag_result["contexts"]],
+            "sources": rag_result["sources"],
+            "metrics": metric_results,
+            "overall_score": overall_score,
+            "config_snapshot": rag_result["config_snapshot"],
+            "retrieval_time_ms": rag_result.get("retrieval_time_ms", 0.0),
+            "generation_time_ms": rag_result.get("generation_time_ms", 0.0),
+            "total_time_ms": rag_result.get("total_time_ms", 0.0),
+            "prompt_tokens": rag_result.get("prompt_tokens"),
+            "completion_tokens": rag_result.get("completion_tokens"),
+            "total_tokens": rag_result.get("total_tokens"),
+            "answer_cached": rag_result.get("cached", False),
+            "timestamp_utc": timestamp_utc,
+        }
+        for (record, rag_result, _), metric_results, overall_score in zip(
+            answered, metric_results_list, overall_scores
+        )
+    ]
+
+
+def _evaluate_group(
+    records: List[DatasetRecord],
+    settings: AppSettings,
+    selected_metrics: Optional[List[str]],
+    run_id: str,
+    query_embeddings: Dict[str, List[float]],
+    config_snapshot: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """Answer a group of records, then judge the group together (worker thread)."""
+    answered = [
+        result
+        for result in (_answer_record(record, settings, query_embeddings, config_snapshot) for record in records)
+        if result
+    ]
+    if not answered:
+        return []
+    return _judge_answered(answered, settings, selected_metrics, run_id)
+
+
 def run_eval(
     dataset_path: str,
     settings: AppSettings,
@@ -48,12 +202,16 @@ def run_eval(
     num_questions: int = None,
     selected_metrics: List[str] = None,
     progress_callback = None,
+    run_folder_name: str = None,
 ) -> Path:
     """Run evaluation on dataset and generate report.
     
     Args:
         progress_callback: Optional callback function to report progress.
                           Called with (current_question_num, total_questions, question_text)
+        run_folder_name: Name of the run folder under storage/runs (default:
+                         UTC start time plus run_name); the API passes its
+                         run_id so progress lookups find the folder
     """
     console.print(f"\n[bold cyan]Starting Evaluation Run[/bold cyan]")
     console.print(f"Dataset: {dataset_path}")
@@ -68,7 +226,7 @@ def run_eval(
     
     console.print(f"Loaded {len(dataset)} evaluation records\n")
     
-    run_folder = create_run_folder(run_name)
+    run_folder = create_run_folder(run_name, run_folder_name)
     console.print(f"Run folder: [green]{run_folder}[/green]\n")
     
     save_config_snapshot(run_folder, settings)
@@ -88,61 +246,68 @@ def run_eval(
     
     jsonl_file = run_folder / "report.jsonl"
     
-    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console) as progress:
-        task = progress.add_task(f"Evaluating {len(dataset)} questions...", total=len(dataset.records))
+    records = dataset.records
+    total = len(records)
+    run_id = metadata["run_id"]
+    # Every record shares one snapshot instead of re-dumping settings per question
+    config_snapshot = get_config_snapshot(settings)
+    
+    # Each run answers and judges questions on its own pool, sized by its
+    # settings, and one buffered handle is kept for the whole run
+    with ThreadPoolExecutor(max_workers=settings.eval_concurrency, thread_name_prefix="eval-worker") as executor, \
+            Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console) as progress, \
+            open(jsonl_file, "ab", buffering=JSONL_BUFFER_SIZE) as jsonl_fh:
+        task = progress.add_task(f"Evaluating {total} questions...", total=total)
         
-        for i, record in enumerate(dataset.records, 1):
-            progress.update(task, description=f"[cyan]Evaluating {i}/{len(dataset)}: {record.question[:50]}...[/cyan]", advance=1)
+        progress.update(task, description=f"[cyan]Embedding {total} questions...[/cyan]")
+        query_embeddings = _embed_questions(records, settings)
+        
+        def report_done(i: int, record: DatasetRecord) -> None:
+            progress.update(task, description=f"[cyan]Evaluated {i}/{total}: {record.question[:50]}...[/cyan]", advance=1)
             
             # Report progress to callback if provided
             if progress_callback:
-                progress_callback(i, len(dataset.records), record.question)
+                progress_callback(i, total, record.question)
+        
+        if settings.judge_mode == "batch":
+            # Answer all questions concurrently, then submit the whole run as one Batch API job
+            answered = []
+            for i, (record, result) in enumerate(
+                zip(records, executor.map(lambda record: _answer_record(record, settings, query_embeddings, config_snapshot), records)), 1
+            ):
+                report_done(i, record)
+                if result:
+                    answered.append(result)
             
-            try:
-                rag_result = answer_question(record.question, settings)
-                
-                contexts_for_eval = rag_result["contexts"]
-                if settings.max_contexts_for_eval:
-                    contexts_for_eval = contexts_for_eval[:settings.max_contexts_for_eval]
-                
-                metric_results = compute_metrics(
-                    question=record.question,
-                    expected_answer=record.expected_answer,
-                    answer=rag_result["answer"],
-                    contexts=contexts_for_eval,
-                    settings=settings,
-                    selected_metrics=selected_metrics,
-                )
-                
-                overall_score = compute_overall_score(metric_results, settings.overall_score_weights)
-                
-                jsonl_record = {
-                    "run_id": metadata["run_id"],
-                    "record_id": record.id,
-                    "question": record.question,
-                    "expected_answer": record.expected_answer,
-                    "expected_sources": record.expected_sources,
-                    "answer": rag_result["answer"],
-                    "contexts": [truncate_text(ctx, MAX_CONTEXT_CHARS) for ctx in rag_result["contexts"]],
-                    "sources": rag_result["sources"],
-                    "metrics": metric_results,
-                    "overall_score": overall_score,
-                    "config_snapshot": rag_result["config_snapshot"],
-                    "retrieval_time_ms": rag_result.get("retrieval_time_ms", 0.0),
-                    "generation_time_ms": rag_result.get("generation_time_ms", 0.0),
-                    "total_time_ms": rag_result.get("total_time_ms", 0.0),
-                    "prompt_tokens": rag_result.get("prompt_tokens"),
-                    "completion_tokens": rag_result.get("completion_tokens"),
-                    "total_tokens": rag_result.get("total_tokens"),
-                    "timestamp_utc": datetime.utcnow().isoformat(),
-                }
+            if answered:
+                progress.update(task, description=f"[cyan]Waiting for judge batch job ({len(answered)} questions)...[/cyan]")
+                for jsonl_record in _judge_answered(answered, settings, selected_metrics, run_id, offline=True):
+                    jsonl_fh.write(orjson.dumps(jsonl_record) + b"\n")
+        else:
+            # Groups of judge_batch_size questions are answered and judged on
+            # worker threads; results are collected and written in dataset order
+            batch_size = settings.judge_batch_size
+            groups = [records[start:start + batch_size] for start in range(0, total, batch_size)]
+            group_results = executor.map(
+                lambda group: _evaluate_group(group, settings, selected_metrics, run_id, query_embeddings, config_snapshot),
+                groups
+            )
+            
+            done = 0
+            unflushed = 0
+            for group, jsonl_records in zip(groups, group_results):
+                for record in group:
+                    done += 1
+                    report_done(done, record)
                 
-                with open(jsonl_file, "a", encoding="utf-8") as f:
-                    f.write(json.dumps(jsonl_record) + "\n")
+                for jsonl_record in jsonl_records:
+                    jsonl_fh.write(orjson.dumps(jsonl_record) + b"\n")
                 
-            except Exception as e:
-                logger.error(f"Error processing record {record.id}: {e}", exc_info=True)
-                console.print(f"[red]Error processing {record.id}: {e}[/red]")
+                # Keep finished records on disk if the run is interrupted
+                unflushed += len(jsonl_records)
+                if unflushed >= JSONL_FLUSH_EVERY:
+                    jsonl_fh.flush()
+                    unflushed = 0
     
     console.print("\n[bold green]Evaluation complete![/bold green]\n")
     console.print("[cyan]Generating summary report...[/cyan]\n")
@@ -0,0 +1,71 @@
+"""On-disk cache of RAG answers for repeated evaluation runs.
+
+Entries are keyed by the question, every setting that shapes the answer
+and the version of the ingested knowledge base, so changing the models,
+retrieval, system prompt or documents naturally yields new keys.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import orjson
+from llama_index.core.storage.docstore.types import DEFAULT_PERSIST_FNAME
+
+from rag_app.config import Settings as AppSettings
+from rag_app.utils import clear_json_cache, get_json_cache_entry, put_json_cache_entry
+
+
+def knowledge_base_version(settings: AppSettings) -> Optional[int]:
+    """Version of the ingested knowledge base, or None if there is none.
+    
+    Every ingestion rewrites the docstore persisted next to the vector
+    store, so its modification time changes whenever the documents do.
+    """
+    try:
+        return os.stat(Path(settings.vector_store_dir) / DEFAULT_PERSIST_FNAME).st_mtime_ns
+    except OSError:
+        return None
+
+
+def answer_cache_key(
+    question: str,
+    settings: AppSettings,
+    top_k: int,
+    system_prompt: str,
+    kb_version: int,
+    category: Optional[str] = None
+) -> str:
+    """Build the cache key for one question under the current configuration."""
+    params = {
+        "question": question,
+        "llm_model": settings.llm_model,
+        "embedding_model": settings.embedding_model,
+        "embedding_dimensions": settings.embedding_dimensions,
+        "retrieval_strategy": settings.retrieval_strategy,
+        "top_k": top_k,
+        "chunk_size": settings.chunk_size,
+        "chunk_overlap": settings.chunk_overlap,
+        "collection_name": settings.collection_name,
+        "vector_store_dir": settings.vector_store_dir,
+        "system_prompt": system_prompt,
+        "kb_version": kb_version,
+        "category": category,
+    }
+    return hashlib.sha256(orjson.dumps(params, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def get_cached_answer(cache_dir: Path, key: str) -> Optional[Dict[str, Any]]:
+    """Return the cached answer_question result for key, or None on a miss."""
+    return get_json_cache_entry(cache_dir, key)
+
+
+def put_cached_answer(cache_dir: Path, key: str, result: Dict[str, Any]) -> None:
+    """Store an answer_question result atomically."""
+    put_json_cache_entry(cache_dir, key, result)
+
+
+def clear_answer_cache(cache_dir: Path) -> None:
+    """Delete every cached answer."""
+    clear_json_cache(cache_dir)
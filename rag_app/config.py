@@ -2,7 +2,7 @@
 
 import os
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Literal
 
 from dotenv import load_dotenv
 from pydantic import Field
@@ -32,6 +32,11 @@ class Settings(BaseSettings):
         default="text-embedding-3-small",
         description="OpenAI embedding model"
     )
+    embedding_dimensions: int = Field(
+        default=0,
+        ge=0,
+        description="Shorten embeddings to this many dimensions (text-embedding-3 models; 0 = full size). Re-ingest after changing"
+    )
     llm_model: str = Field(
         default="gpt-4o-mini",
         description="OpenAI LLM model for generation"
@@ -53,6 +58,52 @@ class Settings(BaseSettings):
         le=2.0,
         description="Temperature for LLM judge"
     )
+    judge_min_samples: int = Field(
+        default=2,
+        ge=2,
+        description="Samples always taken before judge sampling may stop early"
+    )
+    judge_se_threshold: float = Field(
+        default=0.02,
+        ge=0.0,
+        description="Stop judge sampling once the score's standard error is below this (0 = always take judge_num_samples)"
+    )
+    judge_max_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description="Maximum judge API requests in flight across all evaluations"
+    )
+    judge_requests_per_minute: int = Field(
+        default=500,
+        ge=0,
+        description="Judge API requests allowed per minute (0 = unlimited)"
+    )
+    judge_tokens_per_minute: int = Field(
+        default=200000,
+        ge=0,
+        description="Estimated judge API tokens allowed per minute (0 = unlimited)"
+    )
+    judge_cache_enabled: bool = Field(
+        default=False,
+        description="Reuse judge responses cached on disk for identical prompts"
+    )
+    judge_cache_dir: str = Field(
+        default="./.judge_cache",
+        description="Directory for cached judge responses"
+    )
+    judge_cache_stochastic: bool = Field(
+        default=False,
+        description="Also cache judge responses sampled with temperature > 0"
+    )
+    judge_batch_size: int = Field(
+        default=1,
+        ge=1,
+        description="Dataset rows scored per judge call (1 = one call per row)"
+    )
+    judge_mode: Literal["interactive", "batch"] = Field(
+        default="interactive",
+        description="Judge with live API calls, or submit each eval run as one OpenAI Batch API job (about half the cost, results within 24h)"
+    )
 
     # Vector Store
     vector_store_dir: str = Field(
@@ -123,6 +174,24 @@ class Settings(BaseSettings):
         ge=1,
         description="Maximum contexts to pass to eval metrics (null = all)"
     )
+    max_concurrent_evals: int = Field(
+        default=2,
+        ge=1,
+        description="Maximum evaluation runs executed concurrently by the API"
+    )
+    eval_concurrency: int = Field(
+        default=8,
+        ge=1,
+        description="Questions (or judge batches) answered and judged in parallel during an evaluation run"
+    )
+    rag_cache_enabled: bool = Field(
+        default=False,
+        description="Reuse cached RAG answers for unchanged questions, settings and knowledge base"
+    )
+    rag_cache_dir: str = Field(
+        default="./.rag_cache",
+        description="Directory for cached RAG answers"
+    )
 
     def validate_api_key(self) -> bool:
         """Check if OpenAI API key is set."""
@@ -138,9 +207,28 @@ class Settings(BaseSettings):
         }
 
 
+# (.env mtime_ns, environment snapshot, Settings) from the last get_settings call
+_settings_cache = None
+
+
 def get_settings() -> Settings:
     """Get application settings.
     
-    Creates a new Settings instance which loads from .env and uses Field defaults.
+    Loads from .env and the environment and uses Field defaults. The
+    instance is reused until .env or the environment changes, so callers
+    should treat it as read-only.
     """
-    return Settings()
\ No newline at end of file
+    global _settings_cache
+    try:
+        env_mtime_ns = os.stat(_env_file).st_mtime_ns
+    except OSError:
+        env_mtime_ns = None
+    environ = dict(os.environ)
+    
+    cached = _settings_cache
+    if cached is not None and cached[0] == env_mtime_ns and cached[1] == environ:
+        return cached[2]
+    
+    settings = Settings()
+    _settings_cache = (env_mtime_ns, environ, settings)
+    return settings
\ No newline at end of file
@@ -2,21 +2,29 @@
 
 import logging
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 import chromadb
+from chromadb.api.models.Collection import Collection
 from llama_index.core import Settings, StorageContext, VectorStoreIndex, load_index_from_storage
 from llama_index.vector_stores.chroma import ChromaVectorStore
 
+from rag_app.answer_cache import knowledge_base_version
 from rag_app.config import Settings as AppSettings
 from rag_app.utils import configure_llama_index
 
 logger = logging.getLogger(__name__)
 
+# (vector_store_dir, collection_name) -> (knowledge base version, open collection)
+_collections: Dict[Tuple[str, str], Tuple[Optional[int], Collection]] = {}
 
-def get_index(settings: AppSettings) -> VectorStoreIndex:
-    """Load the vector store index from persistent storage."""
-    configure_llama_index(settings)
+
+def get_collection(settings: AppSettings) -> Collection:
+    """Open the ingested ChromaDB collection from persistent storage.
     
+    The handle is reused until the knowledge base is re-ingested, which
+    may recreate the collection (see knowledge_base_version).
+    """
     persist_dir = Path(settings.vector_store_dir)
     
     if not persist_dir.exists():
@@ -25,9 +33,23 @@ def get_index(settings: AppSettings) -> VectorStoreIndex:
             "Please run ingestion first: python -m scripts.cli ingest"
         )
     
+    key = (str(persist_dir), settings.collection_name)
+    kb_version = knowledge_base_version(settings)
+    cached = _collections.get(key)
+    if cached is not None and cached[0] == kb_version:
+        return cached[1]
+    
     chroma_client = chromadb.PersistentClient(path=str(persist_dir))
-    chroma_collection = chroma_client.get_collection(settings.collection_name)
-    vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
+    collection = chroma_client.get_collection(settings.collection_name)
+    _collections[key] = (kb_version, collection)
+    return collection
+
+
+def get_index(settings: AppSettings) -> VectorStoreIndex:
+    """Load the vector store index from persistent storage."""
+    configure_llama_index(settings)
+    
+    vector_store = ChromaVectorStore(chroma_collection=get_collection(settings))
     
     # Create index from existing vector store
     return VectorStoreIndex.from_vector_store(
@@ -1,64 +1,303 @@
 ﻿"""Document ingestion and vector store population using ChromaDB."""
 
+import gc
+import hashlib
 import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 import chromadb
+import orjson
 from llama_index.core import Document, StorageContext, VectorStoreIndex
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.schema import BaseNode
+from llama_index.core.storage.docstore.types import DEFAULT_PERSIST_FNAME
 from llama_index.vector_stores.chroma import ChromaVectorStore
 
+from rag_app.answer_cache import clear_answer_cache
 from rag_app.config import Settings as AppSettings
-from rag_app.utils import configure_llama_index, get_category_from_path, get_file_hash
+from rag_app.utils import (
+    FILE_HASH_ALGORITHM,
+    atomic_write_bytes,
+    configure_llama_index,
+    get_category_from_path,
+    hash_files,
+    new_file_hasher,
+)
 
 logger = logging.getLogger(__name__)
 
+INGEST_BATCH_SIZE = 64
+# File reads and hashing release the GIL, so threads overlap them well
+READ_THREADS = min(32, (os.cpu_count() or 1) * 4)
+# Sidecar in the vector store dir: {"algorithm": ..., "files": {source path: [mtime_ns, size, content hash]}}
+FILE_HASH_CACHE_NAME = "file_hashes.json"
+# Collection metadata key holding the manifest of the last full ingestion
+MANIFEST_METADATA_KEY = "manifest_hash"
 
-def load_documents_from_directory(knowledge_base_path: str = "knowledge_base"):
-    """Load all text documents from knowledge base directory."""
-    knowledge_base_root = Path(knowledge_base_path)
-    
+
+def _list_txt_files(knowledge_base_root: Path) -> List[Path]:
+    """List .txt files in the knowledge base, raising if there are none."""
     if not knowledge_base_root.exists():
-        raise ValueError(f"Knowledge base directory not found: {knowledge_base_path}")
+        raise ValueError(f"Knowledge base directory not found: {knowledge_base_root}")
     
-    txt_files = list(knowledge_base_root.rglob("*.txt"))
+    txt_files = sorted(knowledge_base_root.rglob("*.txt"))
     if not txt_files:
-        raise ValueError(f"No .txt files found in {knowledge_base_path}")
+        raise ValueError(f"No .txt files found in {knowledge_base_root}")
+    return txt_files
+
+
+def _load_document(file_path: Path, knowledge_base_root: Path) -> Document:
+    """Read a single knowledge base file into a Document."""
+    with open(file_path, "rb") as f:
+        raw = f.read()
     
-    documents = []
-    for file_path in txt_files:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+    # Same id as get_file_hash, without reading the file a second time
+    hasher = new_file_hasher()
+    hasher.update(raw)
+    doc_id = hasher.hexdigest()
+    # Universal newlines, matching what text-mode open() would return
+    content = raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+    category = get_category_from_path(file_path, knowledge_base_root)
+    source_path = str(file_path.relative_to(knowledge_base_root))
+    
+    return Document(
+        text=content,
+        metadata={
+            "source_path": source_path,
+            "category": category,
+            "doc_id": doc_id,
+            "filename": file_path.name,
+        },
+        id_=doc_id,
+    )
+
+
+def _load_documents(file_paths: List[Path], knowledge_base_root: Path) -> List[Document]:
+    """Read files into Documents on a thread pool, preserving order."""
+    if len(file_paths) <= 1:
+        return [_load_document(file_path, knowledge_base_root) for file_path in file_paths]
+    
+    with ThreadPoolExecutor(max_workers=min(READ_THREADS, len(file_paths))) as executor:
+        return list(executor.map(lambda file_path: _load_document(file_path, knowledge_base_root), file_paths))
+
+
+def _parse_batch(
+    file_paths: List[Path],
+    knowledge_base_root: Path,
+    chunk_size: int,
+    chunk_overlap: int,
+) -> Tuple[List[BaseNode], List[Tuple[str, str]]]:
+    """Read and chunk a batch of files.
+    
+    Runs in pool workers, so it only takes picklable arguments and builds
+    its own splitter instead of relying on LlamaIndex global settings.
+    
+    Returns:
+        Tuple of (nodes, [(doc_id, doc_hash), ...])
+    """
+    splitter = SentenceSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    documents = _load_documents(file_paths, knowledge_base_root)
+    nodes = splitter.get_nodes_from_documents(documents)
+    return nodes, [(document.get_doc_id(), document.hash) for document in documents]
+
+
+def _iter_parsed_batches(
+    txt_files: List[Path],
+    knowledge_base_root: Path,
+    batch_size: int,
+    chunk_size: int,
+    chunk_overlap: int,
+    num_workers: int,
+) -> Iterator[Tuple[int, List[BaseNode], List[Tuple[str, str]]]]:
+    """Yield (file_count, nodes, doc_hashes) per batch, in file order.
+    
+    With more than one worker, batches are parsed in a process pool while
+    the caller embeds earlier ones. At most num_workers + 1 batches are in
+    flight so memory stays bounded.
+    """
+    batches = [txt_files[i:i + batch_size] for i in range(0, len(txt_files), batch_size)]
+    
+    if num_workers <= 1:
+        for batch in batches:
+            yield (len(batch), *_parse_batch(batch, knowledge_base_root, chunk_size, chunk_overlap))
+        return
+    
+    # spawn matches the API's ingestion process and is safe with Chroma's threads
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=num_workers, mp_context=ctx) as executor:
+        pending = deque()
+        remaining = iter(batches)
+        for batch in remaining:
+            pending.append((len(batch), executor.submit(
+                _parse_batch, batch, knowledge_base_root, chunk_size, chunk_overlap
+            )))
+            if len(pending) > num_workers:
+                break
         
-        category = get_category_from_path(file_path, knowledge_base_root)
-        doc_id = get_file_hash(file_path)
+        while pending:
+            file_count, future = pending.popleft()
+            nodes, doc_hashes = future.result()
+            batch = next(remaining, None)
+            if batch is not None:
+                pending.append((len(batch), executor.submit(
+                    _parse_batch, batch, knowledge_base_root, chunk_size, chunk_overlap
+                )))
+            yield file_count, nodes, doc_hashes
+
+
+def _cached_file_hashes(
+    txt_files: List[Path],
+    knowledge_base_root: Path,
+    cache_path: Path,
+) -> Dict[str, str]:
+    """Content hash (document id) per source path, skipping unchanged files.
+    
+    Hashes are reused for files whose size and mtime match the sidecar
+    cache, so an incremental ingestion only reads files that changed.
+    """
+    try:
+        cache = orjson.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        cache = {}
+    # Hashes from another algorithm would never match the new document ids
+    cached_files = cache.get("files", {}) if cache.get("algorithm") == FILE_HASH_ALGORITHM else {}
+    
+    entries = {}
+    misses = []
+    for file_path in txt_files:
         source_path = str(file_path.relative_to(knowledge_base_root))
-        
-        documents.append(Document(
-            text=content,
-            metadata={
-                "source_path": source_path,
-                "category": category,
-                "doc_id": doc_id,
-                "filename": file_path.name,
-            },
-            id_=doc_id,
-        ))
+        stat = file_path.stat()
+        entry = cached_files.get(source_path)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            entries[source_path] = entry
+        else:
+            entries[source_path] = [stat.st_mtime_ns, stat.st_size, None]
+            misses.append(file_path)
+    
+    # Files that changed (or are new) are hashed concurrently
+    for file_path, file_hash in hash_files(misses, READ_THREADS).items():
+        entries[str(file_path.relative_to(knowledge_base_root))][2] = file_hash
+    hashes = {source_path: entry[2] for source_path, entry in entries.items()}
+    
+    if entries != cached_files:
+        # Written atomically, so a crash never leaves a partial cache
+        try:
+            atomic_write_bytes(cache_path, orjson.dumps({"algorithm": FILE_HASH_ALGORITHM, "files": entries}))
+        except OSError as e:
+            logger.warning(f"Failed to write file hash cache: {e}")
     
-    return documents
+    return hashes
 
 
-def ingest_knowledge_base(settings: AppSettings, clear_existing: bool = True) -> None:
+def _select_changed_files(
+    chroma_collection,
+    txt_files: List[Path],
+    knowledge_base_root: Path,
+    cache_path: Path,
+) -> List[Path]:
+    """Drop files whose current content is already in the collection.
+    
+    Chunks from earlier versions of the remaining files are deleted so
+    re-ingesting a changed file replaces it instead of duplicating it.
+    """
+    hashes = _cached_file_hashes(txt_files, knowledge_base_root, cache_path)
+    existing = chroma_collection.get(
+        where={"doc_id": {"$in": sorted(set(hashes.values()))}},
+        include=["metadatas"],
+    )
+    present = {(m.get("source_path"), m.get("doc_id")) for m in existing["metadatas"]}
+    
+    changed = []
+    changed_sources = []
+    for file_path in txt_files:
+        source_path = str(file_path.relative_to(knowledge_base_root))
+        if (source_path, hashes[source_path]) not in present:
+            changed.append(file_path)
+            changed_sources.append(source_path)
+    
+    if changed_sources:
+        chroma_collection.delete(where={"source_path": {"$in": changed_sources}})
+    return changed
+
+
+def _manifest_hash(txt_files: List[Path], knowledge_base_root: Path, settings: AppSettings) -> str:
+    """Fingerprint the knowledge base by file stats plus the settings that shape its chunks.
+    
+    Uses path, mtime and size only, so no file is read.
+    """
+    files = []
+    for file_path in txt_files:
+        stat = file_path.stat()
+        files.append((str(file_path.relative_to(knowledge_base_root)), stat.st_mtime_ns, stat.st_size))
+    params = {
+        "files": files,
+        "chunk_size": settings.chunk_size,
+        "chunk_overlap": settings.chunk_overlap,
+        "embedding_model": settings.embedding_model,
+        "embedding_dimensions": settings.embedding_dimensions,
+    }
+    return hashlib.sha256(orjson.dumps(params)).hexdigest()
+
+
+def _is_unchanged(chroma_client, collection_name: str, manifest: str, persist_dir: Path) -> bool:
+    """Whether the collection was fully ingested from exactly this manifest."""
+    try:
+        collection = chroma_client.get_collection(collection_name)
+    except Exception:
+        return False
+    return (
+        (collection.metadata or {}).get(MANIFEST_METADATA_KEY) == manifest
+        and collection.count() > 0
+        and (persist_dir / DEFAULT_PERSIST_FNAME).exists()
+    )
+
+
+def load_documents_from_directory(knowledge_base_path: str = "knowledge_base"):
+    """Load all text documents from knowledge base directory."""
+    knowledge_base_root = Path(knowledge_base_path)
+    txt_files = _list_txt_files(knowledge_base_root)
+    return _load_documents(txt_files, knowledge_base_root)
+
+
+def ingest_knowledge_base(
+    settings: AppSettings,
+    clear_existing: bool = True,
+    batch_size: int = INGEST_BATCH_SIZE,
+    progress_cb: Optional[Callable[[int, int], None]] = None,
+    knowledge_base_path: str = "knowledge_base",
+    num_workers: Optional[int] = None,
+) -> None:
     """Ingest documents from knowledge base into ChromaDB vector store.
     
+    Files are read, chunked, embedded and written to the collection one
+    batch at a time, so memory use is bounded by batch_size rather than
+    by the size of the knowledge base. Reading and chunking run in a
+    process pool; embedding stays in this process since it is bound by
+    the embedding API rather than by CPU.
+    
     Args:
         settings: Application settings
         clear_existing: If True, delete existing collection before ingesting (default: True)
                        This ensures fresh ingestion without stale data.
+                       If False, only new or changed files are ingested.
+        batch_size: Number of documents loaded and embedded per batch
+        progress_cb: Optional callback invoked as progress_cb(done, total)
+                     after each batch is written
+        knowledge_base_path: Directory containing the .txt documents
+        num_workers: Processes used to read and chunk files
+                     (default: one per CPU, capped at the number of batches)
     """
     configure_llama_index(settings)
     
-    documents = load_documents_from_directory()
-    logger.info(f"Loaded {len(documents)} documents from knowledge base")
+    knowledge_base_root = Path(knowledge_base_path)
+    txt_files = _list_txt_files(knowledge_base_root)
+    total = len(txt_files)
+    logger.info(f"Found {total} documents in knowledge base")
     
     persist_dir = Path(settings.vector_store_dir)
     persist_dir.mkdir(parents=True, exist_ok=True)
@@ -67,6 +306,13 @@ def ingest_knowledge_base(settings: AppSettings, clear_existing: bool = True) ->
     
     # Clear existing collection if requested (default behavior)
     if clear_existing:
+        manifest = _manifest_hash(txt_files, knowledge_base_root, settings)
+        if _is_unchanged(chroma_client, settings.collection_name, manifest, persist_dir):
+            logger.info("Knowledge base unchanged since the last full ingestion, skipping")
+            if progress_cb is not None:
+                progress_cb(total, total)
+            return
+        
         try:
             chroma_client.delete_collection(name=settings.collection_name)
             logger.info(f"Deleted existing collection: {settings.collection_name}")
@@ -75,15 +321,53 @@ def ingest_knowledge_base(settings: AppSettings, clear_existing: bool = True) ->
     
     chroma_collection = chroma_client.get_or_create_collection(settings.collection_name)
     
+    if not clear_existing and chroma_collection.count():
+        txt_files = _select_changed_files(
+            chroma_collection, txt_files, knowledge_base_root, persist_dir / FILE_HASH_CACHE_NAME
+        )
+        logger.info(f"{len(txt_files)} of {total} documents are new or changed")
+        total = len(txt_files)
+        if not txt_files:
+            return
+    
     vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
     storage_context = StorageContext.from_defaults(vector_store=vector_store)
+    index = VectorStoreIndex(nodes=[], storage_context=storage_context)
     
-    logger.info("Starting document indexing...")
-    VectorStoreIndex.from_documents(
-        documents,
-        storage_context=storage_context,
-        show_progress=True,
-    )
+    num_batches = -(-total // batch_size)
+    if num_workers is None:
+        num_workers = min(os.cpu_count() or 1, num_batches)
+    
+    logger.info(f"Starting document indexing with {num_workers} parser process(es)...")
+    done = 0
+    for file_count, nodes, doc_hashes in _iter_parsed_batches(
+        txt_files,
+        knowledge_base_root,
+        batch_size,
+        settings.chunk_size,
+        settings.chunk_overlap,
+        num_workers,
+    ):
+        index.insert_nodes(nodes)
+        for doc_id, doc_hash in doc_hashes:
+            storage_context.docstore.set_document_hash(doc_id, doc_hash)
+        
+        done += file_count
+        logger.info(f"Indexed {done}/{total} documents")
+        
+        # Drop this batch's text and embeddings before reading the next one
+        del nodes, doc_hashes
+        gc.collect()
+        
+        if progress_cb is not None:
+            progress_cb(done, total)
     
     storage_context.persist(persist_dir=str(persist_dir))
-    logger.info(f"Successfully ingested {len(documents)} documents")
\ No newline at end of file
+    logger.info(f"Successfully ingested {total} documents")
+    
+    # Recorded only after a complete rebuild: incremental runs keep chunks of removed files
+    if clear_existing:
+        chroma_collection.modify(metadata={**(chroma_collection.metadata or {}), MANIFEST_METADATA_KEY: manifest})
+    
+    # Cached answers are keyed on the previous knowledge base version and can no longer hit
+    clear_answer_cache(Path(settings.rag_cache_dir))
\ No newline at end of file
@@ -1,16 +1,28 @@
 """Prompt management system for versioned prompts."""
 
-import json
+import functools
 import logging
-from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+import orjson
+
+from rag_app.utils import atomic_write_bytes, utc_now_iso
 
 logger = logging.getLogger(__name__)
 
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
 
 
+def _dump_prompts(prompts: List[Dict]) -> bytes:
+    """Serialize prompts for a prompts file in a single buffer.
+    
+    Kept indented since the default prompt files are tracked in git; the
+    output matches json.dump(..., indent=2) for ASCII content.
+    """
+    return orjson.dumps(prompts, option=orjson.OPT_INDENT_2)
+
+
 class PromptManager:
     """Manages versioned prompts for RAG and evaluation."""
     
@@ -20,6 +32,10 @@ class PromptManager:
         self._rag_prompts_file = PROMPTS_DIR / "rag_prompts.json"
         self._eval_prompts_file = PROMPTS_DIR / "eval_prompts.json"
         
+        # category -> (file mtime_ns, prompts, position in prompts keyed by (title, metric))
+        self._cache: Dict[str, Tuple[int, List[Dict], Dict[Tuple[str, Optional[str]], int]]] = {}
+        self._change_listeners: List[Callable[[str], None]] = []
+        
         # Initialize with defaults if files don't exist
         if not self._rag_prompts_file.exists():
             self._initialize_rag_defaults()
@@ -30,18 +46,18 @@ class PromptManager:
         """Create default RAG prompts."""
         from rag_app.prompts import SYSTEM_PROMPT
         
+        created_at = utc_now_iso()
         defaults = [
             {
                 "title": "Default v1.0",
                 "content": SYSTEM_PROMPT,
                 "type": "system",
-                "created_at": datetime.utcnow().isoformat(),
+                "created_at": created_at,
                 "description": "Baseline RAG system prompt - cite sources, stay within context"
             }
         ]
         
-        with open(self._rag_prompts_file, "w", encoding="utf-8") as f:
-            json.dump(defaults, f, indent=2)
+        self._rag_prompts_file.write_bytes(_dump_prompts(defaults))
         
         logger.info(f"Initialized default RAG prompts: {self._rag_prompts_file}")
     
@@ -54,42 +70,121 @@ class PromptManager:
             CONTEXTUAL_RELEVANCE_PROMPT
         )
         
+        created_at = utc_now_iso()
         defaults = [
             {
                 "title": "Default v1.0",
                 "metric": "contextual_precision",
                 "content": CONTEXTUAL_PRECISION_PROMPT,
-                "created_at": datetime.utcnow().isoformat(),
+                "created_at": created_at,
                 "description": "Baseline contextual precision judge - evaluates relevance and ranking"
             },
             {
                 "title": "Default v1.0",
                 "metric": "contextual_relevance",
                 "content": CONTEXTUAL_RELEVANCE_PROMPT,
-                "created_at": datetime.utcnow().isoformat(),
+                "created_at": created_at,
                 "description": "Baseline contextual relevance judge - evaluates if contexts contain necessary information"
             },
             {
                 "title": "Default v1.0",
                 "metric": "correctness",
                 "content": CORRECTNESS_PROMPT,
-                "created_at": datetime.utcnow().isoformat(),
+                "created_at": created_at,
                 "description": "Baseline correctness judge - evaluates if answer matches expected answer"
             },
             {
                 "title": "Default v1.0",
                 "metric": "faithfulness",
                 "content": FAITHFULNESS_PROMPT,
-                "created_at": datetime.utcnow().isoformat(),
+                "created_at": created_at,
                 "description": "Baseline faithfulness judge - evaluates if answer is grounded in contexts"
             }
         ]
         
-        with open(self._eval_prompts_file, "w", encoding="utf-8") as f:
-            json.dump(defaults, f, indent=2)
+        self._eval_prompts_file.write_bytes(_dump_prompts(defaults))
         
         logger.info(f"Initialized default eval prompts: {self._eval_prompts_file}")
     
+    def mtime_ns(self, category: str) -> int:
+        """st_mtime_ns of the category's prompts file (0 if missing).
+        
+        Changes whenever the prompts are saved, by this or any other process,
+        so callers can key memoized lookups on it.
+        """
+        file_path = self._rag_prompts_file if category == "rag" else self._eval_prompts_file
+        try:
+            return file_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+    
+    def _load(self, category: str) -> Tuple[List[Dict], Dict[Tuple[str, Optional[str]], int]]:
+        """Load prompts and their lookup index, reusing the cache while the file is unchanged.
+        
+        The index maps (title, metric) for eval prompts and (title, None) for
+        RAG prompts to the position in the list; the first prompt with a
+        given key wins.
+        """
+        file_path = self._rag_prompts_file if category == "rag" else self._eval_prompts_file
+        
+        try:
+            mtime_ns = file_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return [], {}
+        
+        cached = self._cache.get(category)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1], cached[2]
+        
+        try:
+            prompts = orjson.loads(file_path.read_bytes())
+        except Exception as e:
+            logger.error(f"Error loading {category} prompts: {e}")
+            return [], {}
+        
+        return self._cache_prompts(category, mtime_ns, prompts)
+    
+    def _cache_prompts(
+        self,
+        category: str,
+        mtime_ns: int,
+        prompts: List[Dict]
+    ) -> Tuple[List[Dict], Dict[Tuple[str, Optional[str]], int]]:
+        """Index prompts and cache them as the contents of the file at mtime_ns."""
+        index = {}
+        for i, prompt in enumerate(prompts):
+            index.setdefault(self._key(category, prompt.get("title"), prompt.get("metric")), i)
+        
+        self._cache[category] = (mtime_ns, prompts, index)
+        return prompts, index
+    
+    @staticmethod
+    def _key(category: str, title: str, metric: Optional[str]) -> Tuple[str, Optional[str]]:
+        """Index key for a prompt; RAG prompts are identified by title alone."""
+        return title, metric if category == "eval" else None
+    
+    def _write(self, category: str, prompts: List[Dict]) -> None:
+        """Write prompts to the category's file and make them the cached copy.
+        
+        The file is replaced atomically and the written list becomes the
+        cache entry directly, so the next lookup does not re-read the file
+        just saved.
+        """
+        file_path = self._rag_prompts_file if category == "rag" else self._eval_prompts_file
+        atomic_write_bytes(file_path, _dump_prompts(prompts))
+        
+        self._cache_prompts(category, file_path.stat().st_mtime_ns, prompts)
+        for callback in self._change_listeners:
+            callback(category)
+    
+    def add_change_listener(self, callback: Callable[[str], None]) -> None:
+        """Register callback(category) to run after prompts are saved or deleted.
+        
+        Lets callers that memoize prompt lookups drop stale entries.
+        """
+        if callback not in self._change_listeners:
+            self._change_listeners.append(callback)
+    
     def list_prompts(self, category: str) -> List[Dict]:
         """List all prompts for a category.
         
@@ -97,19 +192,25 @@ class PromptManager:
             category: "rag" or "eval"
             
         Returns:
-            List of prompt dictionaries
+            List of prompt dictionaries (a new list; safe to modify)
         """
-        file_path = self._rag_prompts_file if category == "rag" else self._eval_prompts_file
-        
-        if not file_path.exists():
-            return []
+        prompts, _ = self._load(category)
+        return list(prompts)
+    
+    def get_prompt_data(self, category: str, title: str, metric: Optional[str] = None) -> Optional[Dict]:
+        """Get a full prompt record by title.
         
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading {category} prompts: {e}")
-            return []
+        Args:
+            category: "rag" or "eval"
+            title: Prompt title
+            metric: For eval prompts, the metric name (ignored for RAG prompts)
+            
+        Returns:
+            Prompt dictionary or None if not found
+        """
+        prompts, index = self._load(category)
+        i = index.get(self._key(category, title, metric))
+        return prompts[i] if i is not None else None
     
     def get_prompt(self, category: str, title: str, metric: Optional[str] = None) -> Optional[str]:
         """Get prompt content by title.
@@ -122,19 +223,8 @@ class PromptManager:
         Returns:
             Prompt content string or None if not found
         """
-        prompts = self.list_prompts(category)
-        
-        for prompt in prompts:
-            if category == "eval":
-                # For eval, match both title and metric
-                if prompt.get("title") == title and prompt.get("metric") == metric:
-                    return prompt.get("content")
-            else:
-                # For RAG, match only title
-                if prompt.get("title") == title:
-                    return prompt.get("content")
-        
-        return None
+        prompt = self.get_prompt_data(category, title, metric)
+        return prompt.get("content") if prompt is not None else None
     
     def save_prompt(
         self,
@@ -156,28 +246,20 @@ class PromptManager:
             prompt_type: "system" or "user"
             
         Returns:
-            True if saved successfully
+            True if saved successfully (or already saved with identical fields)
         """
-        file_path = self._rag_prompts_file if category == "rag" else self._eval_prompts_file
-        prompts = self.list_prompts(category)
+        cached, index = self._load(category)
+        prompts = list(cached)
         
         # Check if prompt with same title (and metric for eval) exists
-        existing_index = None
-        for i, p in enumerate(prompts):
-            if category == "eval":
-                if p.get("title") == title and p.get("metric") == metric:
-                    existing_index = i
-                    break
-            else:
-                if p.get("title") == title:
-                    existing_index = i
-                    break
+        existing_index = index.get(self._key(category, title, metric))
         
+        now = utc_now_iso()
         new_prompt = {
             "title": title,
             "content": content,
             "description": description,
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": now,
         }
         
         if category == "rag":
@@ -186,17 +268,22 @@ class PromptManager:
             new_prompt["metric"] = metric
         
         if existing_index is not None:
+            existing = prompts[existing_index]
+            # Re-saving an identical prompt writes nothing and keeps its timestamps
+            if all(existing.get(field) == value for field, value in new_prompt.items() if field != "created_at"):
+                logger.info(f"{category} prompt unchanged, skipping save: {title}")
+                return True
+            
             # Update existing
-            new_prompt["created_at"] = prompts[existing_index].get("created_at")
-            new_prompt["modified_at"] = datetime.utcnow().isoformat()
+            new_prompt["created_at"] = existing.get("created_at")
+            new_prompt["modified_at"] = now
             prompts[existing_index] = new_prompt
         else:
             # Add new
             prompts.append(new_prompt)
         
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(prompts, f, indent=2)
+            self._write(category, prompts)
             logger.info(f"Saved {category} prompt: {title}")
             return True
         except Exception as e:
@@ -214,38 +301,50 @@ class PromptManager:
         Returns:
             True if deleted successfully
         """
-        file_path = self._rag_prompts_file if category == "rag" else self._eval_prompts_file
-        prompts = self.list_prompts(category)
+        prompts, index = self._load(category)
+        key = self._key(category, title, metric)
+        if key not in index:
+            return False  # Nothing deleted
         
         # Find and remove
-        filtered = []
-        for p in prompts:
-            if category == "eval":
-                if not (p.get("title") == title and p.get("metric") == metric):
-                    filtered.append(p)
-            else:
-                if p.get("title") != title:
-                    filtered.append(p)
-        
-        if len(filtered) == len(prompts):
-            return False  # Nothing deleted
+        filtered = [p for p in prompts if self._key(category, p.get("title"), p.get("metric")) != key]
         
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(filtered, f, indent=2)
+            self._write(category, filtered)
             logger.info(f"Deleted {category} prompt: {title}")
             return True
         except Exception as e:
             logger.error(f"Error deleting {category} prompt: {e}")
             return False
+    
+    def delete_prompts(self, category: str, keys: List[Tuple[str, Optional[str]]]) -> Optional[int]:
+        """Delete several prompts of a category with a single file write.
+        
+        Args:
+            category: "rag" or "eval"
+            keys: (title, metric) of each prompt; metric is ignored for RAG prompts
+            
+        Returns:
+            Number of prompts deleted (prompts that do not exist are skipped),
+            or None if the prompts file could not be written
+        """
+        prompts, index = self._load(category)
+        doomed = {self._key(category, title, metric) for title, metric in keys} & index.keys()
+        if not doomed:
+            return 0
+        
+        filtered = [p for p in prompts if self._key(category, p.get("title"), p.get("metric")) not in doomed]
+        
+        try:
+            self._write(category, filtered)
+            logger.info(f"Deleted {len(doomed)} {category} prompts")
+            return len(doomed)
+        except Exception as e:
+            logger.error(f"Error deleting {category} prompts: {e}")
+            return None
 
 
-# Global instance
-_prompt_manager = None
-
+@functools.lru_cache(maxsize=1)
 def get_prompt_manager() -> PromptManager:
     """Get global prompt manager instance."""
-    global _prompt_manager
-    if _prompt_manager is None:
-        _prompt_manager = PromptManager()
-    return _prompt_manager
+    return PromptManager()
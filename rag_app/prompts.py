@@ -25,13 +25,39 @@ Question: {query_str}
 
 Answer:"""
 
+# The template split around its placeholders once at import, so building a
+# user prompt is plain concatenation instead of str.format parsing per query
+_USER_PROMPT_PREFIX, _rest = USER_PROMPT_TEMPLATE.split("{context_str}")
+_USER_PROMPT_MIDDLE, _USER_PROMPT_SUFFIX = _rest.split("{query_str}")
+del _rest
+
+
+def format_user_prompt(context_str: str, question: str) -> str:
+    """Fill USER_PROMPT_TEMPLATE with the context string and question."""
+    return f"{_USER_PROMPT_PREFIX}{context_str}{_USER_PROMPT_MIDDLE}{question}{_USER_PROMPT_SUFFIX}"
+
+
+def format_context_header(rank: int, source: str) -> str:
+    """Header line introducing one retrieved document in the context string."""
+    return f"[Document {rank} - {source}]\n"
+
 
 def format_context(contexts: list) -> str:
-    """Format retrieved contexts into a single string."""
-    formatted_parts = []
+    """Format retrieved contexts into a single string.
+    
+    Headers and node texts are joined in a single pass, so each (possibly
+    long) node text is copied once instead of first into its own
+    per-document string.
+    """
+    parts = []
     for i, node in enumerate(contexts, 1):
         source = node.metadata.get("source_path", "unknown")
-        formatted_parts.append(f"[Document {i} - {source}]\n{node.text}\n")
+        parts.append(format_context_header(i, source))
+        parts.append(node.text)
+        parts.append("\n\n")
     
-    return "\n".join(formatted_parts)
+    if parts:
+        # Documents are separated by a blank line, without a trailing one
+        parts[-1] = "\n"
+    return "".join(parts)
 
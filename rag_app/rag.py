@@ -3,34 +3,144 @@
 import logging
 import time
 from datetime import datetime
-from typing import Any, Dict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 from llama_index.core import Settings
 from llama_index.core.llms import ChatMessage, MessageRole
+from llama_index.embeddings.openai import OpenAIEmbedding
 
+from rag_app.answer_cache import answer_cache_key, get_cached_answer, knowledge_base_version, put_cached_answer
 from rag_app.config import Settings as AppSettings
-from rag_app.index import get_index
-from rag_app.prompts import PROMPT_VERSION, format_context, SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
+from rag_app.index import get_collection
+from rag_app.prompts import PROMPT_VERSION, format_context, format_user_prompt, SYSTEM_PROMPT
 from rag_app.prompt_manager import get_prompt_manager
 from rag_app.retrievers import VectorRetriever
 from rag_app.utils import truncate_text, configure_llama_index
 
 logger = logging.getLogger(__name__)
 
+# Inputs per embeddings request (the OpenAI API maximum)
+QUESTION_EMBED_BATCH_SIZE = 2048
 
-def answer_question(question: str, settings: AppSettings, top_k: int = None) -> Dict[str, Any]:
-    """Answer a question using RAG pipeline."""
-    # Configure LlamaIndex with settings
-    configure_llama_index(settings)
+
+def embed_questions(questions: List[str], settings: AppSettings) -> List[List[float]]:
+    """Embed many questions with as few embedding requests as possible.
+    
+    Questions are short, so they are sent QUESTION_EMBED_BATCH_SIZE at a time
+    rather than with the ingestion-sized batches of Settings.embed_model.
+    """
+    embed_model = OpenAIEmbedding(
+        model=settings.embedding_model,
+        dimensions=settings.embedding_dimensions or None,
+        api_key=settings.openai_api_key,
+        embed_batch_size=QUESTION_EMBED_BATCH_SIZE,
+    )
+    return embed_model.get_text_embedding_batch(questions)
+
+
+def clear_system_prompt_cache(category: str = "rag") -> None:
+    """Forget resolved RAG system prompts (registered as a prompt-manager listener)."""
+    if category == "rag":
+        _resolve_system_prompt.cache_clear()
+
+
+@lru_cache(maxsize=16)
+def _resolve_system_prompt(title: str, mtime_ns: int) -> str:
+    """Load a system prompt from the library or fall back to the default, memoized across queries.
     
+    mtime_ns is the RAG prompts file's modification time, so edits made by
+    other processes (API workers, the CLI, manual edits) select a new entry.
+    """
+    prompt_manager = get_prompt_manager()
+    prompt_manager.add_change_listener(clear_system_prompt_cache)
+    system_prompt = prompt_manager.get_prompt("rag", title)
+    if not system_prompt:
+        logger.warning(f"Prompt '{title}' not found, using default")
+        return SYSTEM_PROMPT
+    return system_prompt
+
+
+def answer_question(
+    question: str,
+    settings: AppSettings,
+    top_k: int = None,
+    query_embedding: Optional[List[float]] = None,
+    category: Optional[str] = None,
+    config_snapshot: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Answer a question using RAG pipeline.
+    
+    With rag_cache_enabled, results are served from and stored in the
+    on-disk answer cache (see rag_app.answer_cache), so re-running an
+    evaluation with unchanged settings skips retrieval and generation.
+    Cached results carry "cached": True, zero timings and no token counts.
+    
+    Args:
+        query_embedding: Precomputed embedding of question (see embed_questions);
+                         embedded on the fly when omitted
+        category: Only retrieve from this knowledge base category (default: all)
+        config_snapshot: Snapshot from get_config_snapshot to attach to the result,
+                         so callers answering many questions build it once
+                         (default: one built for this call)
+    """
     top_k = top_k or settings.top_k
     
-    index = get_index(settings)
-    retriever = VectorRetriever(index, settings)
+    system_prompt = _resolve_system_prompt(
+        settings.rag_system_prompt_title, get_prompt_manager().mtime_ns("rag")
+    )
+    
+    # No ingested knowledge base means nothing worth caching
+    kb_version = knowledge_base_version(settings) if settings.rag_cache_enabled else None
+    if kb_version is None:
+        return _answer_question(question, settings, top_k, query_embedding, system_prompt, category, config_snapshot)
+    
+    cache_dir = Path(settings.rag_cache_dir)
+    cache_key = answer_cache_key(question, settings, top_k, system_prompt, kb_version, category)
+    cached = get_cached_answer(cache_dir, cache_key)
+    if cached is not None:
+        # Only the answer is replayed: the snapshot belongs to this call, and
+        # no retrieval or generation ran, so there is nothing to time or bill
+        return {
+            **cached,
+            "config_snapshot": config_snapshot if config_snapshot is not None else get_config_snapshot(settings, top_k),
+            "retrieval_time_ms": 0.0,
+            "generation_time_ms": 0.0,
+            "total_time_ms": 0.0,
+            "prompt_tokens": None,
+            "completion_tokens": None,
+            "total_tokens": None,
+            "cached": True,
+        }
+    
+    result = _answer_question(question, settings, top_k, query_embedding, system_prompt, category, config_snapshot)
+    # The snapshot is rebuilt per call, so it is not stored with the answer
+    put_cached_answer(cache_dir, cache_key, {k: v for k, v in result.items() if k != "config_snapshot"})
+    return result
+
+
+def _answer_question(
+    question: str,
+    settings: AppSettings,
+    top_k: int,
+    query_embedding: Optional[List[float]],
+    system_prompt: str,
+    category: Optional[str] = None,
+    config_snapshot: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Run retrieval and generation for answer_question."""
+    if config_snapshot is None:
+        config_snapshot = get_config_snapshot(settings, top_k)
+    
+    # Configure LlamaIndex with settings
+    configure_llama_index(settings)
+    
+    retriever = VectorRetriever(get_collection(settings), settings)
     
     # Time retrieval stage
     retrieval_start = time.perf_counter()
-    nodes = retriever.retrieve(question, top_k)
+    nodes = retriever.retrieve(question, top_k, query_embedding, category)
     retrieval_time_ms = (time.perf_counter() - retrieval_start) * 1000
     
     if not nodes:
@@ -40,7 +150,7 @@ def answer_question(question: str, settings: AppSettings, top_k: int = None) ->
             "contexts": [],
             "sources": [],
             "prompt_version": PROMPT_VERSION,
-            "config_snapshot": _get_config_snapshot(settings, top_k),
+            "config_snapshot": config_snapshot,
             "retrieval_time_ms": retrieval_time_ms,
             "generation_time_ms": 0.0,
             "total_time_ms": retrieval_time_ms,
@@ -49,15 +159,22 @@ def answer_question(question: str, settings: AppSettings, top_k: int = None) ->
             "total_tokens": None,
         }
     
-    context_str = format_context(nodes)
-    user_prompt = USER_PROMPT_TEMPLATE.format(context_str=context_str, query_str=question)
+    contexts = []
+    sources = []
+    for rank, node in enumerate(nodes, 1):
+        text = node.text
+        metadata = node.metadata
+        source_path = metadata.get("source_path", "unknown")
+        contexts.append(text)
+        sources.append({
+            "source_path": source_path,
+            "category": metadata.get("category", "unknown"),
+            "rank": rank,
+            "score": node.score,
+            "snippet": truncate_text(text, 200),
+        })
     
-    # Load system prompt from library or fallback to default
-    prompt_manager = get_prompt_manager()
-    system_prompt = prompt_manager.get_prompt("rag", settings.rag_system_prompt_title)
-    if not system_prompt:
-        logger.warning(f"Prompt '{settings.rag_system_prompt_title}' not found, using default")
-        system_prompt = SYSTEM_PROMPT
+    user_prompt = format_user_prompt(format_context(nodes), question)
     
     messages = [
         ChatMessage(role=MessageRole.SYSTEM, content=system_prompt),
@@ -85,24 +202,13 @@ def answer_question(question: str, settings: AppSettings, top_k: int = None) ->
     except Exception as e:
         logger.debug(f"Could not extract token usage: {e}")
     
-    sources = [
-        {
-            "source_path": node.metadata.get("source_path", "unknown"),
-            "category": node.metadata.get("category", "unknown"),
-            "rank": rank,
-            "score": node.score,
-            "snippet": truncate_text(node.text, 200),
-        }
-        for rank, node in enumerate(nodes, 1)
-    ]
-    
     return {
         "question": question,
         "answer": answer,
-        "contexts": [node.text for node in nodes],
+        "contexts": contexts,
         "sources": sources,
         "prompt_version": PROMPT_VERSION,
-        "config_snapshot": _get_config_snapshot(settings, top_k),
+        "config_snapshot": config_snapshot,
         "retrieval_time_ms": retrieval_time_ms,
         "generation_time_ms": generation_time_ms,
         "total_time_ms": total_time_ms,
@@ -112,10 +218,10 @@ def answer_question(question: str, settings: AppSettings, top_k: int = None) ->
     }
 
 
-def _get_config_snapshot(settings: AppSettings, top_k: int) -> Dict[str, Any]:
+def get_config_snapshot(settings: AppSettings, top_k: int = None) -> Dict[str, Any]:
     """Create complete configuration snapshot from all Settings fields."""
     snapshot = settings.model_dump()
-    snapshot["top_k"] = top_k
+    snapshot["top_k"] = top_k or settings.top_k
     snapshot["prompt_version"] = PROMPT_VERSION
     snapshot["timestamp_utc"] = datetime.utcnow().isoformat()
     return snapshot
@@ -1,15 +1,20 @@
-"""Vector similarity retrieval using LlamaIndex and ChromaDB."""
+"""Vector similarity retrieval using ChromaDB."""
 
 import logging
+import math
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from llama_index.core import VectorStoreIndex
+from chromadb.api.models.Collection import Collection
+from llama_index.core import Settings
 
 from rag_app.config import Settings as AppSettings
 
 logger = logging.getLogger(__name__)
 
+# Bookkeeping keys LlamaIndex adds to each chunk's Chroma metadata on ingestion
+_STORE_METADATA_KEYS = frozenset({"_node_content", "_node_type", "document_id", "ref_doc_id"})
+
 
 @dataclass
 class RetrievedNode:
@@ -21,23 +26,52 @@ class RetrievedNode:
 
 
 class VectorRetriever:
-    """Dense vector retrieval using cosine similarity."""
+    """Dense vector retrieval using cosine similarity.
+    
+    Queries the Chroma collection directly rather than through a LlamaIndex
+    retriever, which rebuilds a pydantic node from each hit's serialized
+    JSON only for the text and metadata that Chroma already returns.
+    """
     
-    def __init__(self, index: VectorStoreIndex, settings: AppSettings):
-        self.index = index
+    def __init__(self, collection: Collection, settings: AppSettings):
+        self.collection = collection
         self.settings = settings
     
-    def retrieve(self, query: str, top_k: int) -> List[RetrievedNode]:
-        """Retrieve top_k documents using vector similarity."""
-        retriever = self.index.as_retriever(similarity_top_k=top_k)
-        nodes = retriever.retrieve(query)
+    def retrieve(
+        self,
+        query: str,
+        top_k: int,
+        query_embedding: Optional[List[float]] = None,
+        category: Optional[str] = None
+    ) -> List[RetrievedNode]:
+        """Retrieve top_k documents using vector similarity.
+        
+        A precomputed query_embedding skips the per-query embedding call.
+        A category restricts the search to chunks ingested from that
+        knowledge base folder; Chroma applies it as a metadata filter.
+        """
+        if query_embedding is None:
+            query_embedding = Settings.embed_model.get_query_embedding(query)
+        
+        results = self.collection.query(
+            query_embeddings=[query_embedding],
+            n_results=top_k,
+            where={"category": category} if category is not None else None,
+            include=["documents", "metadatas", "distances"],
+        )
         
         return [
             RetrievedNode(
-                text=node.node.get_content(),
-                score=node.score if node.score is not None else 0.0,
-                metadata=node.node.metadata or {},
-                node_id=node.node.node_id,
+                text=text or "",
+                # Same distance-to-score mapping as LlamaIndex's ChromaVectorStore
+                score=math.exp(-distance),
+                metadata={k: v for k, v in (metadata or {}).items() if k not in _STORE_METADATA_KEYS},
+                node_id=node_id,
+            )
+            for node_id, text, metadata, distance in zip(
+                results["ids"][0],
+                results["documents"][0],
+                results["metadatas"][0],
+                results["distances"][0],
             )
-            for node in nodes
         ]
@@ -1,26 +1,73 @@
 """Utility functions for RAG application."""
 
 import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
 
+import orjson
 from llama_index.core import Settings
 from llama_index.embeddings.openai import OpenAIEmbedding
 from llama_index.llms.openai import OpenAI
 
+logger = logging.getLogger(__name__)
+
+FILE_HASH_BLOCK_SIZE = 1 << 16
+# File hashes are content fingerprints (document ids), not security checks;
+# 16-byte digests keep ids the same length as the earlier MD5 ones
+FILE_HASH_ALGORITHM = "blake2b"
+FILE_HASH_DIGEST_SIZE = 16
+
+# (llm_model, embedding_model, embedding_dimensions, api key) the global LlamaIndex clients were built with
+_configured_clients = None
+# (chunk_size, chunk_overlap) last applied to the global LlamaIndex Settings
+_configured_chunking = None
+
 
 def configure_llama_index(settings) -> None:
-    """Configure LlamaIndex global settings."""
-    Settings.llm = OpenAI(
-        model=settings.llm_model,
-        api_key=settings.openai_api_key,
-        temperature=0.0,
-    )
-    Settings.embed_model = OpenAIEmbedding(
-        model=settings.embedding_model,
-        api_key=settings.openai_api_key,
+    """Configure LlamaIndex global settings.
+    
+    The LLM and embedding clients (and their connection pools) are kept
+    while the model and API key settings are unchanged, so concurrent
+    evaluation workers share them instead of rebuilding them per question.
+    With unchanged settings the call only compares two tuples, so it is
+    cheap enough to make on every query.
+    """
+    global _configured_clients, _configured_chunking
+    client_params = (
+        settings.llm_model,
+        settings.embedding_model,
+        settings.embedding_dimensions,
+        settings.openai_api_key,
     )
-    Settings.chunk_size = settings.chunk_size
-    Settings.chunk_overlap = settings.chunk_overlap
+    if client_params != _configured_clients:
+        Settings.llm = OpenAI(
+            model=settings.llm_model,
+            api_key=settings.openai_api_key,
+            temperature=0.0,
+        )
+        Settings.embed_model = OpenAIEmbedding(
+            model=settings.embedding_model,
+            dimensions=settings.embedding_dimensions or None,
+            api_key=settings.openai_api_key,
+        )
+        _configured_clients = client_params
+    
+    chunking = (settings.chunk_size, settings.chunk_overlap)
+    if chunking != _configured_chunking:
+        Settings.chunk_size = settings.chunk_size
+        Settings.chunk_overlap = settings.chunk_overlap
+        _configured_chunking = chunking
+
+
+def new_file_hasher() -> hashlib.blake2b:
+    """Create the hash object used for file content fingerprints."""
+    return hashlib.blake2b(digest_size=FILE_HASH_DIGEST_SIZE)
 
 
 def get_file_hash(file_path: Path) -> str:
@@ -30,10 +77,114 @@ def get_file_hash(file_path: Path) -> str:
         file_path: Path to the file
         
     Returns:
-        MD5 hash of file content
+        BLAKE2b hash of file content (32 hex characters)
     """
+    # Stream in blocks so large files never sit in memory whole
+    hasher = new_file_hasher()
     with open(file_path, 'rb') as f:
-        return hashlib.md5(f.read()).hexdigest()
+        for block in iter(lambda: f.read(FILE_HASH_BLOCK_SIZE), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def hash_files(file_paths: List[Path], max_workers: Optional[int] = None) -> Dict[Path, str]:
+    """Hash many files concurrently with get_file_hash.
+    
+    hashlib releases the GIL while hashing large blocks, so reading and
+    hashing different files overlap across threads.
+    
+    Args:
+        file_paths: Files to hash
+        max_workers: Thread count (default: one per CPU)
+        
+    Returns:
+        Mapping of each path to its content hash
+    """
+    if len(file_paths) <= 1:
+        return {file_path: get_file_hash(file_path) for file_path in file_paths}
+    
+    workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(file_paths, executor.map(get_file_hash, file_paths)))
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Replace path with data atomically (write a temp file beside it, then rename).
+    
+    Readers see either the old contents or the new ones, never a partial file.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def _json_cache_entry_path(cache_dir: Path, key: str) -> Path:
+    return cache_dir / key[:2] / f"{key}.json"
+
+
+def get_json_cache_entry(cache_dir: Path, key: str) -> Optional[Any]:
+    """Return the value stored under key in an on-disk JSON cache, or None on a miss.
+    
+    Unreadable entries are logged and treated as misses.
+    """
+    try:
+        return orjson.loads(_json_cache_entry_path(cache_dir, key).read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable cache entry {key} in {cache_dir}: {e}")
+        return None
+
+
+def put_json_cache_entry(cache_dir: Path, key: str, value: Any) -> None:
+    """Store value under key in an on-disk JSON cache; write failures are only logged."""
+    path = _json_cache_entry_path(cache_dir, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(path, orjson.dumps(value))
+    except OSError as e:
+        logger.warning(f"Failed to write cache entry {key} in {cache_dir}: {e}")
+
+
+def clear_json_cache(cache_dir: Path) -> None:
+    """Delete every entry of an on-disk JSON cache."""
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def utc_now_iso() -> str:
+    """Current UTC time in ISO 8601 format, without a UTC offset.
+    
+    Matches the timestamps datetime.utcnow().isoformat() produced, without
+    the deprecated utcnow.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def scandir_txt_files(directory: Union[str, Path]) -> Iterator[os.DirEntry]:
+    """Recursively yield .txt file entries under directory.
+    
+    Uses os.scandir so callers can reuse each entry's cached stat()
+    instead of issuing a separate stat per file. Symlinks are skipped.
+    
+    Args:
+        directory: Directory to walk
+        
+    Yields:
+        os.DirEntry for each .txt file
+    """
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_symlink():
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from scandir_txt_files(entry.path)
+            elif entry.is_file(follow_symlinks=False) and entry.name.endswith(".txt"):
+                yield entry
 
 
 def truncate_text(text: str, max_length: int = 1500) -> str:
@@ -7,6 +7,7 @@ import typer
 from rich.console import Console
 from rich.panel import Panel
 
+from eval.judge_cache import clear_judge_cache
 from eval.runner import run_eval
 from rag_app.config import get_settings
 from rag_app.ingest import ingest_knowledge_base
@@ -29,7 +30,13 @@ def check_api_key(settings) -> bool:
 
 
 @app.command()
-def ingest():
+def ingest(
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Keep the existing collection and only ingest new or changed files"
+    ),
+):
     """Ingest documents from knowledge_base/ into vector store."""
     console.print("\n[bold cyan]Ingesting Knowledge Base[/bold cyan]\n")
     
@@ -58,7 +65,7 @@ def ingest():
         console.print(f"Documents found: {len(txt_files)}")
         console.print(f"Chunk size: {settings.chunk_size}, overlap: {settings.chunk_overlap}\n")
         
-        ingest_knowledge_base(settings)
+        ingest_knowledge_base(settings, clear_existing=not incremental)
         
         console.print("\n[bold green]✓ Ingestion complete[/bold green]\n")
         
@@ -122,6 +129,16 @@ def evaluate(
         "-r",
         help="Custom name for evaluation run"
     ),
+    use_judge_cache: bool = typer.Option(
+        False,
+        "--use-judge-cache",
+        help="Reuse cached judge responses for identical prompts"
+    ),
+    clear_cache: bool = typer.Option(
+        False,
+        "--clear-judge-cache",
+        help="Delete cached judge responses before running"
+    ),
 ):
     """Run evaluation on test dataset with quality metrics."""
     console.print("\n[bold cyan]Running Evaluation[/bold cyan]\n")
@@ -136,6 +153,13 @@ def evaluate(
             console.print(f"\n[bold red]Dataset not found: {dataset}[/bold red]\n")
             raise typer.Exit(code=1)
         
+        if clear_cache:
+            clear_judge_cache(Path(settings.judge_cache_dir))
+            console.print("Judge cache cleared")
+        
+        if use_judge_cache:
+            settings = settings.model_copy(update={"judge_cache_enabled": True})
+        
         run_folder = run_eval(dataset, settings, run_name, num_questions)
         
         console.print(f"\n[bold green]✓ Evaluation complete[/bold green]")
@@ -1,82 +1,223 @@
 """Centralized API client for backend communication."""
 
+import functools
 import os
+import threading
 import requests
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+import orjson
 from dotenv import load_dotenv
 load_dotenv(override=True)
 API_BASE_URL = os.getenv("API_BASE_URL", "http://127.0.0.1:8000")
 
+# Shared across calls (and Streamlit reruns) so requests reuse keep-alive connections
+_session = requests.Session()
+
+# (path, params) -> (ETag, parsed body) of the last response from endpoints
+# that support If-None-Match, least recently used first
+_etag_cache: "OrderedDict[Tuple[str, tuple], Tuple[str, Any]]" = OrderedDict()
+ETAG_CACHE_SIZE = 64
+# Streamlit runs each session's script in its own thread
+_etag_lock = threading.Lock()
+
+# Knowledge base uploads are split into batches of this many files, sent concurrently
+UPLOAD_BATCH_SIZE = 20
+UPLOAD_WORKERS = 4
+
+# Event streams are idle between updates, so reads get a long timeout
+EVENT_STREAM_CONNECT_TIMEOUT = 5
+EVENT_STREAM_READ_TIMEOUT = 300
+
+
+def _json(response: requests.Response) -> Any:
+    """Parse a JSON response body with orjson (run reports can be large)."""
+    return orjson.loads(response.content)
+
+
+def _stream_events(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the JSON payload of each server-sent event from an API endpoint."""
+    with _session.get(
+        f"{API_BASE_URL}{path}",
+        stream=True,
+        timeout=(EVENT_STREAM_CONNECT_TIMEOUT, EVENT_STREAM_READ_TIMEOUT),
+    ) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if line.startswith(b"data: "):
+                yield orjson.loads(line[len(b"data: "):])
+
+
+def _get_revalidated(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """GET a JSON endpoint that supports ETags, reusing the last body on 304.
+    
+    The returned object is shared with later calls, so treat it as read-only.
+    """
+    key = (path, tuple(sorted((params or {}).items())))
+    with _etag_lock:
+        cached = _etag_cache.get(key)
+    headers = {"If-None-Match": cached[0]} if cached else {}
+    response = _session.get(f"{API_BASE_URL}{path}", params=params, headers=headers)
+    if response.status_code == 304 and cached:
+        return cached[1]
+    response.raise_for_status()
+    
+    body = _json(response)
+    if response.headers.get("ETag"):
+        with _etag_lock:
+            _etag_cache[key] = (response.headers["ETag"], body)
+            _etag_cache.move_to_end(key)
+            while len(_etag_cache) > ETAG_CACHE_SIZE:
+                _etag_cache.popitem(last=False)
+    return body
+
+
+def _upload_kb_batch(files) -> Dict[str, Any]:
+    """Upload one batch of knowledge base files in a single multipart request."""
+    file_list = [("files", (f.name, f.getvalue(), "text/plain")) for f in files]
+    response = _session.post(f"{API_BASE_URL}/api/knowledge-base/upload", files=file_list)
+    response.raise_for_status()
+    return _json(response)
+
+
+@functools.lru_cache(maxsize=1)
+def _available_metrics() -> tuple:
+    # The metric registry is fixed when the server starts, so one fetch per process suffices
+    response = _session.get(f"{API_BASE_URL}/api/eval/available-metrics")
+    response.raise_for_status()
+    return tuple(_json(response).get("metrics", []))
+
+
+@functools.lru_cache(maxsize=8)
+def _get_kb_listing(path: str, kb_version: str) -> Any:
+    # Keyed on the server's knowledge base version, so a listing is refetched only after it changes
+    response = _session.get(f"{API_BASE_URL}/api/knowledge-base/{path}")
+    response.raise_for_status()
+    return _json(response)
+
+
 class APIClient:
     @staticmethod
     def load_config() -> Dict[str, Any]:
-        response = requests.get(f"{API_BASE_URL}/api/config")
-        response.raise_for_status()
-        return response.json()
+        """Saved configuration (.env + defaults) as {"config": ..., "source": ...} (treat as read-only)."""
+        return _get_revalidated("/api/config")
     
     @staticmethod
     def save_config(overrides: Dict[str, Any]) -> None:
-        response = requests.post(
+        response = _session.post(
             f"{API_BASE_URL}/api/config/save",
             json={"overrides": overrides}
         )
         response.raise_for_status()
     
     @staticmethod
-    def upload_kb_files(files) -> Dict[str, Any]:
-        file_list = [("files", (f.name, f.getvalue(), "text/plain")) for f in files]
-        response = requests.post(f"{API_BASE_URL}/api/knowledge-base/upload", files=file_list)
+    def set_active_prompt(category: str, title: str, metric: Optional[str] = None) -> None:
+        """Make a saved prompt the active one for RAG (category "rag") or a metric ("eval")."""
+        response = _session.post(
+            f"{API_BASE_URL}/api/config/active-prompt",
+            json={"category": category, "title": title, "metric": metric}
+        )
         response.raise_for_status()
-        return response.json()
+    
+    @staticmethod
+    def upload_kb_files(files, on_progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """Upload knowledge base files, in concurrent batches when there are many.
+        
+        Args:
+            files: Uploaded file objects (name and getvalue())
+            on_progress: Called with (files done, total files) after each batch
+        
+        Returns:
+            Combined upload result: uploaded paths, errors and count
+        """
+        batches = [files[i:i + UPLOAD_BATCH_SIZE] for i in range(0, len(files), UPLOAD_BATCH_SIZE)]
+        result: Dict[str, Any] = {"uploaded": [], "errors": [], "count": 0}
+        done = 0
+        try:
+            with ThreadPoolExecutor(max_workers=min(UPLOAD_WORKERS, len(batches) or 1)) as executor:
+                futures = {executor.submit(_upload_kb_batch, batch): len(batch) for batch in batches}
+                for future in as_completed(futures):
+                    batch_result = future.result()
+                    result["uploaded"].extend(batch_result.get("uploaded", []))
+                    result["errors"].extend(batch_result.get("errors", []))
+                    result["count"] += batch_result.get("count", 0)
+                    done += futures[future]
+                    if on_progress:
+                        on_progress(done, len(files))
+        finally:
+            # Earlier batches may have landed even if a later one failed
+            _get_kb_listing.cache_clear()
+        return result
     
     @staticmethod
     def trigger_ingestion() -> None:
-        response = requests.post(f"{API_BASE_URL}/api/knowledge-base/ingest")
+        response = _session.post(f"{API_BASE_URL}/api/knowledge-base/ingest")
         response.raise_for_status()
     
     @staticmethod
     def get_ingestion_status() -> Dict[str, Any]:
-        response = requests.get(f"{API_BASE_URL}/api/knowledge-base/ingest/status")
+        response = _session.get(f"{API_BASE_URL}/api/knowledge-base/ingest/status")
         response.raise_for_status()
-        return response.json()
+        return _json(response)
     
     @staticmethod
-    def get_kb_files() -> List[Dict[str, Any]]:
-        response = requests.get(f"{API_BASE_URL}/api/knowledge-base/files")
-        response.raise_for_status()
-        return response.json()
+    def stream_ingestion_status() -> Iterator[Dict[str, Any]]:
+        """Yield ingestion status updates as the server pushes them (server-sent events)."""
+        return _stream_events("/api/knowledge-base/ingest/stream")
     
     @staticmethod
-    def get_kb_tree() -> Dict[str, Any]:
-        response = requests.get(f"{API_BASE_URL}/api/knowledge-base/tree")
+    def get_kb_version() -> str:
+        """Version string that changes whenever the knowledge base listing may have."""
+        response = _session.get(f"{API_BASE_URL}/api/knowledge-base/version")
         response.raise_for_status()
-        return response.json()
+        return _json(response)["version"]
+    
+    @staticmethod
+    def get_kb_files(kb_version: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List knowledge base files, cached per version (treat the result as read-only)."""
+        return _get_kb_listing("files", kb_version or APIClient.get_kb_version())
+    
+    @staticmethod
+    def get_kb_tree(kb_version: Optional[str] = None) -> Dict[str, Any]:
+        """Knowledge base file tree, cached per version (treat the result as read-only)."""
+        return _get_kb_listing("tree", kb_version or APIClient.get_kb_version())
+    
+    @staticmethod
+    def clear_kb_listing_cache() -> None:
+        """Drop cached knowledge base listings so the next call refetches them."""
+        _get_kb_listing.cache_clear()
     
     @staticmethod
     def upload_test_set(file) -> Dict[str, Any]:
         files = {"file": (file.name, file.getvalue(), "application/json")}
-        response = requests.post(f"{API_BASE_URL}/api/datasets/upload", files=files)
+        response = _session.post(f"{API_BASE_URL}/api/datasets/upload", files=files)
         response.raise_for_status()
-        return response.json()
+        return _json(response)
     
     @staticmethod
     def list_datasets() -> List[Dict[str, Any]]:
-        response = requests.get(f"{API_BASE_URL}/api/datasets")
+        response = _session.get(f"{API_BASE_URL}/api/datasets")
         response.raise_for_status()
-        return response.json()
+        return _json(response)
     
     @staticmethod
     def query_rag(question: str, config_overrides: Dict[str, Any]) -> Dict[str, Any]:
-        response = requests.post(
+        response = _session.post(
             f"{API_BASE_URL}/api/query",
             json={"question": question, "config_overrides": config_overrides}
         )
         response.raise_for_status()
-        return response.json()
+        return _json(response)
     
     @staticmethod
-    def start_evaluation(dataset: str, metrics: List[str], config_overrides: Dict[str, Any], run_name: Optional[str] = None, num_questions: Optional[int] = None) -> str:
+    def start_evaluation(dataset: str, metrics: List[str], config_overrides: Dict[str, Any], run_name: Optional[str] = None, num_questions: Optional[int] = None) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Start an evaluation run.
+        
+        Returns:
+            Tuple of (run_id, initial progress of the run)
+        """
         payload = {
             "dataset": f"QA_testing_sets/{dataset}.json",
             "config_overrides": config_overrides,
@@ -87,37 +228,69 @@ class APIClient:
         if num_questions:
             payload["num_questions"] = num_questions
         
-        response = requests.post(f"{API_BASE_URL}/api/eval/run", json=payload)
+        response = _session.post(f"{API_BASE_URL}/api/eval/run", json=payload)
         response.raise_for_status()
-        return response.json().get("run_id")
+        result = _json(response)
+        return result.get("run_id"), result.get("progress") or {}
+    
+    @staticmethod
+    def get_run_details(
+        run_id: str,
+        include_results: bool = True,
+        results_offset: int = 0,
+        results_limit: Optional[int] = None,
+        truncate_contexts: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Details of a run, revalidated with its ETag (treat the result as read-only)."""
+        params = {"include_results": include_results, "results_offset": results_offset}
+        if results_limit is not None:
+            params["results_limit"] = results_limit
+        if truncate_contexts is not None:
+            params["truncate_contexts"] = truncate_contexts
+        return _get_revalidated(f"/api/eval/runs/{run_id}", params)
     
     @staticmethod
-    def get_run_details(run_id: str) -> Dict[str, Any]:
-        response = requests.get(f"{API_BASE_URL}/api/eval/runs/{run_id}")
+    def get_run_progress(run_id: str) -> Dict[str, Any]:
+        """Status and question counters of a run, without its results."""
+        response = _session.get(f"{API_BASE_URL}/api/eval/runs/{run_id}/progress")
         response.raise_for_status()
-        return response.json()
+        return _json(response)
     
     @staticmethod
-    def list_runs() -> List[Dict[str, Any]]:
-        response = requests.get(f"{API_BASE_URL}/api/eval/runs")
+    def stream_run_progress(run_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield run progress updates as the server pushes them (server-sent events)."""
+        return _stream_events(f"/api/eval/runs/{run_id}/events")
+    
+    @staticmethod
+    def get_run_view(run_id: Optional[str] = None) -> Dict[str, Any]:
+        """Run list, details of run_id (default: newest run, without results) and token prices in one request."""
+        params = {"run_id": run_id} if run_id else {}
+        response = _session.get(f"{API_BASE_URL}/api/eval/runs/view", params=params)
         response.raise_for_status()
-        return response.json()
+        return _json(response)
+    
+    @staticmethod
+    def list_runs() -> List[Dict[str, Any]]:
+        """Metadata of all evaluation runs (treat the result as read-only)."""
+        return _get_revalidated("/api/eval/runs")
     
     @staticmethod
     def get_available_metrics() -> List[str]:
-        response = requests.get(f"{API_BASE_URL}/api/eval/available-metrics")
-        response.raise_for_status()
-        return response.json().get("metrics", [])
+        return list(_available_metrics())
     
     @staticmethod
     def list_prompts(category: str) -> List[Dict[str, Any]]:
-        response = requests.get(f"{API_BASE_URL}/api/prompts/{category}")
-        response.raise_for_status()
-        return response.json()
+        """Prompts of a category (treat the result as read-only)."""
+        return _get_revalidated(f"/api/prompts/{category}")
+    
+    @staticmethod
+    def list_prompts_bulk(categories: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Prompts of several categories (treat the result as read-only)."""
+        return _get_revalidated("/api/prompts", {"categories": ",".join(categories)})
     
     @staticmethod
     def save_prompt(category: str, title: str, content: str, description: str = "", prompt_type: str = "system") -> None:
-        response = requests.post(
+        response = _session.post(
             f"{API_BASE_URL}/api/prompts/{category}",
             json={"title": title, "content": content, "description": description, "type": prompt_type}
         )
@@ -125,7 +298,7 @@ class APIClient:
     
     @staticmethod
     def save_eval_prompt(metric: str, title: str, content: str, description: str = "") -> None:
-        response = requests.post(
+        response = _session.post(
             f"{API_BASE_URL}/api/prompts/eval",
             json={"title": title, "content": content, "description": description, "metric": metric}
         )
@@ -134,12 +307,23 @@ class APIClient:
     @staticmethod
     def delete_prompt(category: str, title: str, metric: Optional[str] = None) -> None:
         params = {"metric": metric} if metric else {}
-        response = requests.delete(f"{API_BASE_URL}/api/prompts/{category}/{title}", params=params)
+        response = _session.delete(f"{API_BASE_URL}/api/prompts/{category}/{title}", params=params)
+        response.raise_for_status()
+    
+    @staticmethod
+    def delete_prompts(prompts: List[Dict[str, Any]]) -> int:
+        """Delete several prompts, each {"category", "title", "metric"}, in one request.
+        
+        Returns:
+            Number of prompts deleted
+        """
+        response = _session.post(f"{API_BASE_URL}/api/prompts/batch-delete", json={"prompts": prompts})
         response.raise_for_status()
+        return _json(response)["deleted"]
     
     @staticmethod
     def reset_vector_store() -> Dict[str, Any]:
         """Reset/clear the vector store (deletes all indexed documents)."""
-        response = requests.post(f"{API_BASE_URL}/api/system/reset")
+        response = _session.post(f"{API_BASE_URL}/api/system/reset")
         response.raise_for_status()
-        return response.json()
+        return _json(response)
@@ -1,14 +1,10 @@
-"""Component package exports."""
+"""Component package exports.
 
-from ui.components import (
-    config_page,
-    knowledge_base_page,
-    datasets_page,
-    query_page,
-    evaluation_page,
-    reports_page,
-    prompts_page
-)
+Page modules are imported on first attribute access, so the app only
+pays the import cost of the pages a session actually opens.
+"""
+
+import importlib
 
 __all__ = [
     'config_page',
@@ -19,3 +15,9 @@ __all__ = [
     'reports_page',
     'prompts_page'
 ]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
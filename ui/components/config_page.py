@@ -1,45 +1,98 @@
 """Configuration management UI."""
 
-import json
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Tuple
+
+import orjson
 import streamlit as st
 from ui.api_client import APIClient
+from ui.utils import cached_prompts, cached_run_view, get_config, refresh_config, save_config, searchable_selectbox
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _index_titles_by_metric(metric_titles: Tuple[Tuple[str, str], ...]) -> Dict[str, Dict[str, int]]:
+    """Group (metric, title) pairs into metric -> {title: position in its list}.
+    
+    Cached on the pairs themselves, so reruns with unchanged prompts skip
+    the grouping and selectbox indices are dict lookups instead of list scans.
+    """
+    titles_by_metric: Dict[str, Dict[str, int]] = defaultdict(dict)
+    for metric, title in metric_titles:
+        positions = titles_by_metric[metric]
+        positions.setdefault(title, len(positions))
+    return dict(titles_by_metric)
+
+
+def _widget_defaults(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Initial session state for the config widgets, keyed by widget key."""
+    weights = config.get("overall_score_weights", {})
+    return {
+        "top_k_input": config.get("top_k", 5),
+        "chunk_size_input": config.get("chunk_size", 512),
+        "chunk_overlap_input": config.get("chunk_overlap", 50),
+        "include_metric_reasons_input": config.get("include_metric_reasons", False),
+        "max_contexts_for_eval_input": config.get("max_contexts_for_eval", 3),
+        # Convert dict to JSON string for display, handle empty dict
+        "overall_score_weights_input": orjson.dumps(weights).decode() if weights else "{}",
+        "llm_model_input": config.get("llm_model", "gpt-4o-mini"),
+        "embedding_model_input": config.get("embedding_model", "text-embedding-3-small"),
+        "judge_model_input": config.get("judge_model", "gpt-4o-mini"),
+        "judge_num_samples_input": config.get("judge_num_samples", 1),
+        "judge_temperature_input": config.get("judge_temperature", 0.0),
+        "input_token_price_per_million_input": config.get("input_token_price_per_million", 0.150),
+        "output_token_price_per_million_input": config.get("output_token_price_per_million", 0.600),
+    }
 
 
 def render():
     """Render configuration page."""
     st.header("Configuration")
     
-    if st.button("Load Current Config"):
+    if st.button("Reload Current Config"):
+        cached_prompts.clear()
         try:
-            st.session_state.config = APIClient.load_config()
+            refresh_config()
+            # Drop edited widget values so they are re-seeded from the loaded config
+            for key in _widget_defaults({}):
+                st.session_state.pop(key, None)
             st.success("Configuration loaded")
         except Exception as e:
             st.error(f"Failed to load config: {e}")
             return
     
-    if not st.session_state.config:
-        st.info("Click 'Load Current Config' to view and edit configuration")
+    try:
+        config = get_config()
+    except Exception as e:
+        st.error(f"Failed to load config: {e}")
         return
     
-    config = st.session_state.config
+    # Widgets read their values from session state, seeded once from the
+    # config, instead of being re-created with a value= default every rerun
+    for key, value in _widget_defaults(config).items():
+        st.session_state.setdefault(key, value)
     
     # Prompt Settings
     st.subheader("Prompt Settings")
     try:
-        rag_prompts = APIClient.list_prompts("rag")
-        eval_prompts = APIClient.list_prompts("eval")
-        available_metrics = APIClient.get_available_metrics()
+        # Fetch metrics in the background while the prompts load (both are
+        # cached, so this only overlaps the two requests on a cold cache)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            metrics_future = executor.submit(APIClient.get_available_metrics)
+            prompts_by_category = cached_prompts()
+            available_metrics = metrics_future.result()
+        rag_prompts = prompts_by_category["rag"]
+        eval_prompts = prompts_by_category["eval"]
         
         prompt_col1, prompt_col2 = st.columns(2)
         with prompt_col1:
             st.markdown("**RAG System Prompt**")
             rag_prompt_titles = [p["title"] for p in rag_prompts]
+            rag_title_positions = {title: i for i, title in enumerate(rag_prompt_titles)}
             current_rag_prompt = config.get("rag_system_prompt_title", "Default v1.0")
-            # Fallback to default if not found
-            if current_rag_prompt not in rag_prompt_titles:
-                current_rag_prompt = "Default v1.0"
-            rag_prompt_idx = rag_prompt_titles.index(current_rag_prompt) if current_rag_prompt in rag_prompt_titles else 0
-            rag_system_prompt_title = st.selectbox(
+            # Fallback to the default prompt, then to the first one
+            rag_prompt_idx = rag_title_positions.get(current_rag_prompt, rag_title_positions.get("Default v1.0", 0))
+            rag_system_prompt_title = searchable_selectbox(
                 "Select RAG Prompt",
                 rag_prompt_titles,
                 index=rag_prompt_idx,
@@ -48,27 +101,21 @@ def render():
         
         with prompt_col2:
             st.markdown("**Evaluation Prompts**")
-            # Group eval prompts by metric
-            eval_prompts_by_metric = {}
-            for p in eval_prompts:
-                metric = p.get("metric", "unknown")
-                if metric not in eval_prompts_by_metric:
-                    eval_prompts_by_metric[metric] = []
-                eval_prompts_by_metric[metric].append(p["title"])
+            eval_prompts_by_metric = _index_titles_by_metric(
+                tuple((p.get("metric", "unknown"), p["title"]) for p in eval_prompts)
+            )
             
             # Store selections - dynamically based on available metrics
             eval_prompt_selections = {}
             for metric in available_metrics:
                 if metric in eval_prompts_by_metric:
-                    titles = eval_prompts_by_metric[metric]
+                    title_positions = eval_prompts_by_metric[metric]
                     current_title = config.get(f"eval_prompt_{metric}", "Default v1.0")
-                    # Fallback to default if not found
-                    if current_title not in titles:
-                        current_title = "Default v1.0"
-                    idx = titles.index(current_title) if current_title in titles else 0
-                    selected = st.selectbox(
+                    # Fallback to the default prompt, then to the first one
+                    idx = title_positions.get(current_title, title_positions.get("Default v1.0", 0))
+                    selected = searchable_selectbox(
                         f"{metric.replace('_', ' ').title()}",
-                        titles,
+                        list(title_positions),
                         index=idx,
                         key=f"eval_prompt_{metric}_input"
                     )
@@ -84,109 +131,108 @@ def render():
             "faithfulness": config.get("eval_prompt_faithfulness", "Default v1.0"),
         }
     
-    # RAG Settings
-    st.subheader("RAG Settings")
-    rag_col1, rag_col2 = st.columns(2)
-    with rag_col1:
-        retrieval_strategy = st.selectbox(
-            "Retrieval Strategy",
-            ["vector"],
-            index=0,
-            key="retrieval_strategy_input"
-        )
-        top_k = st.number_input("Top K", min_value=1, max_value=20, value=config.get("top_k", 5), key="top_k_input")
-    with rag_col2:
-        chunk_size = st.number_input("Chunk Size", min_value=128, max_value=2048, value=config.get("chunk_size", 512), step=64, key="chunk_size_input")
-        chunk_overlap = st.number_input("Chunk Overlap", min_value=0, max_value=512, value=config.get("chunk_overlap", 50), step=10, key="chunk_overlap_input")
-    
-    # Eval Settings
-    st.subheader("Eval Settings")
-    eval_col1, eval_col2 = st.columns(2)
-    with eval_col1:
-        include_metric_reasons = st.checkbox(
-            "Include Metric Reasons (slower but more informative)",
-            value=config.get("include_metric_reasons", False),
-            key="include_metric_reasons_input"
-        )
-        max_contexts_for_eval = st.number_input(
-            "Max Contexts for Eval",
-            min_value=1, max_value=10, value=config.get("max_contexts_for_eval", 3),
-            key="max_contexts_for_eval_input",
-            help="Maximum number of retrieved contexts to include in evaluation"
-        )
-    with eval_col2:
-        # Convert dict to JSON string for display, handle empty dict
-        default_weights = config.get("overall_score_weights", {})
-        weights_str = json.dumps(default_weights) if default_weights else "{}"
-        overall_score_weights = st.text_area(
-            "Overall Score Weights (JSON)",
-            value=weights_str,
-            key="overall_score_weights_input",
-            help="JSON dict mapping metric names to weights for overall score calculation. Example: {\"contextual_precision\": 0.5, \"contextual_relevance\": 0.5}",
-            height=100
-        )
-    
-    # Model Settings
-    st.subheader("Model Settings")
-    model_col1, model_col2 = st.columns(2)
-    with model_col1:
-        llm_model = st.text_input("LLM Model", value=config.get("llm_model", "gpt-4o-mini"), key="llm_model_input")
-    with model_col2:
-        embedding_model = st.text_input("Embedding Model", value=config.get("embedding_model", "text-embedding-3-small"), key="embedding_model_input")
-    
-    # LLM-as-Judge Settings
-    st.subheader("LLM-as-Judge Settings")
-    judge_col1, judge_col2 = st.columns(2)
-    with judge_col1:
-        judge_model = st.text_input(
-            "Judge Model",
-            value=config.get("judge_model", "gpt-4o-mini"),
-            key="judge_model_input",
-            help="OpenAI model to use for LLM-as-judge evaluation"
-        )
-        judge_num_samples = st.number_input(
-            "Number of Judge Samples",
-            min_value=1, max_value=10, value=config.get("judge_num_samples", 1),
-            key="judge_num_samples_input",
-            help="Number of times to evaluate each metric and average the scores"
-        )
-    with judge_col2:
-        judge_temperature = st.slider(
-            "Judge Temperature",
-            min_value=0.0, max_value=2.0, value=config.get("judge_temperature", 0.0),
-            step=0.1, key="judge_temperature_input",
-            help="Temperature for judge LLM (0.0 = deterministic, higher = more random)"
-        )
-    
-    # Token Pricing Settings
-    st.subheader("Token Pricing (per Million)")
-    pricing_col1, pricing_col2 = st.columns(2)
-    with pricing_col1:
-        input_token_price_per_million = st.number_input(
-            "Input Token Price (USD/M)",
-            min_value=0.0, value=config.get("input_token_price_per_million", 0.150),
-            step=0.001, format="%.3f",
-            key="input_token_price_per_million_input",
-            help="Price per million input tokens in USD (e.g., 0.150 for gpt-4o-mini)"
-        )
-    with pricing_col2:
-        output_token_price_per_million = st.number_input(
-            "Output Token Price (USD/M)",
-            min_value=0.0, value=config.get("output_token_price_per_million", 0.600),
-            step=0.001, format="%.3f",
-            key="output_token_price_per_million_input",
-            help="Price per million output tokens in USD (e.g., 0.600 for gpt-4o-mini)"
-        )
+    # Widgets below only take effect on submit, so typing in them does not
+    # rerun the page
+    with st.form("config_form"):
+        # RAG Settings
+        st.subheader("RAG Settings")
+        rag_col1, rag_col2 = st.columns(2)
+        with rag_col1:
+            retrieval_strategy = st.selectbox(
+                "Retrieval Strategy",
+                ["vector"],
+                index=0,
+                key="retrieval_strategy_input"
+            )
+            top_k = st.number_input("Top K", min_value=1, max_value=20, key="top_k_input")
+        with rag_col2:
+            chunk_size = st.number_input("Chunk Size", min_value=128, max_value=2048, step=64, key="chunk_size_input")
+            chunk_overlap = st.number_input("Chunk Overlap", min_value=0, max_value=512, step=10, key="chunk_overlap_input")
+        
+        # Eval Settings
+        st.subheader("Eval Settings")
+        eval_col1, eval_col2 = st.columns(2)
+        with eval_col1:
+            include_metric_reasons = st.checkbox(
+                "Include Metric Reasons (slower but more informative)",
+                key="include_metric_reasons_input"
+            )
+            max_contexts_for_eval = st.number_input(
+                "Max Contexts for Eval",
+                min_value=1, max_value=10,
+                key="max_contexts_for_eval_input",
+                help="Maximum number of retrieved contexts to include in evaluation"
+            )
+        with eval_col2:
+            overall_score_weights = st.text_area(
+                "Overall Score Weights (JSON)",
+                key="overall_score_weights_input",
+                help="JSON dict mapping metric names to weights for overall score calculation. Example: {\"contextual_precision\": 0.5, \"contextual_relevance\": 0.5}",
+                height=100
+            )
+        
+        # Model Settings
+        st.subheader("Model Settings")
+        model_col1, model_col2 = st.columns(2)
+        with model_col1:
+            llm_model = st.text_input("LLM Model", key="llm_model_input")
+        with model_col2:
+            embedding_model = st.text_input("Embedding Model", key="embedding_model_input")
+        
+        # LLM-as-Judge Settings
+        st.subheader("LLM-as-Judge Settings")
+        judge_col1, judge_col2 = st.columns(2)
+        with judge_col1:
+            judge_model = st.text_input(
+                "Judge Model",
+                key="judge_model_input",
+                help="OpenAI model to use for LLM-as-judge evaluation"
+            )
+            judge_num_samples = st.number_input(
+                "Number of Judge Samples",
+                min_value=1, max_value=10,
+                key="judge_num_samples_input",
+                help="Number of times to evaluate each metric and average the scores"
+            )
+        with judge_col2:
+            judge_temperature = st.slider(
+                "Judge Temperature",
+                min_value=0.0, max_value=2.0,
+                step=0.1, key="judge_temperature_input",
+                help="Temperature for judge LLM (0.0 = deterministic, higher = more random)"
+            )
+        
+        # Token Pricing Settings
+        st.subheader("Token Pricing (per Million)")
+        pricing_col1, pricing_col2 = st.columns(2)
+        with pricing_col1:
+            input_token_price_per_million = st.number_input(
+                "Input Token Price (USD/M)",
+                min_value=0.0,
+                step=0.001, format="%.3f",
+                key="input_token_price_per_million_input",
+                help="Price per million input tokens in USD (e.g., 0.150 for gpt-4o-mini)"
+            )
+        with pricing_col2:
+            output_token_price_per_million = st.number_input(
+                "Output Token Price (USD/M)",
+                min_value=0.0,
+                step=0.001, format="%.3f",
+                key="output_token_price_per_million_input",
+                help="Price per million output tokens in USD (e.g., 0.600 for gpt-4o-mini)"
+            )
+        
+        submitted = st.form_submit_button("Save Configuration", type="primary")
     
-    if st.button("Save Configuration", type="primary"):
+    if submitted:
         try:
             # Parse overall_score_weights JSON
             try:
-                weights_dict = json.loads(overall_score_weights) if overall_score_weights.strip() else {}
+                weights_dict = orjson.loads(overall_score_weights) if overall_score_weights.strip() else {}
                 if not isinstance(weights_dict, dict):
                     st.error("Overall Score Weights must be a JSON object/dict")
                     return
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 st.error(f"Invalid JSON for Overall Score Weights: {e}")
                 return
             
@@ -211,8 +257,8 @@ def render():
             # Add eval prompt selections dynamically
             for metric, title in eval_prompt_selections.items():
                 overrides[f"eval_prompt_{metric}"] = title
-            APIClient.save_config(overrides)
+            save_config(overrides)
+            cached_run_view.clear()
             st.success("Configuration saved successfully")
-            st.session_state.config = overrides
         except Exception as e:
             st.error(f"Failed to save configuration: {e}")
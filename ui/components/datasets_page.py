@@ -2,6 +2,7 @@
 
 import streamlit as st
 from ui.api_client import APIClient
+from ui.utils import cached_datasets
 
 
 def render():
@@ -25,6 +26,7 @@ def _render_upload_section():
         try:
             with st.spinner("Uploading and validating..."):
                 result = APIClient.upload_test_set(uploaded_file)
+                cached_datasets.clear()
                 st.success(f"Test set '{result.get('name')}' uploaded successfully ({result.get('num_questions')} questions)")
                 st.rerun()
         except Exception as e:
@@ -36,17 +38,20 @@ def _render_datasets_list():
     st.subheader("Available Test Sets")
     
     try:
-        datasets = APIClient.list_datasets()
+        datasets = cached_datasets()
         
         if not datasets:
             st.info("No test sets available. Upload a .json test set to get started.")
             return
         
         for dataset in datasets:
+            details = [f"**Path:** {dataset['path']}"]
+            if dataset.get('description'):
+                details.append(f"**Description:** {dataset['description']}")
+            details.append(f"**Questions:** {dataset['num_questions']}")
+            
+            # One markdown element per card instead of one per line
             with st.expander(f"📊 {dataset['name']} ({dataset['num_questions']} questions)"):
-                st.write(f"**Path:** {dataset['path']}")
-                if dataset.get('description'):
-                    st.write(f"**Description:** {dataset['description']}")
-                st.write(f"**Questions:** {dataset['num_questions']}")
+                st.markdown("\n\n".join(details))
     except Exception as e:
         st.error(f"Failed to load datasets: {e}")
@@ -1,8 +1,17 @@
 """Evaluation runner UI."""
 
 import time
+from typing import Any, Dict, Optional
+
 import streamlit as st
 from ui.api_client import APIClient
+from ui.utils import POLL_INTERVAL_MIN_SECONDS, cached_datasets, cached_run_results, cached_run_view, next_poll_interval
+
+# Refresh interval of the progress panel when Streamlit supports fragments
+PROGRESS_REFRESH_SECONDS = 2
+
+# Run statuses that end an evaluation without results to show
+FAILED_STATUSES = ('error', 'cancelled')
 
 
 def render():
@@ -10,7 +19,7 @@ def render():
     st.header("Run Evaluation")
     
     try:
-        datasets = APIClient.list_datasets()
+        datasets = cached_datasets()
     except Exception as e:
         st.error(f"Failed to load datasets: {e}")
         return
@@ -48,10 +57,18 @@ def render():
     if cancel_button:
         st.session_state.cancel_eval = True
         st.session_state.eval_running = False
+        st.session_state.current_run_id = None
         st.warning("Evaluation cancelled")
     
     if start_button and not st.session_state.eval_running:
         _run_evaluation(selected_dataset, selected_metrics, run_name, num_questions)
+    
+    if st.session_state.get('current_run_id'):
+        _progress_fragment()
+    elif st.session_state.get('eval_failed'):
+        st.error(st.session_state.pop('eval_failed'))
+    elif st.session_state.pop('eval_completed', False):
+        _show_completion()
 
 
 def _render_metric_selection():
@@ -89,7 +106,7 @@ def _run_evaluation(dataset: str, metrics: list, run_name: str, num_questions: i
     
     try:
         with st.spinner("Starting evaluation..."):
-            run_id = APIClient.start_evaluation(dataset, metrics, {}, run_name, num_questions)
+            run_id, initial_progress = APIClient.start_evaluation(dataset, metrics, {}, run_name, num_questions)
             
             if not run_id:
                 st.error("Failed to start evaluation")
@@ -97,73 +114,199 @@ def _run_evaluation(dataset: str, metrics: list, run_name: str, num_questions: i
                 return
             
             st.success(f"Evaluation started: {run_id}")
-            _monitor_progress(run_id)
+            cached_run_view.clear()
+            if _progress_fragment is not None:
+                st.session_state.current_run_id = run_id
+                st.session_state.eval_progress = {'summary': {}, 'results_count': 0}
+                # The progress panel's first tick renders this instead of polling
+                st.session_state.eval_initial_progress = initial_progress
+                # Rerun so the buttons reflect the running evaluation and the progress panel starts
+                st.rerun()
+            
+            final_progress = _monitor_progress(run_id, initial_progress)
             
             st.session_state.eval_running = False
-            st.success("Evaluation completed successfully!")
-            st.info(f"View detailed results in 'Run Reports' page")
+            if final_progress is not None and not _failure_message(final_progress):
+                _show_completion()
     except Exception as e:
         st.error(f"Evaluation failed: {e}")
         st.session_state.eval_running = False
 
 
-def _monitor_progress(run_id: str):
-    """Monitor evaluation progress."""
+def _progress_widgets() -> Dict[str, Any]:
+    """Create the progress placeholders once, to be updated in place."""
     progress_bar = st.progress(0)
     status_text = st.empty()
-    results_container = st.empty()
+    col1, col2 = st.columns(2)
+    return {
+        'progress_bar': progress_bar,
+        'status_text': status_text,
+        'processed': col1.empty(),
+        'score': col2.empty(),
+    }
+
+
+def _failure_message(progress_info: Dict[str, Any]) -> Optional[str]:
+    """Message to show for a run that ended without completing, else None."""
+    status = progress_info.get('status')
+    if status in FAILED_STATUSES:
+        return progress_info.get('message') or f"Evaluation {status}"
+    return None
+
+
+def _show_progress(
+    run_id: str,
+    progress_info: Dict[str, Any],
+    widgets: Dict[str, Any],
+    tracking: Dict[str, Any]
+) -> bool:
+    """Render one progress update; return True once the run is finished.
+    
+    widgets come from _progress_widgets(). tracking holds the summary from the last full run details fetch and the
+    results count it was fetched at, so details are only refetched when
+    results grow.
+    """
+    progress_bar = widgets['progress_bar']
+    status_text = widgets['status_text']
+    status = progress_info.get('status', 'running')
+    num_results = progress_info.get('results_count', 0)
     
+    failure = _failure_message(progress_info)
+    if failure:
+        progress_bar.empty()
+        status_text.error(failure)
+        return True
+    
+    # Only fetch the full run details when new results were written
+    if num_results > tracking['results_count'] or status == 'completed':
+        tracking['summary'] = APIClient.get_run_details(run_id, include_results=False).get('summary', {})
+        tracking['results_count'] = num_results
+    
+    # Get progress from in-memory tracking (available immediately without disk reads)
+    current_question = progress_info.get('current_question', 0)
+    total_questions = progress_info.get('total_questions', 0)
+    current_question_text = progress_info.get('current_question_text', '')
+    
+    if total_questions > 0:
+        progress = current_question / total_questions
+        progress_bar.progress(min(progress, 1.0))
+        
+        # Show current question being processed from in-memory tracking
+        if current_question_text:
+            # Truncate question if too long
+            question_display = current_question_text[:80] + "..." if len(current_question_text) > 80 else current_question_text
+            status_text.text(f"Evaluating {current_question}/{total_questions}: {question_display}")
+        else:
+            status_text.text(f"Evaluating {current_question}/{total_questions}")
+    else:
+        status_text.text("Starting evaluation...")
+    
+    if num_results:
+        avg_score = tracking['summary'].get('average_overall_score', 0)
+        widgets['processed'].metric("Questions Processed", num_results)
+        widgets['score'].metric("Average Score", f"{avg_score:.3f}")
+    
+    # Check if evaluation is completed
+    if status == 'completed' or (total_questions > 0 and current_question >= total_questions):
+        progress_bar.progress(1.0)
+        status_text.empty()
+        return True
+    return False
+
+
+def _render_progress_panel():
+    """Render the current run's progress once (re-run on a timer as a fragment)."""
+    run_id = st.session_state.get('current_run_id')
+    if not run_id:
+        return
+    
+    try:
+        progress_info = st.session_state.pop('eval_initial_progress', None) or APIClient.get_run_progress(run_id)
+        finished = _show_progress(run_id, progress_info, _progress_widgets(), st.session_state.eval_progress)
+    except Exception as e:
+        # Shown until the next tick retries
+        st.error(f"Error monitoring progress: {e}")
+        return
+    
+    if finished:
+        st.session_state.current_run_id = None
+        st.session_state.eval_running = False
+        st.session_state.eval_failed = _failure_message(progress_info)
+        st.session_state.eval_completed = not st.session_state.eval_failed
+        # Full rerun so the page's buttons and completion message update
+        st.rerun()
+
+
+# Only the progress panel reruns while an evaluation is in progress, so the
+# rest of the page (e.g. the cancel button) stays responsive. st.fragment
+# needs a newer Streamlit than the minimum supported one; without it the
+# blocking _monitor_progress is used instead.
+_progress_fragment = (
+    st.fragment(run_every=PROGRESS_REFRESH_SECONDS)(_render_progress_panel)
+    if hasattr(st, "fragment") else None
+)
+
+
+def _show_completion():
+    """Show the message for a finished evaluation."""
+    # The run's summary and results are final now, so the reports page should refetch them
+    cached_run_view.clear()
+    cached_run_results.clear()
+    st.success("Evaluation completed successfully!")
+    st.info(f"View detailed results in 'Run Reports' page")
+
+
+def _monitor_progress(
+    run_id: str,
+    initial_progress: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """Monitor evaluation progress.
+    
+    Shows initial_progress (returned when the run was started) right away,
+    then follows the server's progress stream and falls back to polling if
+    the stream is unavailable or drops before the run finishes.
+    
+    Returns:
+        The progress that finished the run, or None if monitoring was
+        cancelled by the user or failed
+    """
+    widgets = _progress_widgets()
+    status_text = widgets['status_text']
+    tracking = {'summary': {}, 'results_count': 0}
+    
+    def show(progress_info: Dict[str, Any]) -> bool:
+        return _show_progress(run_id, progress_info, widgets, tracking)
+    
+    if initial_progress and show(initial_progress):
+        return initial_progress
+    
+    try:
+        for progress_info in APIClient.stream_run_progress(run_id):
+            if st.session_state.cancel_eval:
+                status_text.text("Evaluation cancelled by user")
+                return None
+            if show(progress_info):
+                return progress_info
+    except Exception:
+        pass
+    
+    # Poll if the stream failed or ended before the run finished
+    interval = POLL_INTERVAL_MIN_SECONDS
+    last_question = -1
     while True:
         if st.session_state.cancel_eval:
             status_text.text("Evaluation cancelled by user")
-            break
+            return None
         
         try:
-            run_details = APIClient.get_run_details(run_id)
-            metadata = run_details.get('metadata', {})
-            summary = run_details.get('summary', {})
-            results = run_details.get('results', [])
-            
-            # Get progress from in-memory tracking (available immediately without disk reads)
-            current_question = run_details.get('current_question', 0)
-            total_questions = run_details.get('total_questions', metadata.get('num_questions', 0))
-            current_question_text = run_details.get('current_question_text', '')
-            
-            if total_questions > 0:
-                progress = current_question / total_questions
-                progress_bar.progress(min(progress, 1.0))
-                
-                # Show current question being processed from in-memory tracking
-                if current_question_text:
-                    # Truncate question if too long
-                    question_display = current_question_text[:80] + "..." if len(current_question_text) > 80 else current_question_text
-                    status_text.text(f"Evaluating {current_question}/{total_questions}: {question_display}")
-                else:
-                    status_text.text(f"Evaluating {current_question}/{total_questions}")
-            else:
-                status_text.text("Starting evaluation...")
-            
-            if results:
-                with results_container.container():
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.metric("Questions Processed", len(results))
-                    with col2:
-                        avg_score = summary.get('average_overall_score', 0)
-                        st.metric("Average Score", f"{avg_score:.3f}")
-            
-            # Check if evaluation is completed
-            status = run_details.get('status', 'running')
-            if status == 'completed':
-                progress_bar.progress(1.0)
-                status_text.empty()
-                break
-            elif total_questions > 0 and current_question >= total_questions:
-                progress_bar.progress(1.0)
-                status_text.empty()
-                break
+            progress_info = APIClient.get_run_progress(run_id)
+            if show(progress_info):
+                return progress_info
             
-            time.sleep(2)
+            current_question = progress_info.get('current_question', 0)
+            interval = next_poll_interval(interval, current_question != last_question)
+            last_question = current_question
+            time.sleep(interval)
         except Exception as e:
             st.error(f"Error monitoring progress: {e}")
-            break
+            return None
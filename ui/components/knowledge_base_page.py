@@ -1,9 +1,15 @@
 """Knowledge base management UI."""
 
 import time
+from itertools import islice
+from typing import Any, Dict
+
 import streamlit as st
 from ui.api_client import APIClient
-from ui.utils import render_file_tree
+from ui.utils import POLL_INTERVAL_MIN_SECONDS, next_poll_interval, render_file_tree
+
+# Number of selected file names listed before an upload
+UPLOAD_PREVIEW_COUNT = 5
 
 
 def render():
@@ -32,15 +38,20 @@ def _render_upload_section():
     
     if uploaded_files:
         st.write(f"Selected {len(uploaded_files)} files:")
-        for file in uploaded_files[:5]:
-            st.text(f"  - {file.name}")
-        if len(uploaded_files) > 5:
-            st.text(f"  ... and {len(uploaded_files) - 5} more")
+        # One text element for the preview; islice avoids copying the selection list
+        preview = [f"  - {file.name}" for file in islice(uploaded_files, UPLOAD_PREVIEW_COUNT)]
+        if len(uploaded_files) > UPLOAD_PREVIEW_COUNT:
+            preview.append(f"  ... and {len(uploaded_files) - UPLOAD_PREVIEW_COUNT} more")
+        st.text("\n".join(preview))
         
         if st.button("Upload Files"):
             try:
+                upload_progress = st.progress(0)
                 with st.spinner("Uploading..."):
-                    result = APIClient.upload_kb_files(uploaded_files)
+                    result = APIClient.upload_kb_files(
+                        uploaded_files,
+                        on_progress=lambda done, total: upload_progress.progress(done / total)
+                    )
                     st.success(f"Uploaded {result.get('count', 0)} files")
                     if result.get('errors'):
                         st.warning(f"Some files failed: {', '.join(result['errors'])}")
@@ -66,6 +77,40 @@ def _render_ingestion_section():
             _run_clear_and_rebuild()
 
 
+def _follow_ingestion() -> Dict[str, Any]:
+    """Show ingestion progress until it finishes and return the final status.
+    
+    Follows the server's status stream and falls back to polling if the
+    stream is unavailable or drops before ingestion finishes.
+    """
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    
+    def show(status: Dict[str, Any]) -> None:
+        status_text.text(f"Status: {status.get('status')} - {status.get('message', '')}")
+        progress = status.get('progress', 0)
+        progress_bar.progress(min(progress / 100, 1.0))
+    
+    status: Dict[str, Any] = {}
+    try:
+        for status in APIClient.stream_ingestion_status():
+            show(status)
+    except Exception:
+        pass
+    
+    # Poll if the stream failed or ended before ingestion finished
+    interval = POLL_INTERVAL_MIN_SECONDS
+    while status.get('status') not in ['completed', 'error', 'idle']:
+        if status:
+            time.sleep(interval)
+        previous = status
+        status = APIClient.get_ingestion_status()
+        show(status)
+        interval = next_poll_interval(interval, status != previous)
+    
+    return status
+
+
 def _run_ingestion():
     """Run ingestion process."""
     try:
@@ -73,18 +118,7 @@ def _run_ingestion():
             APIClient.trigger_ingestion()
             st.success("Ingestion started")
             
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            while True:
-                status = APIClient.get_ingestion_status()
-                status_text.text(f"Status: {status.get('status')} - {status.get('message', '')}")
-                progress = status.get('progress', 0)
-                progress_bar.progress(min(progress / 100, 1.0))
-                
-                if status.get('status') in ['completed', 'error', 'idle']:
-                    break
-                time.sleep(1)
+            status = _follow_ingestion()
             
             if status.get('status') == 'completed':
                 st.success("✅ Ingestion completed successfully")
@@ -107,18 +141,7 @@ def _run_clear_and_rebuild():
             APIClient.trigger_ingestion()
             st.success("Ingestion started")
             
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            while True:
-                status = APIClient.get_ingestion_status()
-                status_text.text(f"Status: {status.get('status')} - {status.get('message', '')}")
-                progress = status.get('progress', 0)
-                progress_bar.progress(min(progress / 100, 1.0))
-                
-                if status.get('status') in ['completed', 'error', 'idle']:
-                    break
-                time.sleep(1)
+            status = _follow_ingestion()
             
             if status.get('status') == 'completed':
                 st.success("✅ Vector store rebuilt successfully!")
@@ -133,11 +156,13 @@ def _render_kb_files():
     st.subheader("Current Knowledge Base Files")
     
     if st.button("Refresh File List"):
+        APIClient.clear_kb_listing_cache()
         st.rerun()
     
     try:
-        tree = APIClient.get_kb_tree()
-        files = APIClient.get_kb_files()
+        kb_version = APIClient.get_kb_version()
+        tree = APIClient.get_kb_tree(kb_version)
+        files = APIClient.get_kb_files(kb_version)
         
         if files:
             st.write(f"**Total files:** {len(files)}")
@@ -146,8 +171,11 @@ def _render_kb_files():
                 render_file_tree(tree)
             
             with st.expander("File List"):
-                for file_info in files:
-                    st.text(f"📄 {file_info.get('path', '')} ({file_info.get('size', 0) / 1024:.1f} KB)")
+                # One element for the whole list rather than one per file
+                st.text("\n".join(
+                    f"📄 {file_info.get('path', '')} ({file_info.get('size', 0) / 1024:.1f} KB)"
+                    for file_info in files
+                ))
         else:
             st.info("No files in knowledge base. Upload .txt files to get started.")
     except Exception as e:
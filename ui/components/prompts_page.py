@@ -1,7 +1,10 @@
 """Prompt workspace for managing versioned prompts."""
 
+from collections import defaultdict
+
 import streamlit as st
 from ui.api_client import APIClient
+from ui.utils import cached_prompts, set_active_prompt
 
 
 def render():
@@ -24,7 +27,7 @@ def _render_rag_prompts():
     st.subheader("RAG System Prompts")
     
     try:
-        prompts = APIClient.list_prompts("rag")
+        prompts = cached_prompts()["rag"]
     except Exception as e:
         st.error(f"Failed to load RAG prompts: {e}")
         return
@@ -35,13 +38,16 @@ def _render_rag_prompts():
     
     # Display existing prompts
     st.markdown("### Existing Prompts")
+    selected = []
     for prompt in prompts:
-        with st.expander(f"📝 {prompt['title']}" + (" (Default)" if prompt['title'] == "Default v1.0" else "")):
+        title = prompt['title']
+        is_default = title == "Default v1.0"
+        with st.expander(f"📝 {title}" + (" (Default)" if is_default else "")):
             st.text_area(
                 "Content",
                 value=prompt['content'],
                 height=200,
-                key=f"view_rag_{prompt['title']}",
+                key=f"view_rag_{title}",
                 disabled=True
             )
             if prompt.get('description'):
@@ -53,25 +59,19 @@ def _render_rag_prompts():
             # Action buttons
             col1, col2 = st.columns([1, 1])
             with col1:
-                if st.button(f"Use This", key=f"use_rag_{prompt['title']}", type="primary"):
+                if st.button(f"Use This", key=f"use_rag_{title}", type="primary"):
                     try:
-                        config = APIClient.load_config()
-                        config["rag_system_prompt_title"] = prompt['title']
-                        APIClient.save_config(config)
-                        st.success(f"✅ Now using '{prompt['title']}' for RAG queries")
-                        st.rerun()
+                        set_active_prompt("rag", title)
+                        st.success(f"✅ Now using '{title}' for RAG queries")
                     except Exception as e:
                         st.error(f"Failed to set active prompt: {e}")
             
             with col2:
-                if prompt['title'] != "Default v1.0":
-                    if st.button(f"Delete", key=f"del_rag_{prompt['title']}"):
-                        try:
-                            APIClient.delete_prompt("rag", prompt['title'])
-                            st.success(f"Deleted {prompt['title']}")
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Failed to delete: {e}")
+                if not is_default:
+                    if st.checkbox("Select for deletion", key=f"sel_rag_{title}"):
+                        selected.append({"category": "rag", "title": title})
+    
+    _delete_selected(selected, "rag")
     
     # Create new prompt
     st.markdown("### Create New Prompt")
@@ -100,6 +100,7 @@ def _render_rag_prompts():
             else:
                 try:
                     APIClient.save_prompt("rag", new_title, new_content, new_description)
+                    cached_prompts.clear()
                     st.success(f"Saved prompt '{new_title}'")
                     st.rerun()
                 except Exception as e:
@@ -111,7 +112,7 @@ def _render_eval_prompts():
     st.subheader("Evaluation Metric Prompts")
     
     try:
-        prompts = APIClient.list_prompts("eval")
+        prompts = cached_prompts()["eval"]
         metrics = APIClient.get_available_metrics()
     except Exception as e:
         st.error(f"Failed to load evaluation prompts: {e}")
@@ -122,24 +123,26 @@ def _render_eval_prompts():
         return
     
     # Group by metric
-    prompts_by_metric = {}
+    prompts_by_metric = defaultdict(list)
     for prompt in prompts:
-        metric = prompt.get('metric', 'unknown')
-        if metric not in prompts_by_metric:
-            prompts_by_metric[metric] = []
-        prompts_by_metric[metric].append(prompt)
+        prompts_by_metric[prompt.get('metric', 'unknown')].append(prompt)
     
     # Display existing prompts
     st.markdown("### Existing Prompts")
-    for metric, metric_prompts in prompts_by_metric.items():
-        st.markdown(f"**{metric.replace('_', ' ').title()}**")
+    selected = []
+    for metric, metric_prompts in sorted(prompts_by_metric.items()):
+        metric_label = metric.replace('_', ' ').title()
+        st.markdown(f"**{metric_label}**")
         for prompt in metric_prompts:
-            with st.expander(f"📝 {prompt['title']}" + (" (Default)" if prompt['title'] == "Default v1.0" else "")):
+            title = prompt['title']
+            is_default = title == "Default v1.0"
+            key_suffix = f"{metric}_{title}"
+            with st.expander(f"📝 {title}" + (" (Default)" if is_default else "")):
                 st.text_area(
                     "Content",
                     value=prompt['content'],
                     height=250,
-                    key=f"view_eval_{metric}_{prompt['title']}",
+                    key=f"view_eval_{key_suffix}",
                     disabled=True
                 )
                 if prompt.get('description'):
@@ -154,27 +157,19 @@ def _render_eval_prompts():
                 # Action buttons
                 col1, col2 = st.columns([1, 1])
                 with col1:
-                    if st.button(f"Use This", key=f"use_eval_{metric}_{prompt['title']}", type="primary"):
+                    if st.button(f"Use This", key=f"use_eval_{key_suffix}", type="primary"):
                         try:
-                            config = APIClient.load_config()
-                            # Update the specific metric prompt field
-                            field_name = f"eval_prompt_{metric}"
-                            config[field_name] = prompt['title']
-                            APIClient.save_config(config)
-                            st.success(f"✅ Now using '{prompt['title']}' for {metric.replace('_', ' ').title()}")
-                            st.rerun()
+                            set_active_prompt("eval", title, metric)
+                            st.success(f"✅ Now using '{title}' for {metric_label}")
                         except Exception as e:
                             st.error(f"Failed to set active prompt: {e}")
                 
                 with col2:
-                    if prompt['title'] != "Default v1.0":
-                        if st.button(f"Delete", key=f"del_eval_{metric}_{prompt['title']}"):
-                            try:
-                                APIClient.delete_prompt("eval", prompt['title'], metric)
-                                st.success(f"Deleted {prompt['title']}")
-                                st.rerun()
-                            except Exception as e:
-                                st.error(f"Failed to delete: {e}")
+                    if not is_default:
+                        if st.checkbox("Select for deletion", key=f"sel_eval_{key_suffix}"):
+                            selected.append({"category": "eval", "title": title, "metric": metric})
+    
+    _delete_selected(selected, "eval")
     
     # Create new prompt
     st.markdown("### Create New Evaluation Prompt")
@@ -208,7 +203,23 @@ def _render_eval_prompts():
             else:
                 try:
                     APIClient.save_eval_prompt(metric_select, new_title, new_content, new_description)
+                    cached_prompts.clear()
                     st.success(f"Saved prompt '{new_title}' for {metric_select}")
                     st.rerun()
                 except Exception as e:
                     st.error(f"Failed to save prompt: {e}")
+
+
+def _delete_selected(selected, category):
+    """Render the button that deletes every prompt selected in a tab in one request."""
+    if not selected:
+        return
+    
+    if st.button(f"Delete Selected ({len(selected)})", key=f"del_{category}_selected"):
+        try:
+            deleted = APIClient.delete_prompts(selected)
+            cached_prompts.clear()
+            st.success(f"Deleted {deleted} prompt(s)")
+            st.rerun()
+        except Exception as e:
+            st.error(f"Failed to delete: {e}")
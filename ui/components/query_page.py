@@ -1,8 +1,15 @@
 """RAG query interface."""
 
+import hashlib
+
+import orjson
 import streamlit as st
 from ui.api_client import APIClient
 
+# Answers kept per session, keyed by question, server configuration, active
+# RAG prompt content and knowledge base version
+QUERY_CACHE_SIZE = 20
+
 
 def render():
     """Render RAG query page."""
@@ -17,14 +24,55 @@ def render():
     if st.button("Submit Query", type="primary") and question:
         try:
             with st.spinner("Processing query..."):
-                result = APIClient.query_rag(question, {})
-                
-                if result:
-                    _render_answer(result)
-                    _render_sources(result)
-                    _render_metadata(result)
+                st.session_state.query_result = _answer(question)
         except Exception as e:
+            st.session_state.pop("query_result", None)
             st.error(f"Query failed: {e}")
+    
+    # Kept in session state so the last answer survives reruns and page switches
+    result = st.session_state.get("query_result")
+    if result:
+        _render_answer(result)
+        _render_sources(result)
+        _render_metadata(result)
+
+
+def _cache_key(question):
+    """Key of a query in the session's answer cache.
+    
+    Queries run with the server's saved configuration, so the key is built
+    from the current server state (config and prompts are revalidated with
+    ETags, so unchanged ones cost a 304) rather than this session's copy.
+    """
+    config = APIClient.load_config()["config"]
+    title = config.get("rag_system_prompt_title")
+    content = next((p.get("content", "") for p in APIClient.list_prompts("rag") if p["title"] == title), "")
+    return (
+        question,
+        orjson.dumps(config, option=orjson.OPT_SORT_KEYS),
+        hashlib.sha256(content.encode()).hexdigest(),
+        APIClient.get_kb_version(),
+    )
+
+
+def _answer(question):
+    """Answer a question, reusing this session's result for an identical query."""
+    try:
+        key = _cache_key(question)
+    except Exception:
+        # Not knowing whether a cached answer is current only costs a cache miss
+        return APIClient.query_rag(question, {})
+    
+    cache = st.session_state.setdefault("query_cache", {})
+    if key in cache:
+        return cache[key]
+    
+    result = APIClient.query_rag(question, {})
+    if len(cache) >= QUERY_CACHE_SIZE:
+        # Dicts keep insertion order, so this drops the oldest answer
+        del cache[next(iter(cache))]
+    cache[key] = result
+    return result
 
 
 def _render_answer(result):
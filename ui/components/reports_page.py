@@ -1,42 +1,58 @@
 """Evaluation reports viewer."""
 
+import functools
+import math
+
 import streamlit as st
-from ui.api_client import APIClient
+from ui.utils import cached_run_results, cached_run_view
+
+RESULTS_PER_PAGE = 20
+# Metric averages wrap onto a new row after this many columns
+METRIC_COLUMNS = 5
+# Retrieved contexts are trimmed to this many characters by the server
+CONTEXT_PREVIEW_CHARS = 200
+
+# Scopes reruns to the decorated section where Streamlit supports fragments
+_fragment = st.fragment if hasattr(st, "fragment") else (lambda func: func)
 
 
 def render():
     """Render evaluation reports page."""
     st.header("Evaluation Run Reports")
     
+    # The run list, the selected run's details and pricing come in one
+    # request; the selection is known before the selectbox renders because
+    # Streamlit stores it in session state
     try:
-        runs = APIClient.list_runs()
+        view = cached_run_view(st.session_state.get("report_run_id"))
     except Exception as e:
         st.error(f"Failed to load runs: {e}")
         return
     
+    runs = view.get('runs', [])
     if not runs:
         st.info("No evaluation runs available. Run an evaluation to see results here.")
         return
     
-    run_options = [f"{r.get('run_name', r['run_id'][:8])} - {r.get('timestamp', 'N/A')}" for r in runs]
-    run_ids = [r['run_id'] for r in runs]
+    run_options = {r['run_id']: f"{r.get('run_name', r['run_id'][:8])} - {r.get('timestamp', 'N/A')}" for r in runs}
+    # Fall back to the run the server picked if the stored one no longer exists
+    if st.session_state.get("report_run_id") not in run_options:
+        st.session_state.report_run_id = view['run_id']
     
-    selected_idx = st.selectbox(
+    st.selectbox(
         "Select Run",
-        range(len(run_options)),
-        format_func=lambda i: run_options[i]
+        list(run_options),
+        format_func=run_options.get,
+        key="report_run_id"
     )
     
-    if selected_idx is None:
-        return
-    
-    selected_run_id = run_ids[selected_idx]
-    
     try:
-        run_details = APIClient.get_run_details(selected_run_id)
+        # The view carries no per-question results, so everything above the
+        # results table reaches the browser before a page of them is fetched
+        run_details = view.get('details')
         
         if run_details:
-            _render_summary(run_details)
+            _render_summary(run_details, view.get('pricing', {}))
             _render_config(run_details)
             _render_metric_averages(run_details)
             _render_individual_results(run_details)
@@ -44,11 +60,10 @@ def render():
         st.error(f"Failed to load run details: {e}")
 
 
-def _render_summary(run_details):
-    """Render run summary."""
+def _render_summary(run_details, pricing):
+    """Render run summary; pricing holds the per-million token prices."""
     st.subheader("Run Summary")
     summary = run_details.get('summary', {})
-    results = run_details.get('results', [])
     metadata = run_details.get('metadata', {})
     
     col1, col2, col3, col4 = st.columns(4)
@@ -58,7 +73,7 @@ def _render_summary(run_details):
     with col2:
         st.metric("Average Score", f"{summary.get('average_overall_score', 0):.3f}")
     with col3:
-        st.metric("Questions Processed", len(results))
+        st.metric("Questions Processed", run_details.get('num_results', 0))
     with col4:
         # Try dataset from metadata, fallback to run_details directly
         dataset = run_details.get('dataset', metadata.get('dataset_name', 'N/A'))
@@ -98,17 +113,12 @@ def _render_summary(run_details):
         
         # Calculate price per 1k messages
         try:
-            config = APIClient.load_config()
-            input_price_per_m = config.get('input_token_price_per_million', 0.150)
-            output_price_per_m = config.get('output_token_price_per_million', 0.600)
-            
-            # Price for 1 message
-            price_per_message = (
-                (avg_prompt * input_price_per_m / 1_000_000) +
-                (avg_completion * output_price_per_m / 1_000_000)
+            price_per_message, price_per_1k = _estimate_cost(
+                avg_prompt,
+                avg_completion,
+                pricing.get('input_token_price_per_million', 0.150),
+                pricing.get('output_token_price_per_million', 0.600)
             )
-            # Price for 1000 messages
-            price_per_1k = price_per_message * 1000
             
             st.subheader("Cost Estimate")
             cost_col1, cost_col2 = st.columns(2)
@@ -120,6 +130,21 @@ def _render_summary(run_details):
             st.warning(f"Could not calculate pricing: {e}")
 
 
+def _estimate_cost(avg_prompt, avg_completion, input_price_per_m, output_price_per_m):
+    """Return (price per message, price per 1000 messages) from per-million token prices."""
+    price_per_message = (
+        (avg_prompt * input_price_per_m / 1_000_000) +
+        (avg_completion * output_price_per_m / 1_000_000)
+    )
+    return price_per_message, price_per_message * 1000
+
+
+@functools.lru_cache(maxsize=None)
+def _metric_title(metric):
+    """Display name of a metric, e.g. "context_recall" -> "Context Recall"."""
+    return metric.replace('_', ' ').title()
+
+
 def _render_config(run_details):
     """Render configuration as JSON."""
     config = run_details.get('config', {})
@@ -142,7 +167,7 @@ def _render_config(run_details):
         for key, value in config.items():
             if key.startswith("eval_prompt_"):
                 metric = key.replace("eval_prompt_", "")
-                st.caption(f"• {metric.replace('_', ' ').title()}: {value}")
+                st.caption(f"• {_metric_title(metric)}: {value}")
     
     with st.expander("📋 Full Configuration", expanded=False):
         st.json(config)
@@ -157,81 +182,83 @@ def _render_metric_averages(run_details):
         st.info("No metric averages available")
         return
     
-    num_metrics = len(metric_avgs)
-    cols = st.columns(min(num_metrics, 5))
-    
+    cols = st.columns(min(len(metric_avgs), METRIC_COLUMNS))
     for i, (metric, score) in enumerate(metric_avgs.items()):
-        col_idx = i % 5
-        with cols[col_idx]:
-            metric_display = metric.replace('_', ' ').title()
-            st.metric(metric_display, f"{score:.3f}")
+        cols[i % METRIC_COLUMNS].metric(_metric_title(metric), f"{score:.3f}")
 
 
+# The page selector is the only widget below the run selectbox, so turning
+# pages reruns just this section instead of the whole report
+@_fragment
 def _render_individual_results(run_details):
     """Render individual question results."""
     st.subheader("Individual Results")
-    results = run_details.get('results', [])
+    num_results = run_details.get('num_results', 0)
     
-    if not results:
+    if not num_results:
         st.info("No individual results available for this run")
         return
     
-    for i, result in enumerate(results, 1):
+    # Only one page of results is fetched and rendered per rerun
+    num_pages = math.ceil(num_results / RESULTS_PER_PAGE)
+    page = 1
+    if num_pages > 1:
+        page = st.number_input(
+            f"Page (of {num_pages}, {RESULTS_PER_PAGE} results each)",
+            min_value=1, max_value=num_pages, value=1, step=1,
+            # Per run, so a page number never exceeds another run's page count
+            key=f"report_results_page_{run_details.get('run_id')}"
+        )
+    first = (page - 1) * RESULTS_PER_PAGE
+    
+    page_results = list(enumerate(cached_run_results(run_details['run_id'], first, RESULTS_PER_PAGE, CONTEXT_PREVIEW_CHARS), first + 1))
+    
+    # Scores, timings and token counts of the whole page in one table
+    rows = []
+    for i, result in page_results:
+        row = {
+            "Q": i,
+            "Score": result.get('overall_score', 0),
+            "Retrieval ms": result.get('retrieval_time_ms', 0),
+            "Generation ms": result.get('generation_time_ms', 0),
+            "Total ms": result.get('total_time_ms', 0),
+        }
+        if result.get('total_tokens') is not None:
+            row["Prompt tokens"] = result.get('prompt_tokens')
+            row["Completion tokens"] = result.get('completion_tokens')
+            row["Total tokens"] = result.get('total_tokens')
+        for metric_name, metric_data in result.get('metrics', {}).items():
+            row[_metric_title(metric_name)] = metric_data.get('score', 0)
+        rows.append(row)
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+    
+    # Long text fields stay in per-question expanders
+    for i, result in page_results:
         question_text = result.get('question', '')
         overall_score = result.get('overall_score', 0)
         
         score_color = "🟢" if overall_score >= 0.7 else "🟡" if overall_score >= 0.5 else "🔴"
         
         with st.expander(f"{score_color} Q{i}: {question_text[:80]}... (Score: {overall_score:.3f})"):
-            col1, col2 = st.columns([2, 1])
+            st.markdown(
+                f"**Question:**\n\n{result.get('question', 'N/A')}\n\n"
+                f"**Generated Answer:**\n\n{result.get('answer', 'N/A')}\n\n"
+                f"**Expected Answer:**\n\n{result.get('expected_answer', 'N/A')}"
+            )
             
-            with col1:
-                st.write("**Question:**")
-                st.write(result.get('question', 'N/A'))
-                
-                st.write("**Generated Answer:**")
-                st.write(result.get('answer', 'N/A'))
-                
-                st.write("**Expected Answer:**")
-                st.write(result.get('expected_answer', 'N/A'))
-                
-                if result.get('contexts'):
-                    with st.expander("Retrieved Contexts"):
-                        for ctx_idx, ctx in enumerate(result['contexts'], 1):
-                            st.text(f"Context {ctx_idx}:")
-                            st.text(ctx[:200] + "..." if len(ctx) > 200 else ctx)
+            if result.get('sources'):
+                st.write("**Sources:**")
+                source_lines = []
+                for source in result['sources']:
+                    source_file = source.get('source_path', 'unknown').split('/')[-1]
+                    snippet = source.get('snippet', '')[:50]
+                    source_lines.append(f"{source.get('rank', '?')}. {source_file}\n   {snippet}...")
+                st.text("\n".join(source_lines))
             
-            with col2:
-                st.write("**Overall Score:**")
-                st.metric("", f"{overall_score:.3f}")
-                
-                st.write("**Performance:**")
-                retrieval_ms = result.get('retrieval_time_ms', 0)
-                generation_ms = result.get('generation_time_ms', 0)
-                total_ms = result.get('total_time_ms', 0)
-                st.text(f"Retrieval: {retrieval_ms:.1f} ms")
-                st.text(f"Generation: {generation_ms:.1f} ms")
-                st.text(f"Total: {total_ms:.1f} ms")
-                
-                # Show token usage if available
-                if result.get('total_tokens') is not None:
-                    st.write("**Tokens:**")
-                    st.text(f"Prompt: {result.get('prompt_tokens', 'N/A')}")
-                    st.text(f"Completion: {result.get('completion_tokens', 'N/A')}")
-                    st.text(f"Total: {result.get('total_tokens', 'N/A')}")
-                
-                st.write("**Metric Scores:**")
-                metrics = result.get('metrics', {})
-                for metric_name, metric_data in metrics.items():
-                    score = metric_data.get('score', 0)
-                    metric_display = metric_name.replace('_', ' ').title()
-                    st.write(f"{metric_display}: {score:.3f}")
-                
-                if result.get('sources'):
-                    st.write("**Sources:**")
-                    for source in result['sources']:
-                        source_file = source.get('source_path', 'unknown').split('/')[-1]
-                        snippet = source.get('snippet', '')[:50]
-                        rank = source.get('rank', '?')
-                        st.text(f"{rank}. {source_file}")
-                        st.caption(f"   {snippet}...")
+            if result.get('contexts'):
+                truncated = result.get('contexts_truncated', False)
+                with st.expander("Retrieved Contexts"):
+                    st.text("\n".join(
+                        f"Context {ctx_idx}:\n{ctx + '...' if truncated and len(ctx) == CONTEXT_PREVIEW_CHARS else ctx}"
+                        for ctx_idx, ctx in enumerate(result['contexts'], 1)
+                    ))
@@ -1,7 +1,23 @@
 """Utilities for session state and formatting."""
 
 import streamlit as st
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+from ui.api_client import APIClient
+
+# Prompts, test sets, runs and config only change through the UI pages that
+# clear these caches, so the TTL just bounds staleness from edits made elsewhere
+LISTING_CACHE_TTL_SECONDS = 60
+
+# Progress polling starts fast and backs off while nothing changes
+POLL_INTERVAL_MIN_SECONDS = 0.5
+POLL_INTERVAL_MAX_SECONDS = 5.0
+
+# Selectboxes with more options than this get a search box and show only the top matches
+SELECTBOX_OPTION_LIMIT = 50
+
+# (tree node, level, rendered text) of the last file tree shown
+_last_file_tree = (None, 0, "")
 
 
 def init_session_state():
@@ -14,17 +30,136 @@ def init_session_state():
         st.session_state.cancel_eval = False
 
 
-def render_file_tree(node: Dict[str, Any], level: int = 0) -> None:
-    """Recursively render file tree."""
-    if not node:
-        return
+def get_config() -> Dict[str, Any]:
+    """Saved server configuration, fetched once per session and shared by all pages."""
+    if not st.session_state.config:
+        refresh_config()
+    return st.session_state.config
+
+
+def refresh_config() -> Dict[str, Any]:
+    """Re-fetch the saved configuration, e.g. after it was edited outside this session."""
+    st.session_state.config = APIClient.load_config()["config"]
+    return st.session_state.config
+
+
+def _update_config(overrides: Dict[str, Any]) -> None:
+    # A session that has not loaded the config yet fetches the saved one when it does
+    if st.session_state.config:
+        st.session_state.config = {**st.session_state.config, **overrides}
+
+
+def save_config(overrides: Dict[str, Any]) -> None:
+    """Save config overrides on the server and apply them to this session's copy."""
+    APIClient.save_config(overrides)
+    _update_config(overrides)
+
+
+def set_active_prompt(category: str, title: str, metric: Optional[str] = None) -> None:
+    """Make a saved prompt the active one on the server and in this session's config."""
+    APIClient.set_active_prompt(category, title, metric)
+    _update_config({"rag_system_prompt_title" if category == "rag" else f"eval_prompt_{metric}": title})
+
+
+@st.cache_data(ttl=LISTING_CACHE_TTL_SECONDS, show_spinner=False)
+def cached_prompts() -> Dict[str, List[Dict[str, Any]]]:
+    """RAG and eval prompts by category, cached across reruns."""
+    return APIClient.list_prompts_bulk(["rag", "eval"])
+
+
+@st.cache_data(ttl=LISTING_CACHE_TTL_SECONDS, show_spinner=False)
+def cached_datasets() -> List[Dict[str, Any]]:
+    """Available test sets, cached across reruns."""
+    return APIClient.list_datasets()
+
+
+@st.cache_data(ttl=LISTING_CACHE_TTL_SECONDS, max_entries=16, show_spinner=False)
+def cached_run_view(run_id: Optional[str]) -> Dict[str, Any]:
+    """Reports page data for run_id (runs, details, pricing), cached across reruns."""
+    return APIClient.get_run_view(run_id)
+
+
+@st.cache_data(ttl=LISTING_CACHE_TTL_SECONDS, max_entries=16, show_spinner=False)
+def cached_run_results(
+    run_id: str,
+    offset: int,
+    limit: int,
+    truncate_contexts: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """One page of a run's per-question results, cached across reruns."""
+    return APIClient.get_run_details(
+        run_id,
+        results_offset=offset,
+        results_limit=limit,
+        truncate_contexts=truncate_contexts
+    ).get("results", [])
+
+
+def next_poll_interval(interval: float, advanced: bool) -> float:
+    """Delay before the next progress poll.
+    
+    Resets to the minimum as soon as progress moves and doubles (up to the
+    maximum) while it stalls, e.g. during slow model calls.
+    """
+    if advanced:
+        return POLL_INTERVAL_MIN_SECONDS
+    return min(interval * 2, POLL_INTERVAL_MAX_SECONDS)
+
+
+def searchable_selectbox(label: str, options: List[str], index: int = 0, key: str = "") -> str:
+    """st.selectbox that stays fast with very many options.
+    
+    Up to SELECTBOX_OPTION_LIMIT options are rendered as a plain selectbox.
+    Beyond that a search box filters the options and only the first
+    SELECTBOX_OPTION_LIMIT matches are sent to the browser; the default and
+    currently selected options are always kept in the list.
+    """
+    if len(options) <= SELECTBOX_OPTION_LIMIT:
+        return st.selectbox(label, options, index=index, key=key)
+    
+    query = st.text_input(f"Search {label}", key=f"{key}_search").strip().lower()
+    pinned = [options[index]]
+    selected = st.session_state.get(key)
+    if selected in options and selected not in pinned:
+        pinned.append(selected)
     
+    shown = list(pinned)
+    for option in options:
+        if len(shown) >= SELECTBOX_OPTION_LIMIT:
+            break
+        if query in option.lower() and option not in pinned:
+            shown.append(option)
+    
+    return st.selectbox(label, shown, index=0, key=key)
+
+
+def _file_tree_lines(node: Dict[str, Any], level: int, lines: List[str]) -> None:
+    """Append one indented line per node of the file tree to lines."""
     indent = "  " * level
     
     if node.get("type") == "directory":
-        st.text(f"{indent}📁 {node.get('name', 'Unknown')}")
+        lines.append(f"{indent}📁 {node.get('name', 'Unknown')}")
         for child in node.get("children", []):
-            render_file_tree(child, level + 1)
+            _file_tree_lines(child, level + 1, lines)
     else:
         size_kb = node.get("size", 0) / 1024
-        st.text(f"{indent}📄 {node.get('name', 'Unknown')} ({size_kb:.1f} KB)")
+        lines.append(f"{indent}📄 {node.get('name', 'Unknown')} ({size_kb:.1f} KB)")
+
+
+def render_file_tree(node: Dict[str, Any], level: int = 0) -> None:
+    """Render file tree as a single text element.
+    
+    The API client returns the same tree object until the knowledge base
+    changes, so the text of the last rendered tree is reused for it.
+    """
+    global _last_file_tree
+    if not node:
+        return
+    
+    cached_node, cached_level, text = _last_file_tree
+    if node is not cached_node or level != cached_level:
+        lines: List[str] = []
+        _file_tree_lines(node, level, lines)
+        text = "\n".join(lines)
+        _last_file_tree = (node, level, text)
+    st.text(text)